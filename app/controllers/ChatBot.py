@@ -3,6 +3,8 @@ from fastapi import APIRouter, HTTPException, Depends, File, UploadFile,Backgrou
 from fastapi.responses import StreamingResponse
 from app.middleware.JWTVerification import jwt_validator
 from app.services.Chat import ChatService
+from app.helpers.ClientRegistry import ClientRegistry
+from app.helpers.LoopLagMonitor import LoopLagMonitor
 from app.schemas.ServerResponse import ServerResponse
 from app.schemas.Knowledge import CreateKnowledgeSchema,ChatWithKnowledgeSchema
 from app.helpers.Utilities import Utils
@@ -18,10 +20,21 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-router = APIRouter(prefix="/api/v1/chat", tags=["Chat"], dependencies=[Depends(jwt_validator)])
+async def monitor_event_loop():
+    # The app mounting this router owns the loop the chat streams run on, so
+    # sampling starts there on the first chat request (no-op once running)
+    LoopLagMonitor.start()
+
+
+router = APIRouter(prefix="/api/v1/chat", tags=["Chat"], dependencies=[Depends(jwt_validator), Depends(monitor_event_loop)])
 
 def get_service():
-    return ChatService() 
+    return ClientRegistry.get_or_create("ChatService", ChatService)
+
+@router.get("/loop-lag")
+def loop_lag_stats():
+    """Wake-up lag of the event loop serving the chat streams"""
+    return LoopLagMonitor.get_stats()
 
 @router.post("/session/create/{dashboard_id}", response_model=ServerResponse)
 def create_session(dashboard_id: str,service: ChatService = Depends(get_service),jwt_payload: dict = Depends(jwt_validator)):
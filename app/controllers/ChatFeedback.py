@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from app.helpers.Utilities import Utils
 from app.middleware.JWTVerification import jwt_validator
 from app.services.ChatFeedback import ChatFeedbackService
+from app.helpers.ClientRegistry import ClientRegistry
 from app.schemas.ServerResponse import ServerResponse
 from app.schemas.ChatFeedback import CreateChatFeedbackSchema,UpdateChatFeedbackSchema
 
@@ -10,7 +11,7 @@ from app.schemas.ChatFeedback import CreateChatFeedbackSchema,UpdateChatFeedback
 router = APIRouter(prefix="/api/v1/chat-feedback", tags=["ChatFeedback"], dependencies=[Depends(jwt_validator)])
 
 def get_service():
-    return ChatFeedbackService()
+    return ClientRegistry.get_or_create("ChatFeedbackService", ChatFeedbackService)
 
 @router.post("/create-chat-feedback", response_model=ServerResponse)
 def create_chat_feedback(body: CreateChatFeedbackSchema,  service: ChatFeedbackService = Depends(get_service),jwt_payload: dict = Depends(jwt_validator)):
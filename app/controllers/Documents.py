@@ -2,6 +2,7 @@ import json
 from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, Form
 from app.middleware.JWTVerification import jwt_validator
 from app.services.Documents import DocumentService
+from app.helpers.ClientRegistry import ClientRegistry
 from app.schemas.ServerResponse import ServerResponse
 from app.helpers.Utilities import Utils
 import shutil
@@ -16,7 +17,7 @@ load_dotenv()
 router = APIRouter(prefix="/api/v1/documents", tags=["Documents"], dependencies=[Depends(jwt_validator)])
 
 def get_service():
-    return DocumentService() 
+    return ClientRegistry.get_or_create("DocumentService", DocumentService)
 
 @router.post("/upload-to-knowledge", response_model=ServerResponse)
 def upload_to_knowledge(
@@ -6,9 +6,10 @@ from app.helpers.Utilities import Utils
 from app.middleware.JWTVerification import jwt_validator
 from app.schemas.ServerResponse import ServerResponse
 from app.services.Evaluation import EvaluationService
+from app.helpers.ClientRegistry import ClientRegistry
 
 def get_service():
-    return EvaluationService()
+    return ClientRegistry.get_or_create("EvaluationService", EvaluationService)
 
 router = APIRouter(prefix="/api/v1/evaluation", tags=["Evaluation"])
 
@@ -7,6 +7,7 @@ from app.helpers.Utilities import Utils
 from dotenv import load_dotenv
 
 from app.services.ProactiveMessage import ProactiveMessageService
+from app.helpers.ClientRegistry import ClientRegistry
 from typing import List
 from bson import ObjectId
 
@@ -16,7 +17,7 @@ load_dotenv()
 router = APIRouter(prefix="/api/v1/proactiveMessage", tags=["Proactive Message"])
 
 def get_service():
-    return ProactiveMessageService() 
+    return ClientRegistry.get_or_create("ProactiveMessageService", ProactiveMessageService)
 
 
 @router.get("/generate-proactive-message/{dashboard_id}/{session_id}", response_model=ServerResponse)
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 import os
 import json
+from functools import partial
 from dotenv import load_dotenv
 
 from langchain_openai import AzureChatOpenAI
@@ -12,6 +13,9 @@ from langsmith import traceable, tracing_context, wrappers
 
 from app.schemas.ChatSession import ChatSessionTitle
 from app.helpers.VectorDB import VectorDB
+from app.helpers.ClientRegistry import ClientRegistry
+from app.helpers.SlugResolver import SlugResolver
+from app.helpers.ToolExecutor import ToolExecutor
 from app.schemas.ProactiveMessage import ProactiveMessages
 
 from typing import Any, Dict, List, Optional
@@ -142,39 +146,12 @@ def _tool_schemas():
 
 class AIChat:
     def __init__(self, namespace):
-        self.chat = AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-            streaming=True,
-            callbacks=[StreamingStdOutCallbackHandler()]
-        )
+        self.chat = ClientRegistry.get_chat_llm(streaming=True)
 
-        self.client = wrappers.wrap_openai(AsyncAzureOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-        ))
+        self.client = ClientRegistry.get_async_azure_openai()
 
-        self.vector_database = VectorDB(namespace)
+        self.vector_database = VectorDB.get(namespace)
         
-        # Create vector DB helpers
-        self.locations_slug_vector_db_helper = VectorDB("LocationsSlug")
-        self.primary_industry_slug_vector_db_helper = VectorDB("PrimaryIndustrySlug")
-        self.secondary_industry_slug_vector_db_helper = VectorDB("SecondaryIndustrySlug")
-        self.topics_slug_vector_db_helper = VectorDB("TopicSlug")
-        self.regions_slug_vector_db_helper = VectorDB("RegionsSlug")
-
-        # Create retrievers for each namespace
-        self.locations_slug_retriever = self.locations_slug_vector_db_helper.get_vector_retriever()
-        self.primary_industry_slug_retriever = self.primary_industry_slug_vector_db_helper.get_vector_retriever()
-        self.secondary_industry_slug_retriever = self.secondary_industry_slug_vector_db_helper.get_vector_retriever()
-        self.topics_slug_retriever = self.topics_slug_vector_db_helper.get_vector_retriever()
-        self.regions_slug_retriever = self.regions_slug_vector_db_helper.get_vector_retriever()
         
         self.serp_helper = SERPHelper()
         
@@ -206,71 +183,20 @@ class AIChat:
     # --------- helpers ---------
 
     # --------- tool handler ---------
-    async def _tool_resolve_filter_slug(self, args: dict) -> dict:
+    def _tool_resolve_filter_slug(self, args: dict) -> dict:
         """
         INPUT: {"queries": [{"type": "location|primary_industry|secondary_industry|topic|region", "query": "..."}, ...]}
         OUTPUT: {"results": [{"type": "location", "query": "california", "slug": "california"}, ...]}
 
-        Uses the requested retriever for each query, runs a query, picks the FIRST result.
+        Resolves every query against the in-memory SlugResolver snapshots and picks the best match.
         """
         try:
             queries = args.get("queries", [])
             if not queries:
                 return {"results": [], "error": "No queries provided"}
 
-            results = []
-            
-            for query_item in queries:
-                query_type = query_item.get("type")
-                query = (query_item.get("query") or "").strip()
-                
-                if not query:
-                    results.append({
-                        "type": query_type,
-                        "query": query,
-                        "slug": None,
-                        "error": "Empty query"
-                    })
-                    continue
-
-                # Switch-case style (Python 3.10+)
-                match query_type:
-                    case "location":
-                        retriever = self.locations_slug_retriever
-                    case "primary_industry":
-                        retriever = self.primary_industry_slug_retriever
-                    case "secondary_industry":
-                        retriever = self.secondary_industry_slug_retriever
-                    case "topic":
-                        retriever = self.topics_slug_retriever
-                    case "region":
-                        retriever = self.regions_slug_retriever
-                    case _:
-                        results.append({
-                            "type": query_type,
-                            "query": query,
-                            "slug": None,
-                            "error": f"Unsupported type: {query_type}"
-                        })
-                        continue
-
-                # Direct invoke
-                retriever_results = retriever.invoke(query) if hasattr(retriever, "invoke") else []
-                if not retriever_results:
-                    results.append({
-                        "type": query_type,
-                        "query": query,
-                        "slug": None
-                    })
-                else:
-                    # Pick the first doc only
-                    first = retriever_results[0]
-                    slug = first.page_content
-                    results.append({
-                        "type": query_type,
-                        "query": query,
-                        "slug": slug
-                    })
+            # Exact/alias matches from memory, the rest scored locally in one batch per slug type
+            results = SlugResolver.resolve(queries)
 
             return {"results": results}
 
@@ -309,7 +235,7 @@ class AIChat:
         return pinecone_filters
 
 
-    async def _tool_search_documents(self, args: dict) -> dict:
+    def _tool_search_documents(self, args: dict) -> dict:
         """
         INPUT:
           {
@@ -341,14 +267,8 @@ class AIChat:
             filters = self._format_filters_for_pinecone(args.get("filters"))
             top_k = args.get("top_k", 10)
             
-            # Retrieve top 5 docs without any filters
-            docs_without_filter = self.vector_database.retrieve_by_metadata(query, {}, 5)
-
-            # Retrieve top_k docs with filters
-            docs = self.vector_database.retrieve_by_metadata(query, filters, top_k)
-            
-            # Merge lists properly
-            docs.extend(docs_without_filter)
+            # top_k filtered docs plus top 5 unfiltered docs, embedded once and merged by id
+            docs = self.vector_database.retrieve_with_fallback(query, filters, top_k, 5)
 
             return {"docs": [doc.model_dump() for doc in docs]}
 
@@ -356,7 +276,7 @@ class AIChat:
             return {"error": f"An error occurred:"}
 
         
-    async def _tool_fetch_serp_content(self, args: dict) -> dict:
+    def _tool_fetch_serp_content(self, args: dict) -> dict:
         """
         INPUT: {"query": "...", "num_results": 5}
         OUTPUT (example): {"results": [{"title":"...","url":"..."}, ...]}
@@ -375,7 +295,7 @@ class AIChat:
         
         
 
-    async def _tool_get_webpage_content(self, args: dict) -> dict:
+    def _tool_get_webpage_content(self, args: dict) -> dict:
         """
         INPUT: {"url": "..."}
         OUTPUT (example):
@@ -399,16 +319,17 @@ class AIChat:
     # -----------------------------
     # ROUTER FOR TOOL CALLS
     # -----------------------------
-    async def _dispatch_tool(self, name: str, arguments_json: str) -> dict:
+    def _dispatch_tool(self, name: str, arguments_json: str) -> dict:
+        # Tools are blocking; _run_tools_recursive runs them on ToolExecutor's pool
         args = json.loads(arguments_json or "{}")
         if name == "resolve_filter_slug":
-            return await self._tool_resolve_filter_slug(args)
+            return self._tool_resolve_filter_slug(args)
         if name == "search_documents":
-            return await self._tool_search_documents(args)
+            return self._tool_search_documents(args)
         if name == "fetch_serp_content":
-            return await self._tool_fetch_serp_content(args)
+            return self._tool_fetch_serp_content(args)
         if name == "get_webpage_content":
-            return await self._tool_get_webpage_content(args)
+            return self._tool_get_webpage_content(args)
         return {}
 
     def _collect_citations_from_docs(self, docs: list) -> list:
@@ -490,13 +411,15 @@ class AIChat:
             }
             chat_history.append(assistant_tool_msg)
 
-            # Dispatch each tool call (bounded)
-            for call_idx, tool_call in enumerate(message.tool_calls[:max_calls_per_round]):
-                tool_name = tool_call.function.name
-                tool_args_json = tool_call.function.arguments
+            # Dispatch the round's tool calls (bounded) concurrently, results keep call order
+            round_calls = message.tool_calls[:max_calls_per_round]
+            tool_results = await ToolExecutor.run_all_async([
+                (tc.function.name, partial(self._dispatch_tool, tc.function.name, tc.function.arguments))
+                for tc in round_calls
+            ])
 
-                # Execute the tool
-                tool_result = await self._dispatch_tool(tool_name, tool_args_json)
+            for tool_call, tool_result in zip(round_calls, tool_results):
+                tool_name = tool_call.function.name
 
                 # Update context & citations
                 aggregated_context, all_citations = self._accumulate_context_from_tool_result(
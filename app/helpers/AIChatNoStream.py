@@ -1,5 +1,6 @@
 import json
 import os
+from functools import partial
 import random
 import threading
 from typing import Any, Dict, List
@@ -12,6 +13,9 @@ from pinecone import Pinecone, ServerlessSpec, Index
 from pinecone.exceptions import NotFoundException
 from app.helpers.Utilities import Utils
 from app.helpers.VectorDB import VectorDB
+from app.helpers.ClientRegistry import ClientRegistry
+from app.helpers.SlugResolver import SlugResolver
+from app.helpers.ToolExecutor import ToolExecutor
 from langchain_pinecone import PineconeVectorStore
 from langchain_community.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -40,40 +44,16 @@ class AIChatNoStream:
         # )
         
         
-        self.chat = AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-        )
+        self.chat = ClientRegistry.get_chat_llm()
         
-        self.azure_client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_KEY"),
-            api_version="2024-12-01-preview",
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-        )
+        self.azure_client = ClientRegistry.get_azure_openai()
         
-        self.vector_database = VectorDB(namespace)
+        self.vector_database = VectorDB.get(namespace)
         self.vector_retriever = self.vector_database.get_vector_retriever()
         
-        self.types_vector_database = VectorDB(f"{namespace}-TYPES")
+        self.types_vector_database = VectorDB.get(f"{namespace}-TYPES")
         self.types_vector_retriever = self.types_vector_database.get_vector_retriever()
         
-        # Create vector DB helpers
-        self.locations_slug_vector_db_helper = VectorDB("LocationsSlug")
-        self.primary_industry_slug_vector_db_helper = VectorDB("PrimaryIndustrySlug")
-        self.secondary_industry_slug_vector_db_helper = VectorDB("SecondaryIndustrySlug")
-        self.topics_slug_vector_db_helper = VectorDB("TopicSlug")
-        self.regions_slug_vector_db_helper = VectorDB("RegionsSlug")
-
-        # Create retrievers for each namespace
-        self.locations_slug_retriever = self.locations_slug_vector_db_helper.get_vector_retriever()
-        self.primary_industry_slug_retriever = self.primary_industry_slug_vector_db_helper.get_vector_retriever()
-        self.secondary_industry_slug_retriever = self.secondary_industry_slug_vector_db_helper.get_vector_retriever()
-        self.topics_slug_retriever = self.topics_slug_vector_db_helper.get_vector_retriever()
-        self.regions_slug_retriever = self.regions_slug_vector_db_helper.get_vector_retriever()
         
         self.serp_helper = SERPHelper()
         self.pdf_generator_helper=PdfGenerator()
@@ -288,7 +268,12 @@ class AIChatNoStream:
             # Process tool calls if present
             # print(f"Checking tool calls - message_content: '{message_content}', has_tool_calls: {hasattr(response_message, 'tool_calls')}, tool_calls: {getattr(response_message, 'tool_calls', None)}")
             while not message_content and hasattr(response_message, 'tool_calls') and response_message.tool_calls and len(response_message.tool_calls) > 0:
-                for tool_call in response_message.tool_calls:
+                # Run the round's tool calls concurrently; outputs are consumed in call order below
+                round_outputs = ToolExecutor.run_all([
+                    (tc.function.name, partial(self.call_function, tc.function.name, json.loads(tc.function.arguments)))
+                    for tc in response_message.tool_calls
+                ])
+                for tool_call, output in zip(response_message.tool_calls, round_outputs):
                     
                     # Convert tool call to dictionary format
                     tool_call_dict = {
@@ -305,10 +290,8 @@ class AIChatNoStream:
                     
                     input_messages.setdefault("messages", []).append(tool_call_response)
 
-                    name = tool_call.function.name
-                    args = json.loads(tool_call.function.arguments)
-
-                    result,citations_ = self.call_function(name, args)
+                    # A failed or timed out call comes back as a bare {"error": ...} dict
+                    result, citations_ = output if isinstance(output, tuple) else (output, [])
                     citations.update(citations_)
                     tool_call_responses.append(result)
                     
@@ -438,66 +421,15 @@ class AIChatNoStream:
         INPUT: {"queries": [{"type": "location|primary_industry|secondary_industry|topic|region", "query": "..."}, ...]}
         OUTPUT: {"results": [{"type": "location", "query": "california", "slug": "california"}, ...]}
 
-        Uses the requested retriever for each query, runs a query, picks the FIRST result.
+        Resolves every query against the in-memory SlugResolver snapshots and picks the best match.
         """
         try:
             queries = args.get("queries", [])
             if not queries:
                 return {"results": [], "error": "No queries provided"}
 
-            results = []
-            
-            for query_item in queries:
-                query_type = query_item.get("type")
-                query = (query_item.get("query") or "").strip()
-                
-                if not query:
-                    results.append({
-                        "type": query_type,
-                        "query": query,
-                        "slug": None,
-                        "error": "Empty query"
-                    })
-                    continue
-
-                # Switch-case style (Python 3.10+)
-                match query_type:
-                    case "location":
-                        retriever = self.locations_slug_retriever
-                    case "primary_industry":
-                        retriever = self.primary_industry_slug_retriever
-                    case "secondary_industry":
-                        retriever = self.secondary_industry_slug_retriever
-                    case "topic":
-                        retriever = self.topics_slug_retriever
-                    case "region":
-                        retriever = self.regions_slug_retriever
-                    case _:
-                        results.append({
-                            "type": query_type,
-                            "query": query,
-                            "slug": None,
-                            "error": f"Unsupported type: {query_type}"
-                        })
-                        continue
-
-                # Direct invoke
-                retriever_results = retriever.invoke(query) if hasattr(retriever, "invoke") else []
-                if not retriever_results:
-                    results.append({
-                        "type": query_type,
-                        "query": query,
-                        "slug": None
-                    })
-                else:
-                    # Pick the first doc only
-                    first = retriever_results[0]
-                    slug = first.page_content
-                    results.append({
-                        "type": query_type,
-                        "query": query,
-                        "slug": slug
-                    })
+            # Exact/alias matches from memory, the rest scored locally in one batch per slug type
+            results = SlugResolver.resolve(queries)
 
             return {"results": results}
 
@@ -568,21 +500,8 @@ class AIChatNoStream:
             filters = self._format_filters_for_pinecone(args.get("filters"))
             top_k = args.get("top_k", 10)
             
-            # Retrieve top 5 docs without any filters
-            docs_without_filter = self.vector_database.retrieve_by_metadata(query, {}, 5)
-
-            # Retrieve top_k docs with filters
-            docs = self.vector_database.retrieve_by_metadata(query, filters, top_k)
-            
-            # Merge lists and remove duplicates
-            all_docs = docs + docs_without_filter
-            seen_ids = set()
-            docs = []
-            for doc in all_docs:
-                doc_id = doc.metadata.get('id', doc.page_content[:50])  # Use ID or first 50 chars as identifier
-                if doc_id not in seen_ids:
-                    seen_ids.add(doc_id)
-                    docs.append(doc)
+            # top_k filtered docs plus top 5 unfiltered docs, embedded once and merged by id
+            docs = self.vector_database.retrieve_with_fallback(query, filters, top_k, 5)
 
             return {"docs": [doc.model_dump() for doc in docs]}
 
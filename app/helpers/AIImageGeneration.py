@@ -5,6 +5,7 @@ from openai import AzureOpenAI
 
 import requests
 from app.helpers.AzureStorage import AzureBlobUploader
+from app.helpers.ClientRegistry import ClientRegistry
 
 from PIL import Image
 from pydantic import BaseModel
@@ -57,10 +58,7 @@ class NewsImageGenerator:
             f"to make it look like a genuine news article image. Limit to 50 words."
         )
 
-        chat_client=AzureOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview")       
+        chat_client=ClientRegistry.get_azure_openai()
             
         
         completion = chat_client.beta.chat.completions.parse(
@@ -78,11 +76,7 @@ class NewsImageGenerator:
         retries = 0
         while retries < max_retries:
             try:
-                image_client = AzureOpenAI(
-                    azure_endpoint=os.getenv('AZURE_OPENAI_IMAGE_ENDPOINT'),
-                    api_key=os.getenv('AZURE_OPENAI_IMAGE_KEY'),
-                    api_version="2024-04-01-preview"
-                )
+                image_client = ClientRegistry.get_azure_openai_image()
                 response = image_client.images.generate(
                     model="dall-e-3",
                     prompt=prompt.get("imagePrompt", ""),
@@ -0,0 +1,205 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import List, Optional
+
+from playwright.sync_api import sync_playwright
+
+
+def _block_heavy_resources(route, request):
+    if request.resource_type in ["image", "media", "font"]:
+        route.abort()
+    else:
+        route.continue_()
+
+
+class _BrowserWorker(threading.Thread):
+    """
+    One long-lived CDP connection to PLAYWRIGHT_WSS with a reusable page. The
+    sync Playwright API is bound to the thread that started it, so each
+    connection lives on its own thread and pages are fetched through the pool's
+    job queue.
+    """
+
+    def __init__(self, pool: "BrowserPool", index: int):
+        super().__init__(name=f"browser-{index}", daemon=True)
+        self.pool = pool
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.pages_served = 0
+        self.busy = False
+
+    def _close(self, stop_playwright: bool = False) -> None:
+        for closable in (self.page, self.browser):
+            try:
+                if closable is not None:
+                    closable.close()
+            except Exception:  # pylint: disable=broad-except
+                pass
+        self.page = self.browser = self.context = None
+        self.pages_served = 0
+        if stop_playwright and self.playwright is not None:
+            try:
+                self.playwright.stop()
+            except Exception:  # pylint: disable=broad-except
+                pass
+            self.playwright = None
+
+    def _ensure_page(self) -> None:
+        # Health check: recycle dead connections and connections that served their quota
+        if self.browser is not None:
+            if not self.browser.is_connected():
+                self.pool._count("crashes")
+                self._close()
+            elif self.pages_served >= self.pool.recycle_after_pages():
+                self.pool._count("recycles")
+                self._close()
+        if self.browser is None:
+            if self.playwright is None:
+                self.playwright = sync_playwright().start()
+            self.browser = self.playwright.chromium.connect_over_cdp(self.pool.wss(), timeout=30000)
+            self.context = self.browser.contexts[0] if self.browser.contexts else self.browser.new_context()
+            self.pool._count("connects")
+        if self.page is None or self.page.is_closed():
+            self.page = self.context.new_page()
+            self.page.route("**/*", _block_heavy_resources)
+
+    def _fetch(self, url: str) -> str:
+        self._ensure_page()
+        self.page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        self.page.wait_for_selector("body", timeout=20000)
+        html_content = self.page.content()
+        self.pages_served += 1
+        return html_content
+
+    def run(self) -> None:
+        last_used = time.monotonic()
+        while not self.pool._stop.is_set():
+            try:
+                job = self.pool._jobs.get(timeout=1)
+            except queue.Empty:
+                # Do not hold a remote browser session open while idle
+                if self.browser is not None and time.monotonic() - last_used > self.pool.idle_seconds():
+                    self._close()
+                continue
+            if job is None:
+                break
+            url, future, enqueued_at = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            self.busy = True
+            self.pool._record_wait(time.monotonic() - enqueued_at)
+            try:
+                future.set_result(self._fetch(url))
+                self.pool._count("pages")
+            except Exception as e:  # pylint: disable=broad-except
+                # Treat any failure as a possibly broken page/connection and start fresh next time
+                self.pool._count("errors")
+                self._close()
+                future.set_exception(e)
+            finally:
+                self.busy = False
+                last_used = time.monotonic()
+        self._close(stop_playwright=True)
+
+
+class BrowserPool:
+    """
+    Pool of PLAYWRIGHT_POOL_SIZE persistent browser connections used by the
+    Playwright fallback of WebsiteScraper, so a fetch no longer pays the CDP
+    handshake. The pool size is also the concurrency limit; extra fetches wait
+    in the queue. Connections are recycled after PLAYWRIGHT_RECYCLE_PAGES pages,
+    after an error or when the browser disconnects, and closed after
+    PLAYWRIGHT_IDLE_SECONDS without work. Workers start on the first fetch.
+    """
+
+    _lock = threading.Lock()
+    _jobs: "queue.Queue" = queue.Queue()
+    _workers: List[_BrowserWorker] = []
+    _stop = threading.Event()
+    _stats = {
+        "pages": 0, "errors": 0, "timeouts": 0, "connects": 0, "recycles": 0, "crashes": 0,
+        "waitSeconds": 0.0, "waits": 0,
+    }
+
+    @staticmethod
+    def wss() -> Optional[str]:
+        return os.getenv("PLAYWRIGHT_WSS")
+
+    @staticmethod
+    def size() -> int:
+        return max(1, int(os.getenv("PLAYWRIGHT_POOL_SIZE", "2")))
+
+    @staticmethod
+    def recycle_after_pages() -> int:
+        return int(os.getenv("PLAYWRIGHT_RECYCLE_PAGES", "50"))
+
+    @staticmethod
+    def idle_seconds() -> float:
+        return float(os.getenv("PLAYWRIGHT_IDLE_SECONDS", "300"))
+
+    @classmethod
+    def _count(cls, key: str) -> None:
+        with cls._lock:
+            cls._stats[key] += 1
+
+    @classmethod
+    def _record_wait(cls, seconds: float) -> None:
+        with cls._lock:
+            cls._stats["waits"] += 1
+            cls._stats["waitSeconds"] += seconds
+
+    @classmethod
+    def _ensure_started(cls) -> None:
+        # Also replaces workers that died, so the pool keeps its full size
+        with cls._lock:
+            cls._workers = [worker for worker in cls._workers if worker.is_alive()]
+            cls._stop.clear()
+            while len(cls._workers) < cls.size():
+                worker = _BrowserWorker(cls, len(cls._workers))
+                worker.start()
+                cls._workers.append(worker)
+
+    @classmethod
+    def fetch(cls, url: str, timeout: Optional[float] = None) -> str:
+        """Return the page's HTML. Raises if the page cannot be loaded or the wait times out."""
+        cls._ensure_started()
+        future: Future = Future()
+        cls._jobs.put((url, future, time.monotonic()))
+        try:
+            return future.result(timeout=timeout or float(os.getenv("PLAYWRIGHT_FETCH_TIMEOUT_SECONDS", "180")))
+        except FutureTimeoutError:
+            # Nobody waits for it any more; a queued job is then skipped by the workers
+            future.cancel()
+            cls._count("timeouts")
+            raise
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._lock:
+            workers = [worker for worker in cls._workers if worker.is_alive()]
+            stats = dict(cls._stats)
+        busy = sum(1 for worker in workers if worker.busy)
+        waits = stats.pop("waits")
+        wait_seconds = stats.pop("waitSeconds")
+        return {
+            "size": len(workers),
+            "busy": busy,
+            "connected": sum(1 for worker in workers if worker.browser is not None),
+            "utilisation": round(busy / len(workers), 2) if workers else 0.0,
+            "queued": cls._jobs.qsize(),
+            "avgWaitSeconds": round(wait_seconds / waits, 2) if waits else 0.0,
+            **stats,
+        }
+
+    @classmethod
+    def shutdown(cls) -> None:
+        cls._stop.set()
+        with cls._lock:
+            for _ in cls._workers:
+                cls._jobs.put(None)
+            cls._workers = []
@@ -1,3 +1,4 @@
+import copy
 import json
 import re
 import markdown
@@ -19,12 +20,14 @@ from langchain.schema import HumanMessage, SystemMessage
 from app.schemas.Dashboard import LegalCalendar
 from app.helpers.UrlScraperHelper import UrlScraperHelper
 from app.helpers.Scraper import WebsiteScraper
+from app.helpers.ClientRegistry import ClientRegistry
+from app.helpers.DashboardChoices import DashboardChoices
 from typing import List, Dict, Any, Optional
     
 class Calendar:
     def __init__(self):
         self.model = DashboardModel()
-        self.vector_store = VectorDB("source-hr-knowledge")
+        self.vector_store = VectorDB.get("source-hr-knowledge")
         self.industries_model = IndustriesModel()
         self.topics_model = TopicsModel()
         self.locations_model=LocationsModel()      
@@ -32,19 +35,8 @@ class Calendar:
         self.serp_helper = SERPHelper()
         self.url_scraper_helper = UrlScraperHelper()
         self.scraper = WebsiteScraper()
-        self.azure_client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_KEY"),
-            api_version="2024-12-01-preview",
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-        )
-        self.chat = AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-        )
+        self.azure_client = ClientRegistry.get_azure_openai()
+        self.chat = ClientRegistry.get_chat_llm()
     
     def _markdown_to_text(self, md: str) -> str:
         """Convert markdown to clean text."""
@@ -302,48 +294,8 @@ For each event, provide:
         except Exception as e:
             return {"success": False, "error": str(e)}
         
-    def get_dashboard_choices(self, dashboard_id: str):
-        dashboard = self.model.get_dashboard({"_id": ObjectId(dashboard_id)})
-        locations = getattr(dashboard, "locations", [])
-        industries = getattr(dashboard, "industries", [])
-        topics = getattr(dashboard, "topics", [])
-        regions = getattr(dashboard, "region", []) or []
-        location_slugs = []
-        for region in locations:
-            for loc in getattr(region, "locations", []):
-                slug = getattr(loc, "slug", None)
-                if slug:
-                    location_slugs.append(slug)
-        industry_slugs = []
-        for industry in industries:
-            primary_slug = getattr(industry, "primary_industry_slug", None)
-            if primary_slug:
-                industry_slugs.append(primary_slug)
-            for secondary in getattr(industry, "secondary_industry", []):
-                secondary_slug = getattr(secondary, "slug", None)
-                if secondary_slug:
-                    industry_slugs.append(secondary_slug)
-        topic_slugs = []
-        for category in topics:
-            for topic in getattr(category, "topics", []):
-                slug = getattr(topic, "slug", None)
-                if slug:
-                    topic_slugs.append(slug)
-
-        location_names = [slug.replace('-', ' ').title() for slug in location_slugs] if location_slugs else []
-        industry_names = [slug.replace('-', ' ').title() for slug in industry_slugs] if industry_slugs else []
-        topic_names = [slug.replace('-', ' ').title() for slug in topic_slugs] if topic_slugs else []
-        region_names = [region.replace('-', ' ').title() if isinstance(region, str) else str(region).replace('-', ' ').title() for region in regions] if regions else []
-        dashboard_choices = {
-            "location_names": location_names,
-            "industry_names": industry_names,
-            "topic_names": topic_names,
-            "region_names": region_names,
-            "regions": regions
-        }
-        return dashboard_choices
         
-    def retrieve_calendar(self, dashboard_id: str):
+    def generate_calendar_events(self, dashboard_choices: dict) -> list:
         """
         SOURCE-FIRST, NON-HALLUCINATING Legal Calendar Generation Pipeline
         
@@ -352,74 +304,84 @@ For each event, provide:
         STEP 3: SOURCE-BOUND EXTRACTION (LLM - extractive only)
         STEP 4: EVIDENCE ENFORCEMENT (built into extraction)
         STEP 5: PROGRAMMATIC GUARDRAILS
+        
+        Returns the validated events that have a sourceUrl.
+        """
+        # STEP 1: SERP-ONLY DISCOVERY (NO LLM)
+        print("[Calendar] STEP 1: Discovering candidate URLs via SERP...")
+        candidate_urls = self.discover_candidate_urls(dashboard_choices)
+        
+        if not candidate_urls:
+            print("[Calendar] No candidate URLs found")
+            return []
+        
+        # STEP 2: SOURCE SCRAPING (NO LLM)
+        print(f"[Calendar] STEP 2: Scraping {len(candidate_urls)} URLs...")
+        scraped_sources = []
+        for candidate in candidate_urls:
+            url = candidate["url"]
+            source_text = self._scrape_source_text(url)
+            if source_text:
+                scraped_sources.append({
+                    "url": url,
+                    "title": candidate.get("title", ""),
+                    "text": source_text
+                })
+        
+        if not scraped_sources:
+            print("[Calendar] No sources successfully scraped")
+            return []
+        
+        print(f"[Calendar] Successfully scraped {len(scraped_sources)} sources")
+        
+        # STEP 3: SOURCE-BOUND EXTRACTION (LLM - extractive only, no RAG, no web fetching)
+        print("[Calendar] STEP 3: Extracting events from sources (LLM extractive only)...")
+        all_events = []
+        for source in scraped_sources:
+            events = self._extract_events_from_source(
+                source["url"],
+                source["text"],
+                dashboard_choices
+            )
+            all_events.extend(events)
+        
+        if not all_events:
+            print("[Calendar] No events extracted from sources")
+            return []
+        
+        print(f"[Calendar] Extracted {len(all_events)} events from sources")
+        
+        # STEP 5: PROGRAMMATIC GUARDRAILS
+        print("[Calendar] STEP 5: Enforcing evidence guardrails...")
+        validated_events = self._enforce_evidence_guardrails(all_events)
+        
+        # Filter to only include events with valid sourceUrl
+        legal_events_dict = []
+        for event in validated_events:
+            if event.get('sourceUrl') and event.get('sourceUrl').strip():
+                legal_events_dict.append(event)
+
+        print(f"[Calendar] {len(legal_events_dict)} events passed validation")
+        return legal_events_dict
+
+    def retrieve_calendar(self, dashboard_id: str, generated: list = None, source_dashboard_id: str = None):
+        """
+        Generate the legal calendar for a dashboard (see generate_calendar_events).
+        When generated is given (events another dashboard with the same filters produced),
+        the pipeline is skipped and those events and their vectors are reused.
         """
         try:
-            dashboard_choices = self.get_dashboard_choices(dashboard_id)
-            
-            # STEP 1: SERP-ONLY DISCOVERY (NO LLM)
-            print("[Calendar] STEP 1: Discovering candidate URLs via SERP...")
-            candidate_urls = self.discover_candidate_urls(dashboard_choices)
-            
-            if not candidate_urls:
-                print("[Calendar] No candidate URLs found, returning existing calendar")
-                existing_docs = self.calendar_model.get_legal_calender(dashboard_id)
-                return {"success": True, "data": existing_docs if existing_docs else []}
-            
-            # STEP 2: SOURCE SCRAPING (NO LLM)
-            print(f"[Calendar] STEP 2: Scraping {len(candidate_urls)} URLs...")
-            scraped_sources = []
-            for candidate in candidate_urls:
-                url = candidate["url"]
-                source_text = self._scrape_source_text(url)
-                if source_text:
-                    scraped_sources.append({
-                        "url": url,
-                        "title": candidate.get("title", ""),
-                        "text": source_text
-                    })
-            
-            if not scraped_sources:
-                print("[Calendar] No sources successfully scraped, returning existing calendar")
-                existing_docs = self.calendar_model.get_legal_calender(dashboard_id)
-                return {"success": True, "data": existing_docs if existing_docs else []}
-            
-            print(f"[Calendar] Successfully scraped {len(scraped_sources)} sources")
-            
-            # STEP 3: SOURCE-BOUND EXTRACTION (LLM - extractive only, no RAG, no web fetching)
-            print("[Calendar] STEP 3: Extracting events from sources (LLM extractive only)...")
-            all_events = []
-            for source in scraped_sources:
-                events = self._extract_events_from_source(
-                    source["url"],
-                    source["text"],
-                    dashboard_choices
-                )
-                all_events.extend(events)
-            
-            if not all_events:
-                print("[Calendar] No events extracted from sources, returning existing calendar")
-                existing_docs = self.calendar_model.get_legal_calender(dashboard_id)
-                return {"success": True, "data": existing_docs if existing_docs else []}
-            
-            print(f"[Calendar] Extracted {len(all_events)} events from sources")
-            
-            # STEP 5: PROGRAMMATIC GUARDRAILS
-            print("[Calendar] STEP 5: Enforcing evidence guardrails...")
-            validated_events = self._enforce_evidence_guardrails(all_events)
-            
-            # Filter to only include events with valid sourceUrl
-            legal_events_dict = []
-            for event in validated_events:
-                if event.get('sourceUrl') and event.get('sourceUrl').strip():
-                    legal_events_dict.append(event)
-            
+            if generated is None:
+                legal_events_dict = self.generate_calendar_events(DashboardChoices.get(dashboard_id))
+            else:
+                legal_events_dict = copy.deepcopy(generated)
+            shareable = copy.deepcopy(legal_events_dict)
+
             if not legal_events_dict:
-                print("[Calendar] No validated events with sourceUrl found, skipping save")
+                print("[Calendar] No validated events with sourceUrl found, returning existing calendar")
                 existing_docs = self.calendar_model.get_legal_calender(dashboard_id)
                 return {"success": True, "data": existing_docs if existing_docs else []}
             
-            print(f"[Calendar] {len(legal_events_dict)} events passed validation")
-            
             # Save scraped URLs to vector DB for future reference (optional, for other features)
             calendar_urls = [item.get('sourceUrl') for item in legal_events_dict if item.get('sourceUrl')]
             if calendar_urls:
@@ -427,9 +389,10 @@ For each event, provide:
                     scrape_result = self.url_scraper_helper.scrape_and_save_urls(
                         urls=calendar_urls,
                         dashboard_id=dashboard_id,
-                        source="calendar"
+                        source="calendar",
+                        copy_from_dashboard_id=source_dashboard_id
                     )
-                    print(f"[Calendar] Saved {scrape_result.get('scraped_count', 0)} URLs to vector DB")
+                    print(f"[Calendar] Saved {scrape_result.get('scraped_count', 0)} URLs to vector DB, copied {scrape_result.get('copied_count', 0)}")
                 except Exception as e:
                     print(f"[Calendar] Error saving URLs to vector DB: {e}")
 
@@ -477,7 +440,7 @@ For each event, provide:
 
             # Return the up-to-date legal calendar documents
             saved_legal_calendar = self.calendar_model.get_legal_calender(dashboard_id)
-            return {"success": True, "data": saved_legal_calendar}
+            return {"success": True, "data": saved_legal_calendar, "generated": shareable}
 
         except Exception as e:
             print(f"Error in retrieve_legal_calendar: {e}")
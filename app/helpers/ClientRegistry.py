@@ -0,0 +1,185 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from dotenv import load_dotenv
+from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+from langchain_pinecone import PineconeVectorStore
+from langsmith import wrappers
+from openai import AsyncAzureOpenAI, AzureOpenAI, DefaultHttpxClient
+from pinecone import Pinecone
+
+from app.helpers.EmbeddingCache import CachedEmbeddings
+from app.helpers.RateLimiter import RateLimiter
+
+load_dotenv()
+
+
+class ClientRegistry:
+    """
+    Process-wide, lazily initialised pool of external clients.
+
+    Pinecone, Azure OpenAI and embedding clients are created once per process
+    and shared by every helper and service, so request handlers and scheduled
+    jobs stop paying constructor and connection setup cost on every call.
+    """
+
+    # Guards the dictionaries only; factories run under their key's own lock
+    _lock = threading.RLock()
+    _key_locks: Dict[Hashable, threading.RLock] = {}
+    _clients: Dict[Hashable, Any] = {}
+    _stats: Dict[Hashable, Dict[str, int]] = {}
+
+    @classmethod
+    def _reuse(cls, key: Hashable) -> Any:
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is not None:
+                cls._stats[key]["reused"] += 1
+            return client
+
+    @classmethod
+    def get_or_create(cls, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the client registered under key, building it with factory on first use.
+        Concurrent first uses of one key build it once; other keys are not blocked
+        while a factory does its network I/O. Entries are never evicted, so keys
+        must come from a fixed set (no per-dashboard or per-namespace keys).
+        """
+        client = cls._reuse(key)
+        if client is not None:
+            return client
+        with cls._lock:
+            key_lock = cls._key_locks.setdefault(key, threading.RLock())
+        with key_lock:
+            client = cls._reuse(key)
+            if client is not None:
+                return client
+            client = factory()
+            with cls._lock:
+                cls._clients[key] = client
+                cls._stats[key] = {"created": 1, "reused": 0}
+            return client
+
+    @classmethod
+    def get_pinecone(cls) -> Pinecone:
+        return cls.get_or_create("pinecone", lambda: Pinecone(api_key=os.getenv('PINECONE_API_KEY')))
+
+    @classmethod
+    def get_index(cls, index_name: str = None):
+        index_name = index_name or os.getenv("PINECONE_INDEX")
+        return cls.get_or_create(("pinecone_index", index_name), lambda: cls.get_pinecone().Index(index_name))
+
+    @classmethod
+    def get_azure_http_client(cls) -> DefaultHttpxClient:
+        """
+        HTTP client shared by the synchronous Azure OpenAI clients. When an
+        "azure_openai" rate is configured (RATE_LIMIT_AZURE_OPENAI_PER_MINUTE,
+        sized to the deployment's quota), every request first takes a token.
+        """
+        def build() -> DefaultHttpxClient:
+            if RateLimiter.for_provider("azure_openai").rate <= 0:
+                return DefaultHttpxClient()
+            return DefaultHttpxClient(
+                event_hooks={"request": [lambda request: RateLimiter.acquire_for("azure_openai")]}
+            )
+        return cls.get_or_create("azure_http_client", build)
+
+    @classmethod
+    def get_embeddings(cls) -> AzureOpenAIEmbeddings:
+        return cls.get_or_create("embeddings", lambda: AzureOpenAIEmbeddings(
+            model="text-embedding-3-large",
+            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
+            api_key=os.getenv('AZURE_OPENAI_KEY'),
+            openai_api_version='2024-12-01-preview',
+            http_client=cls.get_azure_http_client()
+        ))
+
+    @classmethod
+    def get_cached_embeddings(cls) -> CachedEmbeddings:
+        """
+        Embeddings whose query vectors are served from EmbeddingCache.
+        """
+        return cls.get_or_create("cached_embeddings", lambda: CachedEmbeddings(
+            cls.get_embeddings(), "text-embedding-3-large"
+        ))
+
+    @classmethod
+    def get_vector_store(cls, namespace: str) -> PineconeVectorStore:
+        """
+        Per-namespace vector store view sharing the pooled index and embeddings.
+        The view itself is cheap and not pooled, since namespaces are unbounded.
+        """
+        return PineconeVectorStore(
+            index=cls.get_index(),
+            embedding=cls.get_cached_embeddings(),
+            namespace=namespace
+        )
+
+    @classmethod
+    def get_azure_openai(cls) -> AzureOpenAI:
+        return cls.get_or_create("azure_openai", lambda: AzureOpenAI(
+            api_key=os.getenv("AZURE_OPENAI_KEY"),
+            api_version="2024-12-01-preview",
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            http_client=cls.get_azure_http_client()
+        ))
+
+    @classmethod
+    def get_azure_openai_image(cls) -> AzureOpenAI:
+        return cls.get_or_create("azure_openai_image", lambda: AzureOpenAI(
+            azure_endpoint=os.getenv('AZURE_OPENAI_IMAGE_ENDPOINT'),
+            api_key=os.getenv('AZURE_OPENAI_IMAGE_KEY'),
+            api_version="2024-04-01-preview"
+        ))
+
+    @classmethod
+    def get_async_azure_openai(cls):
+        """
+        LangSmith-traced async Azure OpenAI client used by the streaming chat.
+        """
+        return cls.get_or_create("async_azure_openai", lambda: wrappers.wrap_openai(AsyncAzureOpenAI(
+            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
+            azure_deployment=os.getenv('gpt-4o-mini'),
+            api_key=os.getenv('AZURE_OPENAI_KEY'),
+            api_version="2024-12-01-preview",
+        )))
+
+    @classmethod
+    def get_chat_llm(cls, streaming: bool = False) -> AzureChatOpenAI:
+        """
+        Shared gpt-4o-mini chat model. The streaming variant echoes tokens to stdout.
+        """
+        def factory():
+            kwargs = {}
+            if streaming:
+                kwargs = {"streaming": True, "callbacks": [StreamingStdOutCallbackHandler()]}
+            return AzureChatOpenAI(
+                azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
+                azure_deployment=os.getenv('gpt-4o-mini'),
+                api_key=os.getenv('AZURE_OPENAI_KEY'),
+                api_version="2024-12-01-preview",
+                model_name="gpt-4o-mini",
+                openai_api_type="azure",
+                http_client=cls.get_azure_http_client(),
+                **kwargs
+            )
+        return cls.get_or_create(("chat_llm", streaming), factory)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Number of pooled clients and how often each one was created and reused.
+        """
+        with cls._lock:
+            by_client = {
+                key if isinstance(key, str) else ":".join(str(part) for part in key): dict(counts)
+                for key, counts in cls._stats.items()
+            }
+        return {
+            "clients": len(by_client),
+            "created": sum(c["created"] for c in by_client.values()),
+            "reused": sum(c["reused"] for c in by_client.values()),
+            "by_client": by_client,
+        }
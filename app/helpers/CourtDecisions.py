@@ -1,4 +1,6 @@
+import copy
 import json
+from functools import partial
 
 from langchain_openai import AzureChatOpenAI
 from app.models.Dashboard import DashboardModel
@@ -15,31 +17,23 @@ from app.helpers.SERP import SERPHelper
 from langchain.schema import HumanMessage, SystemMessage
 from app.schemas.Dashboard import CourtDecisionList
 from app.helpers.UrlScraperHelper import UrlScraperHelper
+from app.helpers.ClientRegistry import ClientRegistry
+from app.helpers.DashboardChoices import DashboardChoices
+from app.helpers.ToolExecutor import ToolExecutor
 
     
 class CourtDecisions:
     def __init__(self):
         self.model = DashboardModel()
-        self.vector_store = VectorDB("source-hr-knowledge")
+        self.vector_store = VectorDB.get("source-hr-knowledge")
         self.industries_model = IndustriesModel()
         self.topics_model = TopicsModel()
         self.locations_model=LocationsModel()      
         self.court_decisions_model = CourtDecisionsModel()
         self.serp_helper = SERPHelper()
         self.url_scraper_helper = UrlScraperHelper()
-        self.azure_client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_KEY"),
-            api_version="2024-12-01-preview",
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-        )
-        self.chat = AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-        )
+        self.azure_client = ClientRegistry.get_azure_openai()
+        self.chat = ClientRegistry.get_chat_llm()
     
     
     # Tool implementations
@@ -108,198 +102,176 @@ class CourtDecisions:
             return {"success": True, "pages": pages}
         except Exception as e:
             return {"success": False, "error": str(e)}
-        
-    def get_dashboard_choices(self, dashboard_id: str):
-        dashboard = self.model.get_dashboard({"_id": ObjectId(dashboard_id)})
-        locations = getattr(dashboard, "locations", [])
-        industries = getattr(dashboard, "industries", [])
-        topics = getattr(dashboard, "topics", [])
-        regions = getattr(dashboard, "region", []) or []
-        location_slugs = []
-        for region in locations:
-            for loc in getattr(region, "locations", []):
-                slug = getattr(loc, "slug", None)
-                if slug:
-                    location_slugs.append(slug)
-        industry_slugs = []
-        for industry in industries:
-            primary_slug = getattr(industry, "primary_industry_slug", None)
-            if primary_slug:
-                industry_slugs.append(primary_slug)
-            for secondary in getattr(industry, "secondary_industry", []):
-                secondary_slug = getattr(secondary, "slug", None)
-                if secondary_slug:
-                    industry_slugs.append(secondary_slug)
-        topic_slugs = []
-        for category in topics:
-            for topic in getattr(category, "topics", []):
-                slug = getattr(topic, "slug", None)
-                if slug:
-                    topic_slugs.append(slug)
 
-        location_names = [slug.replace('-', ' ').title() for slug in location_slugs] if location_slugs else []
-        industry_names = [slug.replace('-', ' ').title() for slug in industry_slugs] if industry_slugs else []
-        topic_names = [slug.replace('-', ' ').title() for slug in topic_slugs] if topic_slugs else []
-        region_names = [region.replace('-', ' ').title() if isinstance(region, str) else str(region).replace('-', ' ').title() for region in regions] if regions else []
-        dashboard_choices = {
-            "location_names": location_names,
-            "industry_names": industry_names,
-            "topic_names": topic_names,
-            "region_names": region_names,
-            "regions": regions
-        }
-        return dashboard_choices
+    def _call_tool(self, function_name: str, args: dict, region_slugs: list = None):
+        if function_name == "search_documents":
+            # Add region filtering if regions exist in dashboard
+            return self._tool_search_documents(**args, region_slugs=region_slugs)
+        elif function_name == "fetch_serp_content":
+            return self._tool_fetch_serp_content(**args)
+        elif function_name == "get_webpage_content":
+            return self._tool_get_webpage_content(**args)
+        return {"success": False, "error": f"Unknown function: {function_name}"}
+
         
-    def retrieve_court_decisions(self, dashboard_id: str):
-        try:
-            dashboard_choices = self.get_dashboard_choices(dashboard_id)
-            # Prepare readable strings from choices
-            location_str = ", ".join(dashboard_choices.get("location_names", [])) or "all locations"
-            industry_str = ", ".join(dashboard_choices.get("industry_names", [])) or "all industries"
-            topic_str = ", ".join(dashboard_choices.get("topic_names", [])) or "all topics"
-            region_str = ", ".join(dashboard_choices.get("region_names", [])) if dashboard_choices.get("region_names") else ""
-            tools = [
-                        {
-                            "type": "function",
-                            "function": {
-                                "name": "search_documents",
-                                "description": "Search HR law documents in Pinecone with semantic query and metadata filters.",
-                                "parameters": {
-                                    "type": "object",
-                                    "properties": {
-                                        "query": {"type": "string"},
-                                        "filters": {
-                                            "type": "object",
-                                            "properties": {
-                                                "location_slug": {"type": "string"},
-                                                "primary_industry_slug": {"type": "string"},
-                                                "secondary_industry_slug": {"type": "string"},
-                                                "region_slug": {"type": "string"},
-                                                "topic_slug": {"type": "string"},
-                                                "sourceType": {"type": "string"},
-                                                "discussedTimestamp_gt": {"type": "number"},
-                                                "discussedTimestamp_lt": {"type": "number"}
-                                            }
-                                        },
-                                        "top_k": {"type": "integer", "default": 10}
+    def generate_court_decisions(self, dashboard_choices: dict) -> list:
+        """Run the LLM/tool pipeline for a set of dashboard choices and return the court decisions that have a sourceUrl."""
+        # Prepare readable strings from choices
+        location_str = ", ".join(dashboard_choices.get("location_names", [])) or "all locations"
+        industry_str = ", ".join(dashboard_choices.get("industry_names", [])) or "all industries"
+        topic_str = ", ".join(dashboard_choices.get("topic_names", [])) or "all topics"
+        region_str = ", ".join(dashboard_choices.get("region_names", [])) if dashboard_choices.get("region_names") else ""
+        tools = [
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": "search_documents",
+                            "description": "Search HR law documents in Pinecone with semantic query and metadata filters.",
+                            "parameters": {
+                                "type": "object",
+                                "properties": {
+                                    "query": {"type": "string"},
+                                    "filters": {
+                                        "type": "object",
+                                        "properties": {
+                                            "location_slug": {"type": "string"},
+                                            "primary_industry_slug": {"type": "string"},
+                                            "secondary_industry_slug": {"type": "string"},
+                                            "region_slug": {"type": "string"},
+                                            "topic_slug": {"type": "string"},
+                                            "sourceType": {"type": "string"},
+                                            "discussedTimestamp_gt": {"type": "number"},
+                                            "discussedTimestamp_lt": {"type": "number"}
+                                        }
                                     },
-                                    "required": ["query"]
-                                }
+                                    "top_k": {"type": "integer", "default": 10}
+                                },
+                                "required": ["query"]
                             }
-                        },
-                        {
-                            "type": "function",
-                            "function": {
-                                "name": "fetch_serp_content",
-                                "description": "Fetch latest HR/legal resources from the web via SERP API.",
-                                "parameters": {
-                                    "type": "object",
-                                    "properties": {
-                                        "query": {"type": "string"},
-                                        "num_results": {"type": "integer", "default": 5}
-                                    },
-                                    "required": ["query"]
-                                }
+                        }
+                    },
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": "fetch_serp_content",
+                            "description": "Fetch latest HR/legal resources from the web via SERP API.",
+                            "parameters": {
+                                "type": "object",
+                                "properties": {
+                                    "query": {"type": "string"},
+                                    "num_results": {"type": "integer", "default": 5}
+                                },
+                                "required": ["query"]
                             }
-                        },
-                        {
-                            "type": "function",
-                            "function": {
-                                "name": "get_webpage_content",
-                                "description": "Scrape and clean webpage content from one or more URLs in parallel. Use 'urls' for multiple URLs or 'url' for single URL.",
-                                "parameters": {
-                                    "type": "object",
-                                    "properties": {
-                                        "urls": {
-                                            "type": "array",
-                                            "items": {"type": "string"},
-                                            "description": "Array of URLs to scrape content from (preferred for multiple URLs)"
-                                        },
-                                        "url": {
-                                            "type": "string",
-                                            "description": "Single URL to scrape (alternative to urls array)"
-                                        }
+                        }
+                    },
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": "get_webpage_content",
+                            "description": "Scrape and clean webpage content from one or more URLs in parallel. Use 'urls' for multiple URLs or 'url' for single URL.",
+                            "parameters": {
+                                "type": "object",
+                                "properties": {
+                                    "urls": {
+                                        "type": "array",
+                                        "items": {"type": "string"},
+                                        "description": "Array of URLs to scrape content from (preferred for multiple URLs)"
+                                    },
+                                    "url": {
+                                        "type": "string",
+                                        "description": "Single URL to scrape (alternative to urls array)"
                                     }
                                 }
                             }
                         }
-                    ]
-            messages = [
-                    {
-                        "role": "system",
-                        "content": """You are a legal news analyst. Analyze the provided documents and extract at least 4 unique structured court decisions about
-                    changes in employment law or HR regulations.
-                    You have the following tools to help you:
-                    - search_documents: Search HR law documents in Pinecone with semantic query and metadata filters.
-                    - fetch_serp_content: Fetch latest HR/legal resources from the web via SERP API.
-                    - get_webpage_content: Scrape and clean webpage content from one or more URLs in parallel. Use 'urls' for multiple URLs or 'url' for single URL.
-                    """
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""Extract 4 unique structured court decisions about changes in employment law or HR regulations.
-                        current date: {datetime.utcnow()}
-                        Focus on the following dashboard context:
-                        - Locations: {location_str}
-                        - Industries: {industry_str}
-                        - Topics: {topic_str}
-                        - Regions: {region_str if region_str else "all regions"}
-                        """
                     }
                 ]
+        messages = [
+                {
+                    "role": "system",
+                    "content": """You are a legal news analyst. Analyze the provided documents and extract at least 4 unique structured court decisions about
+                changes in employment law or HR regulations.
+                You have the following tools to help you:
+                - search_documents: Search HR law documents in Pinecone with semantic query and metadata filters.
+                - fetch_serp_content: Fetch latest HR/legal resources from the web via SERP API.
+                - get_webpage_content: Scrape and clean webpage content from one or more URLs in parallel. Use 'urls' for multiple URLs or 'url' for single URL.
+                """
+                },
+                {
+                    "role": "user",
+                    "content": f"""Extract 4 unique structured court decisions about changes in employment law or HR regulations.
+                    current date: {datetime.utcnow()}
+                    Focus on the following dashboard context:
+                    - Locations: {location_str}
+                    - Industries: {industry_str}
+                    - Topics: {topic_str}
+                    - Regions: {region_str if region_str else "all regions"}
+                    """
+                }
+            ]
+        response = self.azure_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            tools=tools
+        )
+        response_message = response.choices[0].message
+        message_content = response.choices[0].message.content
+
+        while not message_content and response_message.tool_calls:
+            # Run the round's tool calls concurrently; messages keep the original call order
+            region_slugs = dashboard_choices.get("regions", [])
+            round_results = ToolExecutor.run_all([
+                (tc.function.name, partial(self._call_tool, tc.function.name, json.loads(tc.function.arguments), region_slugs))
+                for tc in response_message.tool_calls
+            ])
+            for tool_call, result in zip(response_message.tool_calls, round_results):
+                function_name = tool_call.function.name
+
+                messages.append({
+                "role": "assistant",
+                "tool_calls": [tool_call.model_dump()]
+                    })
+
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "name": function_name,
+                    "content": json.dumps(result)
+                })
+
             response = self.azure_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=messages,
                 tools=tools
-            )
+                )
             response_message = response.choices[0].message
             message_content = response.choices[0].message.content
+        court_decisons = self.format_court_decisions(message_content)
+        
+        # Filter to only include entries with sourceUrl
+        court_decisons_with_url = []
+        for court_decision in court_decisons:
+            if isinstance(court_decision, dict):
+                url = court_decision.get('sourceUrl', '')
+            else:
+                url = getattr(court_decision, 'sourceUrl', '')
+            if url and url.strip():
+                court_decisons_with_url.append(court_decision)
 
-            while not message_content and response_message.tool_calls:
-                for tool_call in response_message.tool_calls:
-
-            
-                    function_name = tool_call.function.name
-                    args = json.loads(tool_call.function.arguments)
-                    if function_name == "search_documents":
-                         # Add region filtering if regions exist in dashboard
-                        region_slugs = dashboard_choices.get("regions", [])
-                        result = self._tool_search_documents(**args, region_slugs=region_slugs)
-                    elif function_name == "fetch_serp_content":
-                        result = self._tool_fetch_serp_content(**args)
-                    elif function_name == "get_webpage_content":
-                        result = self._tool_get_webpage_content(**args)
-                        
-                    messages.append({
-                    "role": "assistant",
-                    "tool_calls": [tool_call.model_dump()]
-                        })
-
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "name": function_name,
-                        "content": json.dumps(result)
-                    })
+        return court_decisons_with_url
 
-                response = self.azure_client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages,
-                    tools=tools
-                    )
-                response_message = response.choices[0].message
-                message_content = response.choices[0].message.content
-            court_decisons = self.format_court_decisions(message_content)
-            
-            # Filter to only include entries with sourceUrl
-            court_decisons_with_url = []
-            for court_decision in court_decisons:
-                if isinstance(court_decision, dict):
-                    url = court_decision.get('sourceUrl', '')
-                else:
-                    url = getattr(court_decision, 'sourceUrl', '')
-                if url and url.strip():
-                    court_decisons_with_url.append(court_decision)
+    def retrieve_court_decisions(self, dashboard_id: str, generated: list = None, source_dashboard_id: str = None):
+        """
+        When generated is given (decisions another dashboard with the same filters produced),
+        the LLM pipeline is skipped and those decisions and their vectors are reused.
+        """
+        try:
+            if generated is None:
+                court_decisons_with_url = self.generate_court_decisions(DashboardChoices.get(dashboard_id))
+            else:
+                court_decisons_with_url = copy.deepcopy(generated)
+            shareable = copy.deepcopy(court_decisons_with_url)
             if not court_decisons_with_url:
                 print("[CourtDecisions] No court decisions with sourceUrl found, skipping save")
                 existing_docs = self.court_decisions_model.get_court_decisions(dashboard_id)
@@ -320,9 +292,10 @@ class CourtDecisions:
                     scrape_result = self.url_scraper_helper.scrape_and_save_urls(
                         urls=court_decision_urls,
                         dashboard_id=dashboard_id,
-                        source="court_decisions"
+                        source="court_decisions",
+                        copy_from_dashboard_id=source_dashboard_id
                     )
-                    print(f"[CourtDecisions] Scraped {scrape_result.get('scraped_count', 0)} URLs, skipped {scrape_result.get('skipped_count', 0)} URLs")
+                    print(f"[CourtDecisions] Scraped {scrape_result.get('scraped_count', 0)} URLs, copied {scrape_result.get('copied_count', 0)} URLs, skipped {scrape_result.get('skipped_count', 0)} URLs")
                     if scrape_result.get('errors'):
                         print(f"[CourtDecisions] Errors: {scrape_result.get('errors')}")
                 except Exception as e:
@@ -352,7 +325,7 @@ class CourtDecisions:
                 self.court_decisions_model.create(payload)
                 result = self.court_decisions_model.get_court_decisions(dashboard_id)
 
-            return {"success": True, "data": result}
+            return {"success": True, "data": result, "generated": shareable}
 
         except Exception as e:
             print(f"Error in retrieve_court_decisions: {e}")
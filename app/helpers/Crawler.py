@@ -1,15 +1,41 @@
-from typing import List, Set, Tuple
-from urllib.parse import urljoin, urlparse
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 from bs4 import BeautifulSoup
-from collections import deque
 import os
+import time
 import asyncio
+from app.helpers.PageCache import PageCache
 from app.helpers.Scraper import WebsiteScraper
+from app.models.CrawlCheckpoint import CrawlCheckpointModel
 from playwright.async_api import async_playwright
 
 
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_ga", "ref"}
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """
+    Canonical form used for the visited set: lowercase scheme and host, no
+    default port, no fragment, an empty path as "/", and the query sorted with
+    utm_* and other tracking parameters removed. Non-HTTP links return None.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    if scheme not in ("http", "https") or not parsed.hostname:
+        return None
+    netloc = parsed.hostname.lower()
+    if parsed.port and (scheme, parsed.port) not in (("http", 80), ("https", 443)):
+        netloc = f"{netloc}:{parsed.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, urlencode(query), ""))
+
+
 def is_same_domain(url: str, root_netloc: str) -> bool:
-    return urlparse(url).netloc == root_netloc
+    return urlparse(url).netloc.lower() == root_netloc.lower()
 
 
 def extract_links_spider(html: str, base_url: str) -> List[str]:
@@ -32,6 +58,8 @@ def try_spider(url: str) -> List[str] | None:
             and result[0].get("content")
         ):
             html = result[0]["content"]
+            # Keep the page so the scrape phase does not fetch it again
+            PageCache.put(url, html)
             return extract_links_spider(html, url)
     except Exception as e:
         print(f"[Spider Failed] {url} - {e}")
@@ -45,83 +73,197 @@ async def try_playwright_async(url: str, browser) -> List[str] | None:
         links = await page.eval_on_selector_all(
             "a[href]", "els => els.map(el => el.href)"
         )
+        html = await page.content()
         await page.close()
+        await asyncio.get_running_loop().run_in_executor(None, PageCache.put, url, html)
         return links
     except Exception as e:
         print(f"[Playwright Failed] {url} - {e}")
         return None
 
 
-async def hybrid_crawl_logic_async(root_url: str, max_depth: int, max_urls: int) -> List[str]:
-    visited: Set[str] = set()
-    queue: deque[Tuple[str, int]] = deque([(root_url, 0)])
-    root_netloc = urlparse(root_url).netloc
-    print("Crawling Started for",root_url )
+class _DomainPoliteness:
+    """Spaces out requests to the same host by CRAWL_DOMAIN_DELAY_SECONDS across all workers."""
 
-    loop = asyncio.get_running_loop()
+    def __init__(self, delay_seconds: float):
+        self.delay_seconds = delay_seconds
+        self.next_allowed: Dict[str, float] = {}
+        self.lock = asyncio.Lock()
 
-    async with async_playwright() as playwright:
-        browser = None
-        wss_url = os.getenv("PLAYWRIGHT_WSS")
-
-        # Try WSS connection first
-        if wss_url:
-            retries = int(os.getenv("PLAYWRIGHT_WSS_RETRIES", "5"))
-            timeout_ms = int(os.getenv("PLAYWRIGHT_WSS_TIMEOUT_MS", "60000"))
-            for attempt in range(1, retries + 1):
-                try:
-                    browser = await playwright.chromium.connect_over_cdp(
-                        wss_url, timeout=timeout_ms
-                    )
-                    print("[Playwright WSS] Connected successfully.")
-                    break
-                except Exception as e:
-                    print(f"[Playwright WSS Connect Failed] attempt {attempt}/{retries}: {e}")
-                    if attempt < retries:
-                        backoff_seconds = min(5 * attempt, 20)
-                        await asyncio.sleep(backoff_seconds)
+    async def wait(self, url: str) -> None:
+        if self.delay_seconds <= 0:
+            return
+        host = urlparse(url).netloc
+        async with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_allowed.get(host, now))
+            self.next_allowed[host] = slot + self.delay_seconds
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
-        # Local fallback if WSS fails
-        if browser is None and os.getenv("PLAYWRIGHT_LOCAL_FALLBACK", "false").lower() == "true":
+
+async def _connect_browser(playwright):
+    browser = None
+    wss_url = os.getenv("PLAYWRIGHT_WSS")
+
+    # Try WSS connection first
+    if wss_url:
+        retries = int(os.getenv("PLAYWRIGHT_WSS_RETRIES", "5"))
+        timeout_ms = int(os.getenv("PLAYWRIGHT_WSS_TIMEOUT_MS", "60000"))
+        for attempt in range(1, retries + 1):
             try:
-                browser = await playwright.chromium.launch(headless=True)
-                print("[Playwright Local Fallback] Launched local Chromium.")
+                browser = await playwright.chromium.connect_over_cdp(
+                    wss_url, timeout=timeout_ms
+                )
+                print("[Playwright WSS] Connected successfully.")
+                break
             except Exception as e:
-                print(f"[Playwright Local Launch Failed] {e}")
-                return list(visited)  # No browser, stop crawling
+                print(f"[Playwright WSS Connect Failed] attempt {attempt}/{retries}: {e}")
+                if attempt < retries:
+                    backoff_seconds = min(5 * attempt, 20)
+                    await asyncio.sleep(backoff_seconds)
+
+    # Local fallback if WSS fails
+    if browser is None and os.getenv("PLAYWRIGHT_LOCAL_FALLBACK", "false").lower() == "true":
+        try:
+            browser = await playwright.chromium.launch(headless=True)
+            print("[Playwright Local Fallback] Launched local Chromium.")
+        except Exception as e:
+            print(f"[Playwright Local Launch Failed] {e}")
+    return browser
 
-        # Start crawling
-        while queue and len(visited) < max_urls:
-            current_url, depth = queue.popleft()
-            if current_url in visited or depth > max_depth:
-                continue
 
-            # Try spider (blocking) in threadpool
-            links = await loop.run_in_executor(None, try_spider, current_url)
+async def hybrid_crawl_logic_async(
+    root_url: str, max_depth: int, max_urls: int, checkpoint_key: Optional[str] = None
+) -> List[str]:
+    """
+    Crawl same-domain links from root_url breadth-first with CRAWL_WORKERS
+    concurrent workers sharing one frontier and visited set. Requests to a host
+    are spaced by CRAWL_DOMAIN_DELAY_SECONDS. With checkpoint_key, progress is
+    saved every CRAWL_CHECKPOINT_EVERY pages (and at least every minute) and a
+    crawl interrupted earlier resumes from its checkpoint.
+    """
+    root_url = normalize_url(root_url) or root_url
+    root_netloc = urlparse(root_url).netloc
+    workers = max(1, int(os.getenv("CRAWL_WORKERS", "8")))
+    checkpoint_every = max(1, int(os.getenv("CRAWL_CHECKPOINT_EVERY", "25")))
+    politeness = _DomainPoliteness(float(os.getenv("CRAWL_DOMAIN_DELAY_SECONDS", "0.5")))
 
-            # If spider fails, try Playwright
-            if links is None and browser is not None:
-                links = await try_playwright_async(current_url, browser)
+    visited: List[str] = []
+    failed: List[str] = []
+    # Queued or in progress, with their depth
+    frontier: Dict[str, int] = {root_url: 0}
+    checkpoints = CrawlCheckpointModel() if checkpoint_key else None
+    if checkpoints:
+        saved = checkpoints.load(checkpoint_key, root_url)
+        if saved:
+            visited = saved.get("visited", [])
+            failed = saved.get("failed", [])
+            frontier = {item["url"]: item["depth"] for item in saved.get("frontier", [])}
+            print(f"Resuming crawl of {root_url}: {len(visited)} crawled, {len(frontier)} queued")
+    # Everything ever queued, so a URL is crawled by at most one worker
+    seen: Set[str] = set(visited) | set(failed) | set(frontier)
+    print("Crawling Started for", root_url)
 
-            if links is None:
-                continue
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    for url, depth in frontier.items():
+        queue.put_nowait((url, depth))
+    pages_since_checkpoint = 0
+    # Fetches in flight, counted against max_urls together with visited
+    fetching = 0
+    slots = asyncio.Condition()
+    last_checkpoint_at = time.monotonic()
+
+    def save_checkpoint():
+        checkpoints.save(checkpoint_key, root_url, list(visited), list(failed), dict(frontier))
 
-            visited.add(current_url)
+    if checkpoints:
+        # Record the crawl as running straight away so it is resumable from the start
+        await loop.run_in_executor(None, save_checkpoint)
+
+    async with async_playwright() as playwright:
+        browser = await _connect_browser(playwright)
+
+        async def crawl_one(current_url: str, depth: int) -> None:
+            nonlocal fetching
+            # Reserve one of the max_urls slots before paying for a fetch; if the
+            # slots are all taken by fetches in flight, wait to see whether they succeed
+            async with slots:
+                await slots.wait_for(lambda: len(visited) >= max_urls or len(visited) + fetching < max_urls)
+                if len(visited) >= max_urls:
+                    return
+                fetching += 1
+            links = None
+            try:
+                await politeness.wait(current_url)
+                # Try spider (blocking) in threadpool
+                links = await loop.run_in_executor(None, try_spider, current_url)
+
+                # If spider fails, try Playwright
+                if links is None and browser is not None:
+                    links = await try_playwright_async(current_url, browser)
+            finally:
+                async with slots:
+                    fetching -= 1
+                    if links is not None:
+                        visited.append(current_url)
+                    slots.notify_all()
+
+            frontier.pop(current_url, None)
+            if links is None:
+                failed.append(current_url)
+                return
 
             if depth < max_depth:
                 for link in links:
-                    normalized = urljoin(current_url, link)
+                    normalized = normalize_url(urljoin(current_url, link))
                     if (
-                        is_same_domain(normalized, root_netloc)
-                        and normalized not in visited
-                        and len(visited) + len(queue) < max_urls
+                        normalized
+                        and is_same_domain(normalized, root_netloc)
+                        and normalized not in seen
+                        and len(seen) < max_urls + len(failed)
                     ):
-                        queue.append((normalized, depth + 1))
+                        seen.add(normalized)
+                        frontier[normalized] = depth + 1
+                        queue.put_nowait((normalized, depth + 1))
 
-        # Close browser
-        if browser:
-            await browser.close()
+        async def maybe_checkpoint() -> None:
+            nonlocal pages_since_checkpoint, last_checkpoint_at
+            pages_since_checkpoint += 1
+            if not checkpoints:
+                return
+            # Also save on a timer so slow crawls keep their checkpoint fresh
+            if pages_since_checkpoint >= checkpoint_every or time.monotonic() - last_checkpoint_at >= 60:
+                pages_since_checkpoint = 0
+                last_checkpoint_at = time.monotonic()
+                await loop.run_in_executor(None, save_checkpoint)
 
-    return list(visited)
+        async def worker() -> None:
+            while True:
+                current_url, depth = await queue.get()
+                try:
+                    if len(visited) < max_urls and depth <= max_depth:
+                        await crawl_one(current_url, depth)
+                        await maybe_checkpoint()
+                except Exception as e:
+                    print(f"[Crawl Failed] {current_url} - {e}")
+                finally:
+                    frontier.pop(current_url, None)
+                    queue.task_done()
 
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Close browser
+            if browser:
+                await browser.close()
 
+    if checkpoints:
+        await loop.run_in_executor(None, checkpoints.complete, checkpoint_key)
+    print(f"Crawling finished for {root_url}: {len(visited)} crawled, {len(failed)} failed")
+    return visited
@@ -0,0 +1,109 @@
+import copy
+import os
+import threading
+from collections import OrderedDict
+
+from bson import ObjectId
+
+from app.models.Dashboard import DashboardModel
+
+
+class DashboardChoices:
+    """
+    Resolves a dashboard into the slug and display-name sets used by the news,
+    calendar, court decision, law change and proactive message generators.
+
+    Results are cached per dashboard and keyed by its updatedAt, so the jobs
+    that run for the same dashboard only do a cheap updatedAt lookup instead
+    of reloading and re-parsing the whole dashboard. The cache is an LRU of
+    DASHBOARD_CHOICES_CACHE_SIZE entries shared by the whole process.
+    """
+
+    _lock = threading.Lock()
+    _cache: "OrderedDict[str, tuple]" = OrderedDict()
+    _stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _to_name(slug) -> str:
+        return str(slug).replace('-', ' ').title()
+
+    @classmethod
+    def _resolve(cls, dashboard) -> dict:
+        locations = getattr(dashboard, "locations", [])
+        industries = getattr(dashboard, "industries", [])
+        topics = getattr(dashboard, "topics", [])
+        regions = getattr(dashboard, "region", []) or []
+
+        location_slugs = []
+        for region in locations:
+            for loc in getattr(region, "locations", []):
+                slug = getattr(loc, "slug", None)
+                if slug:
+                    location_slugs.append(slug)
+        industry_slugs = []
+        for industry in industries:
+            primary_slug = getattr(industry, "primary_industry_slug", None)
+            if primary_slug:
+                industry_slugs.append(primary_slug)
+            for secondary in getattr(industry, "secondary_industry", []):
+                secondary_slug = getattr(secondary, "slug", None)
+                if secondary_slug:
+                    industry_slugs.append(secondary_slug)
+        topic_slugs = []
+        for category in topics:
+            for topic in getattr(category, "topics", []):
+                slug = getattr(topic, "slug", None)
+                if slug:
+                    topic_slugs.append(slug)
+
+        return {
+            "location_slugs": location_slugs,
+            "industry_slugs": industry_slugs,
+            "topic_slugs": topic_slugs,
+            "location_names": [cls._to_name(slug) for slug in location_slugs],
+            "industry_names": [cls._to_name(slug) for slug in industry_slugs],
+            "topic_names": [cls._to_name(slug) for slug in topic_slugs],
+            "region_names": [cls._to_name(region) for region in regions],
+            "regions": regions,
+        }
+
+    @classmethod
+    def get(cls, dashboard_id: str) -> dict:
+        """
+        Return the choices for dashboard_id. Callers get their own copy.
+        """
+        model = DashboardModel()
+        head = model.collection.find_one({"_id": ObjectId(dashboard_id)}, {"updatedAt": 1})
+        if head is None:
+            # Missing dashboards resolve to empty choices, as before
+            return cls._resolve(None)
+        version = head.get("updatedAt")
+
+        with cls._lock:
+            cached = cls._cache.get(dashboard_id)
+            if cached is not None and cached[0] == version:
+                cls._cache.move_to_end(dashboard_id)
+                cls._stats["hits"] += 1
+                return copy.deepcopy(cached[1])
+            cls._stats["misses"] += 1
+
+        choices = cls._resolve(model.get_dashboard({"_id": ObjectId(dashboard_id)}))
+        with cls._lock:
+            cls._cache[dashboard_id] = (version, choices)
+            cls._cache.move_to_end(dashboard_id)
+            while len(cls._cache) > int(os.getenv("DASHBOARD_CHOICES_CACHE_SIZE", "1024")):
+                cls._cache.popitem(last=False)
+        return copy.deepcopy(choices)
+
+    @classmethod
+    def invalidate(cls, dashboard_id: str = None) -> None:
+        with cls._lock:
+            if dashboard_id is None:
+                cls._cache.clear()
+            else:
+                cls._cache.pop(dashboard_id, None)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._lock:
+            return {**cls._stats, "size": len(cls._cache)}
@@ -1,4 +1,5 @@
 import json
+from functools import partial
 
 from langchain_openai import AzureChatOpenAI
 from app.models.Dashboard import DashboardModel
@@ -12,30 +13,22 @@ from openai  import AzureOpenAI
 import os
 from app.models.DashboardCompliance import DashboardComplianceModel
 from app.helpers.SERP import SERPHelper
+from app.helpers.ClientRegistry import ClientRegistry
+from app.helpers.DashboardChoices import DashboardChoices
+from app.helpers.ToolExecutor import ToolExecutor
 from langchain.schema import HumanMessage, SystemMessage
-from app.schemas.Dashboard import LawChangeListByLocation
+from app.schemas.Dashboard import LawChangeGroupByLocation, LawChangeListByLocation
 class DashboardCompliance:
     def __init__(self):
         self.model = DashboardModel()
-        self.vector_store = VectorDB("source-hr-knowledge")
+        self.vector_store = VectorDB.get("source-hr-knowledge")
         self.industries_model = IndustriesModel()
         self.topics_model = TopicsModel()
         self.locations_model=LocationsModel()      
         self.dashboard_compliance_model = DashboardComplianceModel()
         self.serp_helper = SERPHelper()
-        self.azure_client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_KEY"),
-            api_version="2024-12-01-preview",
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-        )
-        self.chat = AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-        )
+        self.azure_client = ClientRegistry.get_azure_openai()
+        self.chat = ClientRegistry.get_chat_llm()
     
     # Tool implementations
     def _tool_search_documents(self, query: str, filters: dict = None, top_k: int = 10, region_slugs: list = None):
@@ -103,192 +96,168 @@ class DashboardCompliance:
             return {"success": True, "pages": pages}
         except Exception as e:
             return {"success": False, "error": str(e)}
-        
-    def get_dashboard_choices(self, dashboard_id: str):
-        dashboard = self.model.get_dashboard({"_id": ObjectId(dashboard_id)})
-        locations = getattr(dashboard, "locations", [])
-        industries = getattr(dashboard, "industries", [])
-        topics = getattr(dashboard, "topics", [])
-        regions = getattr(dashboard, "region", []) or []
-        location_slugs = []
-        for region in locations:
-            for loc in getattr(region, "locations", []):
-                slug = getattr(loc, "slug", None)
-                if slug:
-                    location_slugs.append(slug)
-        industry_slugs = []
-        for industry in industries:
-            primary_slug = getattr(industry, "primary_industry_slug", None)
-            if primary_slug:
-                industry_slugs.append(primary_slug)
-            for secondary in getattr(industry, "secondary_industry", []):
-                secondary_slug = getattr(secondary, "slug", None)
-                if secondary_slug:
-                    industry_slugs.append(secondary_slug)
-        topic_slugs = []
-        for category in topics:
-            for topic in getattr(category, "topics", []):
-                slug = getattr(topic, "slug", None)
-                if slug:
-                    topic_slugs.append(slug)
 
-        location_names = [slug.replace('-', ' ').title() for slug in location_slugs] if location_slugs else []
-        industry_names = [slug.replace('-', ' ').title() for slug in industry_slugs] if industry_slugs else []
-        topic_names = [slug.replace('-', ' ').title() for slug in topic_slugs] if topic_slugs else []
-        region_names = [region.replace('-', ' ').title() if isinstance(region, str) else str(region).replace('-', ' ').title() for region in regions] if regions else []
-        dashboard_choices = {
-            "location_names": location_names,
-            "industry_names": industry_names,
-            "topic_names": topic_names,
-            "region_names": region_names,
-            "regions": regions
-        }
-        return dashboard_choices
+    def _call_tool(self, function_name: str, args: dict, region_slugs: list = None):
+        if function_name == "search_documents":
+            # Add region filtering if regions exist in dashboard
+            return self._tool_search_documents(**args, region_slugs=region_slugs)
+        elif function_name == "fetch_serp_content":
+            return self._tool_fetch_serp_content(**args)
+        elif function_name == "get_webpage_content":
+            return self._tool_get_webpage_content(**args)
+        return {"success": False, "error": f"Unknown function: {function_name}"}
+
         
-    def retrieve_law_changes(self, dashboard_id: str):
-        try:
-            dashboard_choices = self.get_dashboard_choices(dashboard_id)
-            # Prepare readable strings from choices
-            location_str = ", ".join(dashboard_choices.get("location_names", [])) 
-            industry_str = ", ".join(dashboard_choices.get("industry_names", [])) 
-            topic_str = ", ".join(dashboard_choices.get("topic_names", [])) 
-            region_str = ", ".join(dashboard_choices.get("region_names", [])) if dashboard_choices.get("region_names") else "" 
+    def generate_law_changes(self, dashboard_choices: dict) -> list:
+        """Run the LLM/tool pipeline for a set of dashboard choices and return the law changes grouped by location."""
+        # Prepare readable strings from choices
+        location_str = ", ".join(dashboard_choices.get("location_names", [])) 
+        industry_str = ", ".join(dashboard_choices.get("industry_names", [])) 
+        topic_str = ", ".join(dashboard_choices.get("topic_names", [])) 
+        region_str = ", ".join(dashboard_choices.get("region_names", [])) if dashboard_choices.get("region_names") else "" 
 
-            tools = [
-                        {
-                            "type": "function",
-                            "function": {
-                                "name": "search_documents",
-                                "description": "Search HR law documents in Pinecone with semantic query and metadata filters.",
-                                "parameters": {
-                                    "type": "object",
-                                    "properties": {
-                                        "query": {"type": "string"},
-                                        "filters": {
-                                            "type": "object",
-                                            "properties": {
-                                                "location_slug": {"type": "string"},
-                                                "primary_industry_slug": {"type": "string"},
-                                                "secondary_industry_slug": {"type": "string"},
-                                                "region_slug": {"type": "string"},
-                                                "topic_slug": {"type": "string"},
-                                                "sourceType": {"type": "string"},
-                                                "discussedTimestamp_gt": {"type": "number"},
-                                                "discussedTimestamp_lt": {"type": "number"}
-                                            }
-                                        },
-                                        "top_k": {"type": "integer", "default": 10}
+        tools = [
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": "search_documents",
+                            "description": "Search HR law documents in Pinecone with semantic query and metadata filters.",
+                            "parameters": {
+                                "type": "object",
+                                "properties": {
+                                    "query": {"type": "string"},
+                                    "filters": {
+                                        "type": "object",
+                                        "properties": {
+                                            "location_slug": {"type": "string"},
+                                            "primary_industry_slug": {"type": "string"},
+                                            "secondary_industry_slug": {"type": "string"},
+                                            "region_slug": {"type": "string"},
+                                            "topic_slug": {"type": "string"},
+                                            "sourceType": {"type": "string"},
+                                            "discussedTimestamp_gt": {"type": "number"},
+                                            "discussedTimestamp_lt": {"type": "number"}
+                                        }
                                     },
-                                    "required": ["query"]
-                                }
+                                    "top_k": {"type": "integer", "default": 10}
+                                },
+                                "required": ["query"]
                             }
-                        },
-                        {
-                            "type": "function",
-                            "function": {
-                                "name": "fetch_serp_content",
-                                "description": "Fetch latest HR/legal resources from the web via SERP API.",
-                                "parameters": {
-                                    "type": "object",
-                                    "properties": {
-                                        "query": {"type": "string"},
-                                        "num_results": {"type": "integer", "default": 5}
-                                    },
-                                    "required": ["query"]
-                                }
+                        }
+                    },
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": "fetch_serp_content",
+                            "description": "Fetch latest HR/legal resources from the web via SERP API.",
+                            "parameters": {
+                                "type": "object",
+                                "properties": {
+                                    "query": {"type": "string"},
+                                    "num_results": {"type": "integer", "default": 5}
+                                },
+                                "required": ["query"]
                             }
-                        },
-                        {
-                            "type": "function",
-                            "function": {
-                                "name": "get_webpage_content",
-                                "description": "Scrape and clean webpage content from one or more URLs in parallel. Use 'urls' for multiple URLs or 'url' for single URL.",
-                                "parameters": {
-                                    "type": "object",
-                                    "properties": {
-                                        "urls": {
-                                            "type": "array",
-                                            "items": {"type": "string"},
-                                            "description": "Array of URLs to scrape content from (preferred for multiple URLs)"
-                                        },
-                                        "url": {
-                                            "type": "string",
-                                            "description": "Single URL to scrape (alternative to urls array)"
-                                        }
+                        }
+                    },
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": "get_webpage_content",
+                            "description": "Scrape and clean webpage content from one or more URLs in parallel. Use 'urls' for multiple URLs or 'url' for single URL.",
+                            "parameters": {
+                                "type": "object",
+                                "properties": {
+                                    "urls": {
+                                        "type": "array",
+                                        "items": {"type": "string"},
+                                        "description": "Array of URLs to scrape content from (preferred for multiple URLs)"
+                                    },
+                                    "url": {
+                                        "type": "string",
+                                        "description": "Single URL to scrape (alternative to urls array)"
                                     }
                                 }
                             }
                         }
-                    ]
-            messages = [
-                    {
-                        "role": "system",
-                        "content": """You are a legal news analyst. Analyze the provided documents and extract at least 4 unique structured news items about
-                    changes in employment law or HR regulations in the past 3 months.
-                    You have the following tools to help you:
-                    - search_documents: Search HR law documents in Pinecone with semantic query and metadata filters.
-                    - fetch_serp_content: Fetch latest HR/legal resources from the web via SERP API.
-                    - get_webpage_content: Scrape and clean webpage content from one or more URLs in parallel. Use 'urls' for multiple URLs or 'url' for single URL.
+                    }
+                ]
+        messages = [
+                {
+                    "role": "system",
+                    "content": """You are a legal news analyst. Analyze the provided documents and extract at least 4 unique structured news items about
+                changes in employment law or HR regulations in the past 3 months.
+                You have the following tools to help you:
+                - search_documents: Search HR law documents in Pinecone with semantic query and metadata filters.
+                - fetch_serp_content: Fetch latest HR/legal resources from the web via SERP API.
+                - get_webpage_content: Scrape and clean webpage content from one or more URLs in parallel. Use 'urls' for multiple URLs or 'url' for single URL.
 
+                """
+                },
+                {
+                    "role": "user",
+                    "content": f"""Extract 4 unique structured news items about changes in employment law or HR regulations.
+                    current date: {datetime.utcnow()}
+                    past 3 months: {datetime.utcnow() - timedelta(days=90)}
+                    Focus on the following dashboard context:
+                    - Locations: {location_str}
+                    - Industries: {industry_str}
+                    - Topics: {topic_str}
+                    - Regions: {region_str if region_str else "all regions"}
                     """
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""Extract 4 unique structured news items about changes in employment law or HR regulations.
-                        current date: {datetime.utcnow()}
-                        past 3 months: {datetime.utcnow() - timedelta(days=90)}
-                        Focus on the following dashboard context:
-                        - Locations: {location_str}
-                        - Industries: {industry_str}
-                        - Topics: {topic_str}
-                        - Regions: {region_str if region_str else "all regions"}
-                        """
 
-                    }
-                ]
+                }
+            ]
+        response = self.azure_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            tools=tools
+        )
+        response_message = response.choices[0].message
+        message_content = response.choices[0].message.content
+
+        while not message_content and response_message.tool_calls:
+            # Run the round's tool calls concurrently; messages keep the original call order
+            region_slugs = dashboard_choices.get("regions", [])
+            round_results = ToolExecutor.run_all([
+                (tc.function.name, partial(self._call_tool, tc.function.name, json.loads(tc.function.arguments), region_slugs))
+                for tc in response_message.tool_calls
+            ])
+            for tool_call, result in zip(response_message.tool_calls, round_results):
+                function_name = tool_call.function.name
+
+                messages.append({
+                    "role": "assistant",
+                    "tool_calls": [tool_call.model_dump()]
+                })
+
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "name": function_name,
+                    "content": json.dumps(result)
+                })
+
+            # Get new response after processing tool calls
             response = self.azure_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=messages,
-                tools=tools
-            )
+                tools=tools                )
             response_message = response.choices[0].message
             message_content = response.choices[0].message.content
 
-            while not message_content and response_message.tool_calls:
-                for tool_call in response_message.tool_calls:
-                    function_name = tool_call.function.name
-                    args = json.loads(tool_call.function.arguments)
-                    if function_name == "search_documents":
-                        # Add region filtering if regions exist in dashboard
-                        region_slugs = dashboard_choices.get("regions", [])
-                        result = self._tool_search_documents(**args, region_slugs=region_slugs)
-                    elif function_name == "fetch_serp_content":
-                        result = self._tool_fetch_serp_content(**args)
-                    elif function_name == "get_webpage_content":
-                        result = self._tool_get_webpage_content(**args)
-                        
-                    messages.append({
-                        "role": "assistant",
-                        "tool_calls": [tool_call.model_dump()]
-                    })
-
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "name": function_name,
-                        "content": json.dumps(result)
-                    })
+        return self.format_law_changes(message_content)
 
-                # Get new response after processing tool calls
-                response = self.azure_client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages,
-                    tools=tools                )
-                response_message = response.choices[0].message
-                message_content = response.choices[0].message.content
-                
-                
-            law_changes = self.format_law_changes(message_content)
+    def retrieve_law_changes(self, dashboard_id: str, generated: list = None, source_dashboard_id: str = None):
+        """
+        When generated is given (law changes another dashboard with the same filters produced),
+        the LLM pipeline is skipped and those law changes are stored for this dashboard.
+        """
+        try:
+            if generated is None:
+                law_changes = self.generate_law_changes(DashboardChoices.get(dashboard_id))
+            else:
+                law_changes = [LawChangeGroupByLocation(**group) for group in generated]
 
             # Remove existing compliance entries for this dashboard before inserting new ones
             deleted_count = self.dashboard_compliance_model.delete_by_dashboard(dashboard_id)
@@ -309,7 +278,8 @@ class DashboardCompliance:
                 print(f"Persisting dashboard compliance failed: {e}")
             return {
                 "success": True,
-                "data": law_changes
+                "data": law_changes,
+                "generated": [group.model_dump(mode='json') for group in law_changes]
             }
 
         except Exception as e:
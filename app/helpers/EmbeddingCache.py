@@ -0,0 +1,113 @@
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from app.models.EmbeddingCache import EmbeddingCacheModel
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache for query embeddings keyed by model name and a hash of the
+    normalized text: a bounded in-process LRU (EMBEDDING_CACHE_MAX_ITEMS) in
+    front of the EmbeddingCache Mongo collection.
+    """
+
+    _lock = threading.Lock()
+    _memory: "OrderedDict[str, List[float]]" = OrderedDict()
+    _store = None
+    _stats = {"memory_hits": 0, "store_hits": 0, "misses": 0, "store_errors": 0}
+
+    @classmethod
+    def _max_items(cls) -> int:
+        return int(os.getenv("EMBEDDING_CACHE_MAX_ITEMS", "2048"))
+
+    @classmethod
+    def _get_store(cls) -> EmbeddingCacheModel:
+        if cls._store is None:
+            cls._store = EmbeddingCacheModel()
+        return cls._store
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        normalized = unicodedata.normalize("NFKC", text or "").lower()
+        normalized = re.sub(r"\s+", " ", normalized).strip()
+        return f"{model}:{hashlib.sha256(normalized.encode('utf-8')).hexdigest()}"
+
+    @classmethod
+    def _remember(cls, key: str, vector: List[float]) -> None:
+        with cls._lock:
+            cls._memory[key] = vector
+            cls._memory.move_to_end(key)
+            while len(cls._memory) > cls._max_items():
+                cls._memory.popitem(last=False)
+
+    @classmethod
+    def embed_query(cls, embeddings: Embeddings, model: str, text: str) -> List[float]:
+        """
+        Return the embedding of text, calling embeddings.embed_query only when
+        neither the memory nor the Mongo tier has it.
+        """
+        key = cls.make_key(model, text)
+        with cls._lock:
+            vector = cls._memory.get(key)
+            if vector is not None:
+                cls._memory.move_to_end(key)
+                cls._stats["memory_hits"] += 1
+                return vector
+
+        try:
+            vector = cls._get_store().get_vector(key)
+        except Exception as e:
+            print(f"[EmbeddingCache] Store lookup failed: {e}")
+            vector = None
+            with cls._lock:
+                cls._stats["store_errors"] += 1
+        if vector is not None:
+            with cls._lock:
+                cls._stats["store_hits"] += 1
+            cls._remember(key, vector)
+            return vector
+
+        vector = embeddings.embed_query(text)
+        with cls._lock:
+            cls._stats["misses"] += 1
+        cls._remember(key, vector)
+        try:
+            cls._get_store().save_vector(key, model, vector)
+        except Exception as e:
+            print(f"[EmbeddingCache] Store write failed: {e}")
+            with cls._lock:
+                cls._stats["store_errors"] += 1
+        return vector
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats["memory_items"] = len(cls._memory)
+        lookups = stats["memory_hits"] + stats["store_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["store_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper whose embed_query goes through EmbeddingCache.
+    Document embeddings are passed through unchanged.
+    """
+
+    def __init__(self, embeddings: Embeddings, model: str):
+        self.embeddings = embeddings
+        self.model = model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return EmbeddingCache.embed_query(self.embeddings, self.model, text)
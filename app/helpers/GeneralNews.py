@@ -7,6 +7,7 @@ from langchain_openai import AzureChatOpenAI
 
 from app.helpers.AzureStorage import AzureBlobUploader
 from app.helpers.SERP import SERPHelper
+from app.helpers.ClientRegistry import ClientRegistry
 from app.models.GeneralNews import GeneralNewsModel
 from app.schemas.GeneralNews import GeneralNewsDocument, GeneralNewsItem, GeneralNewsSummary
 
@@ -16,14 +17,7 @@ class GeneralNewsHelper:
         self.model = GeneralNewsModel()
         self.serp_helper = SERPHelper()
         self.azure_blob = AzureBlobUploader()
-        self.chat = AzureChatOpenAI(
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-            azure_deployment=os.getenv("gpt-4o-mini"),
-            api_key=os.getenv("AZURE_OPENAI_KEY"),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-        )
+        self.chat = ClientRegistry.get_chat_llm()
 
     def _fetch_logo_for_organization(self, organization_name: Optional[str]) -> Optional[str]:
         """Fetch logo URL for an organization using SERP API and upload to blob storage."""
@@ -0,0 +1,187 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.helpers.RateLimiter import RateLimiter
+
+
+class HttpClient:
+    """
+    Shared async HTTP layer for the scraping providers (Spider, BrightData) and
+    direct requests to crawled sites ("site").
+
+    Each provider gets one httpx.AsyncClient with a keep-alive connection pool,
+    so calls from the Calendar, News, SERP and crawler pipelines reuse TLS
+    connections instead of handshaking per request. All clients live on one
+    background event loop; synchronous call sites use request(), async code
+    awaits request_async(). Per provider, configured through
+    HTTP_<PROVIDER>_<SETTING>:
+
+    - MAX_CONNECTIONS: pool size (default 20)
+    - CONCURRENCY: requests in flight at once; others wait (default 8)
+    - TIMEOUT_SECONDS: total timeout per attempt (see DEFAULT_TIMEOUTS)
+    - RETRIES: extra attempts on connect/read errors, 429 and 5xx (default 2)
+
+    Every attempt first takes a token from the provider's RateLimiter.
+    """
+
+    DEFAULT_TIMEOUTS = {
+        # Spider waits for the DOM and a delay before returning the page
+        "spider": 120.0,
+        "brightdata": 60.0,
+        # Direct requests to crawled sites (sitemaps, conditional re-crawl checks)
+        "site": 30.0,
+    }
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    _lock = threading.Lock()
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _thread: Optional[threading.Thread] = None
+    _clients: Dict[str, httpx.AsyncClient] = {}
+    _semaphores: Dict[str, asyncio.Semaphore] = {}
+    _stats: Dict[str, dict] = {}
+
+    @staticmethod
+    def _setting(provider: str, name: str, default: str) -> str:
+        return os.getenv(f"HTTP_{provider.upper()}_{name}", default)
+
+    @classmethod
+    def _ensure_loop(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None or cls._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="http-client", daemon=True)
+                thread.start()
+                cls._loop, cls._thread = loop, thread
+            return cls._loop
+
+    @classmethod
+    def _stats_for(cls, provider: str) -> dict:
+        return cls._stats.setdefault(provider, {
+            "requests": 0,
+            "attempts": 0,
+            "retries": 0,
+            "errors": 0,
+            "inFlight": 0,
+            "latencySeconds": 0.0,
+        })
+
+    @classmethod
+    def _get_client(cls, provider: str) -> httpx.AsyncClient:
+        # Only called on the client loop, so the pool and semaphore are bound to it
+        client = cls._clients.get(provider)
+        if client is None:
+            max_connections = int(cls._setting(provider, "MAX_CONNECTIONS", "20"))
+            timeout = float(cls._setting(provider, "TIMEOUT_SECONDS", str(cls.DEFAULT_TIMEOUTS.get(provider, 60.0))))
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+                timeout=httpx.Timeout(timeout, connect=min(timeout, 15.0)),
+            )
+            cls._clients[provider] = client
+            cls._semaphores[provider] = asyncio.Semaphore(int(cls._setting(provider, "CONCURRENCY", "8")))
+        return client
+
+    @classmethod
+    async def _request_on_loop(cls, provider: str, method: str, url: str, **kwargs) -> httpx.Response:
+        client = cls._get_client(provider)
+        retries = int(cls._setting(provider, "RETRIES", "2"))
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            stats = cls._stats_for(provider)
+            stats["requests"] += 1
+        attempt = 0
+        async with cls._semaphores[provider]:
+            while True:
+                attempt += 1
+                # The token bucket blocks, so wait for it off the loop
+                await loop.run_in_executor(None, RateLimiter.acquire_for, provider)
+                started = time.monotonic()
+                with cls._lock:
+                    stats["attempts"] += 1
+                    stats["inFlight"] += 1
+                try:
+                    response = await client.request(method, url, **kwargs)
+                    error = None
+                except httpx.TransportError as e:
+                    response, error = None, e
+                finally:
+                    with cls._lock:
+                        stats["inFlight"] -= 1
+                        stats["latencySeconds"] += time.monotonic() - started
+
+                retryable = error is not None or response.status_code in cls.RETRY_STATUSES
+                if not retryable or attempt > retries:
+                    if retryable:
+                        with cls._lock:
+                            stats["errors"] += 1
+                    if error is not None:
+                        raise error
+                    return response
+
+                with cls._lock:
+                    stats["retries"] += 1
+                retry_after = response.headers.get("Retry-After") if response is not None else None
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+
+    @classmethod
+    async def request_async(cls, provider: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request on the provider's pool from any event loop."""
+        future = asyncio.run_coroutine_threadsafe(
+            cls._request_on_loop(provider, method, url, **kwargs), cls._ensure_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    @classmethod
+    def request(cls, provider: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Blocking wrapper for worker threads. Raises httpx.TransportError when every
+        attempt failed to connect or read; HTTP error statuses are returned.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            cls._request_on_loop(provider, method, url, **kwargs), cls._ensure_loop()
+        )
+        return future.result()
+
+    @classmethod
+    def post(cls, provider: str, url: str, **kwargs: Any) -> httpx.Response:
+        return cls.request(provider, "POST", url, **kwargs)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._lock:
+            stats = {provider: dict(values) for provider, values in cls._stats.items()}
+        report = {}
+        for provider, values in stats.items():
+            latency = values.pop("latencySeconds")
+            report[provider] = {
+                **values,
+                "avgLatencySeconds": round(latency / values["attempts"], 2) if values["attempts"] else 0.0,
+                "maxConnections": int(cls._setting(provider, "MAX_CONNECTIONS", "20")),
+                "concurrency": int(cls._setting(provider, "CONCURRENCY", "8")),
+            }
+        return report
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            loop, clients = cls._loop, list(cls._clients.values())
+            cls._loop, cls._thread = None, None
+            cls._clients, cls._semaphores = {}, {}
+        if loop is None or loop.is_closed():
+            return
+
+        async def close_clients():
+            for client in clients:
+                await client.aclose()
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_clients(), loop).result(timeout=5)
+        except Exception:  # pylint: disable=broad-except
+            pass
+        loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,196 @@
+import asyncio
+import os
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urljoin, urlparse
+
+import httpx
+from bs4 import BeautifulSoup
+
+from app.helpers.Crawler import is_same_domain, normalize_url
+from app.helpers.HttpClient import HttpClient
+from app.helpers.PageCache import PageCache
+from app.helpers.Scraper import WebsiteScraper
+from app.models.ContentFingerprint import ContentFingerprintModel
+
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Sitemap (ISO 8601) or RSS (RFC 822) date as naive UTC, None when unparseable."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class IncrementalCrawl:
+    """
+    Building blocks of the incremental re-crawl of a website crawl.
+
+    Seeds come from the site's sitemaps (robots.txt Sitemap: lines and
+    /sitemap.xml, following sitemap indexes) and the RSS/Atom feeds linked from
+    its home page, with their lastmod/pubDate when given. Known pages are then
+    checked with a conditional GET (If-None-Match / If-Modified-Since) and,
+    when the server does not answer 304, by comparing a hash of their text, so
+    only new or changed pages go back to the scraper. These requests go to the
+    site itself on the "site" HttpClient pool, not through Spider.
+    """
+
+    @staticmethod
+    async def _get(url: str, headers: Optional[dict] = None) -> Optional[httpx.Response]:
+        try:
+            return await HttpClient.request_async("site", "GET", url, headers=headers or {}, follow_redirects=True)
+        except httpx.HTTPError as e:
+            print(f"[IncrementalCrawl] GET {url} failed: {e}")
+            return None
+
+    @classmethod
+    async def _read_sitemap(cls, sitemap_url: str, seeds: Dict[str, Optional[datetime]], budget: dict) -> None:
+        if budget["files"] <= 0:
+            return
+        budget["files"] -= 1
+        response = await cls._get(sitemap_url)
+        if response is None or response.status_code != 200:
+            return
+        try:
+            root = ElementTree.fromstring(response.content)
+        except ElementTree.ParseError:
+            return
+        children = []
+        for node in root:
+            loc, lastmod = None, None
+            for field in node:
+                name = _local_name(field.tag)
+                if name == "loc":
+                    loc = (field.text or "").strip()
+                elif name == "lastmod":
+                    lastmod = _parse_date(field.text)
+            if not loc:
+                continue
+            if _local_name(node.tag) == "sitemap":
+                children.append(loc)
+            else:
+                seeds[loc] = lastmod
+        for child in children:
+            await cls._read_sitemap(child, seeds, budget)
+
+    @classmethod
+    async def _read_feed(cls, feed_url: str, seeds: Dict[str, Optional[datetime]]) -> None:
+        response = await cls._get(feed_url)
+        if response is None or response.status_code != 200:
+            return
+        try:
+            root = ElementTree.fromstring(response.content)
+        except ElementTree.ParseError:
+            return
+        for node in root.iter():
+            if _local_name(node.tag) not in ("item", "entry"):
+                continue
+            link, published = None, None
+            for field in node:
+                name = _local_name(field.tag)
+                if name == "link":
+                    # RSS has the URL as text, Atom as href
+                    link = (field.get("href") or field.text or "").strip() or link
+                elif name in ("pubdate", "updated", "published"):
+                    published = published or _parse_date(field.text)
+            if link:
+                seeds[urljoin(feed_url, link)] = published
+
+    @classmethod
+    async def discover_seeds(cls, root_url: str, max_urls: int) -> Dict[str, Optional[datetime]]:
+        """
+        Same-domain page URLs listed in the site's sitemaps and feeds, normalized,
+        mapped to their last modification date (None when not given).
+        """
+        root_url = normalize_url(root_url) or root_url
+        root_netloc = urlparse(root_url).netloc
+        origin = f"{urlparse(root_url).scheme}://{root_netloc}"
+        raw: Dict[str, Optional[datetime]] = {}
+
+        sitemaps = []
+        robots = await cls._get(f"{origin}/robots.txt")
+        if robots is not None and robots.status_code == 200:
+            for line in robots.text.splitlines():
+                if line.lower().startswith("sitemap:"):
+                    sitemaps.append(line.split(":", 1)[1].strip())
+        if not sitemaps:
+            sitemaps.append(f"{origin}/sitemap.xml")
+        budget = {"files": int(os.getenv("CRAWL_SITEMAP_MAX_FILES", "20"))}
+        for sitemap_url in sitemaps:
+            await cls._read_sitemap(sitemap_url, raw, budget)
+
+        home = await cls._get(root_url)
+        if home is not None and home.status_code == 200:
+            soup = BeautifulSoup(home.text, "html.parser")
+            feeds = [
+                urljoin(root_url, tag["href"])
+                for tag in soup.find_all("link", href=True)
+                if (tag.get("type") or "").lower() in FEED_TYPES
+            ]
+            for feed_url in feeds[:5]:
+                await cls._read_feed(feed_url, raw)
+
+        seeds: Dict[str, Optional[datetime]] = {}
+        for url, modified in raw.items():
+            normalized = normalize_url(url)
+            if normalized and is_same_domain(normalized, root_netloc):
+                seeds[normalized] = modified
+            if len(seeds) >= max_urls:
+                break
+        return seeds
+
+    @classmethod
+    async def check_page(cls, entry: dict) -> dict:
+        """
+        Conditionally re-fetch a known page. Returns {"status": "unchanged" |
+        "changed" | "gone" | "unknown"} plus the new etag/lastModified/contentHash.
+        A changed page's HTML is put in the PageCache for the scrape phase.
+        """
+        url = entry["url"]
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+        response = await cls._get(url, headers)
+        if response is None:
+            return {"status": "unknown"}
+        if response.status_code == 304:
+            return {"status": "unchanged"}
+        if response.status_code in (404, 410):
+            return {"status": "gone"}
+        if response.status_code != 200:
+            # Blocked or erroring for direct requests; let the scraper decide via Spider
+            return {"status": "unknown"}
+
+        html = response.text
+        markdown_content = await asyncio.get_running_loop().run_in_executor(
+            None, WebsiteScraper().html_to_markdown, html
+        )
+        content_hash = ContentFingerprintModel.content_hash(markdown_content)
+        result = {
+            "status": "unchanged" if content_hash == entry.get("contentHash") else "changed",
+            "etag": response.headers.get("ETag"),
+            "lastModified": response.headers.get("Last-Modified"),
+            "contentHash": content_hash,
+        }
+        if result["status"] == "changed":
+            await asyncio.get_running_loop().run_in_executor(None, PageCache.put, url, html)
+        return result
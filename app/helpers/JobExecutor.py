@@ -0,0 +1,176 @@
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Optional
+
+from app.helpers.RateLimiter import RateLimiter
+from app.models.Dashboard import DashboardModel
+from app.models.JobCheckpoint import JobCheckpointModel
+from app.models.JobRun import JobRunModel
+
+
+class JobExecutor:
+    """
+    Runs a scheduled per-dashboard job over every dashboard concurrently.
+
+    At most JOB_MAX_CONCURRENCY dashboards are processed at once and each one
+    is given JOB_DASHBOARD_TIMEOUT_SECONDS. A dashboard that overruns is
+    recorded as timed out and the run moves on; its thread cannot be killed
+    and finishes in the background, holding one of the concurrency slots
+    until it does. If every slot is held that way the run stops early and is
+    recorded as degraded. Provider throughput is bounded separately
+    by the shared RateLimiter buckets (brightdata, spider, and azure_openai
+    when configured).
+
+    Full runs are checkpointed in JobCheckpoints. The checkpoint only advances
+    past a dashboard once it and every dashboard before it have finished, so
+    a crashed run resumes without skipping work. A summary with counts and
+    p50/p95 durations is saved to JobRuns.
+    """
+
+    def __init__(self, job: str, max_concurrency: Optional[int] = None, timeout_seconds: Optional[float] = None):
+        self.job = job
+        self.max_concurrency = max_concurrency or int(os.getenv("JOB_MAX_CONCURRENCY", "4"))
+        self.timeout_seconds = timeout_seconds or float(os.getenv("JOB_DASHBOARD_TIMEOUT_SECONDS", "1800"))
+        self.batch_size = int(os.getenv("DASHBOARD_ITER_BATCH_SIZE", "200"))
+
+    @staticmethod
+    def _percentile(values: list, p: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2)
+
+    @staticmethod
+    def _run_one(handler: Callable[[str], dict], dashboard_id: str, starts: dict) -> tuple:
+        starts[dashboard_id] = time.monotonic()
+        try:
+            result = handler(dashboard_id)
+            if result and result.get("success"):
+                return True, None
+            return False, (result or {}).get("error", "No result returned")
+        except Exception as e:  # pylint: disable=broad-except
+            return False, str(e)
+
+    def run(self, handler: Callable[[str], dict], limit: Optional[int] = None) -> dict:
+        """
+        Call handler(dashboard_id) for every dashboard and return the run summary.
+        Runs with an explicit limit (manual/test runs) are not checkpointed.
+        """
+        started_at = datetime.utcnow()
+        run_started = time.perf_counter()
+
+        checkpoints = None if limit else JobCheckpointModel()
+        resume_after = checkpoints.begin(self.job) if checkpoints else None
+        if resume_after:
+            print(f"[{self.job}] Resuming after dashboard {resume_after}")
+
+        dashboards = DashboardModel().iter_dashboards(
+            fields=["_id"], batch_size=self.batch_size, start_after=resume_after
+        )
+        if limit:
+            dashboards = itertools.islice(dashboards, limit)
+
+        counts = {"succeeded": 0, "failed": 0, "timed_out": 0}
+        durations, errors = [], []
+        order, finished = deque(), set()
+        in_flight, starts = {}, {}
+
+        def finish(dashboard_oid, outcome: str, seconds: float, error: Optional[str] = None):
+            counts[outcome] += 1
+            durations.append(seconds)
+            if error and len(errors) < 50:
+                errors.append({"dashboardId": str(dashboard_oid), "outcome": outcome, "error": error})
+            finished.add(dashboard_oid)
+            if checkpoints is None:
+                return
+            # Advance the checkpoint over the contiguous prefix of finished dashboards
+            advanced, processed = None, 0
+            while order and order[0] in finished:
+                advanced = order.popleft()
+                finished.discard(advanced)
+                processed += 1
+            if advanced is not None:
+                checkpoints.advance(self.job, advanced, processed)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix=self.job)
+        poll_seconds = min(5.0, self.timeout_seconds)
+        iterator, exhausted = iter(dashboards), False
+        # Timed-out handlers still holding an executor thread, and when each future was submitted
+        hung, submitted = set(), {}
+        degraded = False
+        try:
+            while True:
+                hung = {future for future in hung if not future.done()}
+                # Only submit what can start right away, so every in-flight future has a thread
+                while not exhausted and len(in_flight) + len(hung) < self.max_concurrency:
+                    dashboard = next(iterator, None)
+                    if dashboard is None:
+                        exhausted = True
+                        break
+                    dashboard_oid = dashboard["_id"]
+                    order.append(dashboard_oid)
+                    future = executor.submit(self._run_one, handler, str(dashboard_oid), starts)
+                    in_flight[future] = dashboard_oid
+                    submitted[future] = time.monotonic()
+
+                if not in_flight:
+                    if hung and not exhausted:
+                        # Every thread is stuck in a timed-out handler: stop here and let the next run resume
+                        degraded = True
+                        print(f"[{self.job}] All {len(hung)} worker threads are stuck in timed-out dashboards; "
+                              f"stopping the run early")
+                    break
+
+                done, _ = wait(list(in_flight), timeout=poll_seconds, return_when=FIRST_COMPLETED)
+                for future in done:
+                    dashboard_oid = in_flight.pop(future)
+                    submitted.pop(future, None)
+                    success, error = future.result()
+                    seconds = time.monotonic() - starts.pop(str(dashboard_oid), time.monotonic())
+                    finish(dashboard_oid, "succeeded" if success else "failed", seconds, error)
+
+                now = time.monotonic()
+                for future, dashboard_oid in list(in_flight.items()):
+                    started = starts.get(str(dashboard_oid), submitted[future])
+                    if now - started > self.timeout_seconds:
+                        in_flight.pop(future)
+                        submitted.pop(future, None)
+                        starts.pop(str(dashboard_oid), None)
+                        hung.add(future)
+                        print(f"[{self.job}] dashboard={dashboard_oid} timed out after {self.timeout_seconds:.0f}s")
+                        finish(dashboard_oid, "timed_out", now - started, f"Timed out after {self.timeout_seconds:.0f}s")
+        finally:
+            executor.shutdown(wait=False)
+
+        # A degraded run keeps its checkpoint running so the next run resumes after the last finished dashboard
+        if checkpoints is not None and not degraded:
+            checkpoints.complete(self.job)
+
+        summary = {
+            "job": self.job,
+            "startedAt": started_at,
+            "finishedAt": datetime.utcnow(),
+            "durationSeconds": round(time.perf_counter() - run_started, 2),
+            "resumedAfter": str(resume_after) if resume_after else None,
+            "concurrency": self.max_concurrency,
+            "degraded": degraded,
+            "hungThreads": len({future for future in hung if not future.done()}),
+            "total": sum(counts.values()),
+            **counts,
+            "p50Seconds": self._percentile(durations, 0.50),
+            "p95Seconds": self._percentile(durations, 0.95),
+            "errors": errors,
+            "rateLimits": RateLimiter.get_stats(),
+        }
+        try:
+            JobRunModel().create(summary)
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"[{self.job}] Failed to save run summary: {e}")
+        print(f"[{self.job}] Run finished in {summary['durationSeconds']}s: {summary['total']} dashboards, "
+              f"{counts['succeeded']} succeeded, {counts['failed']} failed, {counts['timed_out']} timed out, "
+              f"p50={summary['p50Seconds']}s p95={summary['p95Seconds']}s")
+        return summary
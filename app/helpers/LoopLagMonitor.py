@@ -0,0 +1,68 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Optional
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes up a task that sleeps for a fixed
+    interval. Anything above a few milliseconds means blocking code is
+    running on the loop and every concurrent chat stream is stalled with it.
+    """
+
+    _task: Optional[asyncio.Task] = None
+    _samples: deque = deque(maxlen=int(os.getenv("LOOP_LAG_WINDOW", "600")))
+    _max_ms = 0.0
+    _slow_events = 0
+
+    @classmethod
+    async def _run(cls, interval: float, warn_ms: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lag_ms = max(0.0, (loop.time() - expected) * 1000)
+            cls._samples.append(lag_ms)
+            cls._max_ms = max(cls._max_ms, lag_ms)
+            if lag_ms >= warn_ms:
+                cls._slow_events += 1
+                print(f"[LoopLagMonitor] Event loop blocked for {lag_ms:.0f}ms")
+
+    @classmethod
+    def start(cls):
+        """
+        Start sampling on the running event loop (call from an async startup hook).
+        """
+        if cls._task is not None and not cls._task.done():
+            return
+        interval = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+        warn_ms = float(os.getenv("LOOP_LAG_WARN_MS", "200"))
+        cls._task = asyncio.get_running_loop().create_task(cls._run(interval, warn_ms))
+
+    @classmethod
+    def stop(cls):
+        if cls._task is not None:
+            cls._task.cancel()
+            cls._task = None
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        samples = sorted(cls._samples)
+
+        def percentile(p):
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 2)
+
+        return {
+            "running": cls._task is not None and not cls._task.done(),
+            "samples": len(samples),
+            "last_ms": round(cls._samples[-1], 2) if cls._samples else 0.0,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(cls._max_ms, 2),
+            "slow_events": cls._slow_events,
+            "checked_at": time.time(),
+        }
@@ -2,6 +2,7 @@
 from app.models.Industries import IndustriesModel
 from app.models.Locations import LocationsModel
 from app.models.Topics import TopicsModel
+from app.helpers.TaxonomyCache import TaxonomyCache
 
 class MetaDataHelper:
     def __init__(self):
@@ -50,6 +51,7 @@ class MetaDataHelper:
                             {"primary_industry_slug": primary_slug},
                             {"$addToSet": {"secondary_industry": secondary_entry}}
                         )
+                        TaxonomyCache.invalidate()
             else:
                 # Create a new document for the primary industry
                 industry_doc = {
@@ -58,6 +60,7 @@ class MetaDataHelper:
                     "secondary_industry": [secondary_entry] if secondary_entry else []
                 }
                 self.industries_model.create(industry_doc)
+                TaxonomyCache.invalidate()
             
         if event_chunk.topic:
             existing_topic = self.topics_model.collection.find_one(
@@ -70,3 +73,4 @@ class MetaDataHelper:
                     "topic_slug": event_chunk.topic_slug
                 }
                 self.topics_model.create_topic(topic)
+                TaxonomyCache.invalidate()
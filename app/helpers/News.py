@@ -1,4 +1,5 @@
 import json
+from functools import partial
 from app.models.Dashboard import DashboardModel
 from app.helpers.VectorDB import VectorDB
 from app.models.Industries import IndustriesModel
@@ -13,13 +14,16 @@ from app.helpers.AIImageGeneration import NewsImageGenerator
 from app.helpers.SERP import SERPHelper
 from langchain_openai import AzureChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
-from app.schemas.Dashboard import NewsList
+from app.schemas.Dashboard import NewsList, NewsSchema
 from app.helpers.UrlScraperHelper import UrlScraperHelper
+from app.helpers.ClientRegistry import ClientRegistry
+from app.helpers.DashboardChoices import DashboardChoices
+from app.helpers.ToolExecutor import ToolExecutor
     
 class  News:
     def __init__(self):
         self.model = DashboardModel()
-        self.vector_store = VectorDB("source-hr-knowledge")
+        self.vector_store = VectorDB.get("source-hr-knowledge")
         self.industries_model = IndustriesModel()
         self.topics_model = TopicsModel()
         self.locations_model=LocationsModel()      
@@ -27,19 +31,8 @@ class  News:
         self.news_image_generation = NewsImageGenerator()
         self.serp_helper = SERPHelper()
         self.url_scraper_helper = UrlScraperHelper()
-        self.azure_client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_KEY"),
-            api_version="2024-12-01-preview",
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-        )
-        self.chat = AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-        )
+        self.azure_client = ClientRegistry.get_azure_openai()
+        self.chat = ClientRegistry.get_chat_llm()
     
     
     # Tool implementations
@@ -109,174 +102,153 @@ class  News:
             return {"success": True, "pages": pages}
         except Exception as e:
             return {"success": False, "error": str(e)}
-        
-    def get_dashboard_choices(self, dashboard_id: str):
-        dashboard = self.model.get_dashboard({"_id": ObjectId(dashboard_id)})
-        locations = getattr(dashboard, "locations", [])
-        industries = getattr(dashboard, "industries", [])
-        topics = getattr(dashboard, "topics", [])
-        regions = getattr(dashboard, "region", []) or []
-        location_slugs = []
-        for region in locations:
-            for loc in getattr(region, "locations", []):
-                slug = getattr(loc, "slug", None)
-                if slug:
-                    location_slugs.append(slug)
-        industry_slugs = []
-        for industry in industries:
-            primary_slug = getattr(industry, "primary_industry_slug", None)
-            if primary_slug:
-                industry_slugs.append(primary_slug)
-            for secondary in getattr(industry, "secondary_industry", []):
-                secondary_slug = getattr(secondary, "slug", None)
-                if secondary_slug:
-                    industry_slugs.append(secondary_slug)
-        topic_slugs = []
-        for category in topics:
-            for topic in getattr(category, "topics", []):
-                slug = getattr(topic, "slug", None)
-                if slug:
-                    topic_slugs.append(slug)
 
-        location_names = [slug.replace('-', ' ').title() for slug in location_slugs] if location_slugs else []
-        industry_names = [slug.replace('-', ' ').title() for slug in industry_slugs] if industry_slugs else []
-        topic_names = [slug.replace('-', ' ').title() for slug in topic_slugs] if topic_slugs else []
-        region_names = [region.replace('-', ' ').title() if isinstance(region, str) else str(region).replace('-', ' ').title() for region in regions] if regions else []
-        dashboard_choices = {
-            "location_names": location_names,
-            "industry_names": industry_names,
-            "topic_names": topic_names,
-            "region_names": region_names,
-            "regions": regions
-        }
-        return dashboard_choices
+    def _call_tool(self, function_name: str, args: dict, region_slugs: list = None):
+        if function_name == "search_documents":
+            # Add region filtering if regions exist in dashboard
+            return self._tool_search_documents(**args, region_slugs=region_slugs)
+        elif function_name == "fetch_serp_content":
+            return self._tool_fetch_serp_content(**args)
+        elif function_name == "get_webpage_content":
+            return self._tool_get_webpage_content(**args)
+        return {"success": False, "error": f"Unknown function: {function_name}"}
+
         
-    def retrieve_news(self, dashboard_id: str):
-        """Main method to extract news items related to dashboard filters."""
-        print(f"Processing news for dashboard: {dashboard_id}")
-        try:
-            dashboard_choices = self.get_dashboard_choices(dashboard_id)
-            location_str = ", ".join(dashboard_choices.get("location_names", [])) or "all locations"
-            industry_str = ", ".join(dashboard_choices.get("industry_names", [])) or "all industries"
-            topic_str = ", ".join(dashboard_choices.get("topic_names", [])) or "all topics"
-            region_str = ", ".join(dashboard_choices.get("region_names", [])) if dashboard_choices.get("region_names") else ""
+    def generate_news_items(self, dashboard_choices: dict) -> list:
+        """Run the LLM/tool pipeline for a set of dashboard choices and return the news items that have a sourceUrl."""
+        location_str = ", ".join(dashboard_choices.get("location_names", [])) or "all locations"
+        industry_str = ", ".join(dashboard_choices.get("industry_names", [])) or "all industries"
+        topic_str = ", ".join(dashboard_choices.get("topic_names", [])) or "all topics"
+        region_str = ", ".join(dashboard_choices.get("region_names", [])) if dashboard_choices.get("region_names") else ""
 
-            tools = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "search_documents",
-                        "description": "Search HR news documents with semantic query and metadata filters.",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "query": {"type": "string"},
-                                "filters": {"type": "object"},
-                                "top_k": {"type": "integer", "default": 10}
-                            },
-                            "required": ["query"]
-                        }
+        tools = [
+            {
+                "type": "function",
+                "function": {
+                    "name": "search_documents",
+                    "description": "Search HR news documents with semantic query and metadata filters.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "query": {"type": "string"},
+                            "filters": {"type": "object"},
+                            "top_k": {"type": "integer", "default": 10}
+                        },
+                        "required": ["query"]
                     }
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "fetch_serp_content",
-                        "description": "Fetch latest HR/legal news from SERP API.",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "query": {"type": "string"},
-                                "num_results": {"type": "integer", "default": 5}
-                            },
-                            "required": ["query"]
-                        }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "fetch_serp_content",
+                    "description": "Fetch latest HR/legal news from SERP API.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "query": {"type": "string"},
+                            "num_results": {"type": "integer", "default": 5}
+                        },
+                        "required": ["query"]
                     }
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "get_webpage_content",
-                        "description": "Scrape webpage content from URLs in parallel.",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "urls": {"type": "array", "items": {"type": "string"}},
-                                "url": {"type": "string"}
-                            }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_webpage_content",
+                    "description": "Scrape webpage content from URLs in parallel.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "urls": {"type": "array", "items": {"type": "string"}},
+                            "url": {"type": "string"}
                         }
                     }
                 }
-            ]
+            }
+        ]
 
-            messages = [
-                {
-                    "role": "system",
-                    "content": f"""You are a legal news analyst. Extract at least 4 unique structured news items about
-                        changes in employment law or HR regulations.
-                        Focus on the following dashboard context:
-                        - Locations: {location_str}
-                        - Industries: {industry_str}
-                        - Topics: {topic_str}
-                        - Regions: {region_str if region_str else "all regions"}
-                        Use the available tools if needed. Output must be a JSON object only.
-                        
-                        IMPORTANT: For each news item, ensure the detailedDescription field contains approximately 50-100 sentences with comprehensive, in-depth information including background context, implications, legal analysis, industry impact, and future considerations."""
-                },
-                {
-                    "role": "user",
-                    "content": f"Provide 4 unique structured news items based on the above context. current date: {datetime.utcnow()}"
-                }
-            ]
+        messages = [
+            {
+                "role": "system",
+                "content": f"""You are a legal news analyst. Extract at least 4 unique structured news items about
+                    changes in employment law or HR regulations.
+                    Focus on the following dashboard context:
+                    - Locations: {location_str}
+                    - Industries: {industry_str}
+                    - Topics: {topic_str}
+                    - Regions: {region_str if region_str else "all regions"}
+                    Use the available tools if needed. Output must be a JSON object only.
+                    
+                    IMPORTANT: For each news item, ensure the detailedDescription field contains approximately 50-100 sentences with comprehensive, in-depth information including background context, implications, legal analysis, industry impact, and future considerations."""
+            },
+            {
+                "role": "user",
+                "content": f"Provide 4 unique structured news items based on the above context. current date: {datetime.utcnow()}"
+            }
+        ]
+
+        response = self.azure_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            tools=tools,
+        )
+        response_message = response.choices[0].message
+        message_content = response_message.content
+        while not message_content and response_message.tool_calls:
+            # Run the round's tool calls concurrently; messages keep the original call order
+            region_slugs = dashboard_choices.get("regions", [])
+            round_results = ToolExecutor.run_all([
+                (tc.function.name, partial(self._call_tool, tc.function.name, json.loads(tc.function.arguments), region_slugs))
+                for tc in response_message.tool_calls
+            ])
+            for tool_call, result in zip(response_message.tool_calls, round_results):
+                function_name = tool_call.function.name
 
+                messages.append({
+                    "role": "assistant",
+                    "tool_calls": [tool_call.model_dump()]
+                })
+
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "name": function_name,
+                    "content": json.dumps(result)
+                })
+
+            # Get new response after processing tool calls
             response = self.azure_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=messages,
-                tools=tools,
-            )
+                tools=tools                )
             response_message = response.choices[0].message
             message_content = response_message.content
-            while not message_content and response_message.tool_calls:
-                for tool_call in response_message.tool_calls:
-                    function_name = tool_call.function.name
-                    args = json.loads(tool_call.function.arguments)
-                    if function_name == "search_documents":
-                        # Add region filtering if regions exist in dashboard
-                        region_slugs = dashboard_choices.get("regions", [])
-                        result = self._tool_search_documents(**args, region_slugs=region_slugs)
-                    elif function_name == "fetch_serp_content":
-                        result = self._tool_fetch_serp_content(**args)
-                    elif function_name == "get_webpage_content":
-                        result = self._tool_get_webpage_content(**args)
-                        
-                    messages.append({
-                        "role": "assistant",
-                        "tool_calls": [tool_call.model_dump()]
-                    })
+            
+        raw_data = message_content
+        news = self.format_news(raw_data)
 
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "name": function_name,
-                        "content": json.dumps(result)
-                    })
+        # Filter to only include news items with sourceUrl
+        news_with_url = []
+        for item in news.news:
+            if hasattr(item, 'sourceUrl') and item.sourceUrl and item.sourceUrl.strip():
+                news_with_url.append(item)
 
-                # Get new response after processing tool calls
-                response = self.azure_client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages,
-                    tools=tools                )
-                response_message = response.choices[0].message
-                message_content = response_message.content
-                
-            raw_data = message_content
-            news = self.format_news(raw_data)
+        return news_with_url
 
-            # Filter to only include news items with sourceUrl
-            news_with_url = []
-            for item in news.news:
-                if hasattr(item, 'sourceUrl') and item.sourceUrl and item.sourceUrl.strip():
-                    news_with_url.append(item)
+    def retrieve_news(self, dashboard_id: str, generated: list = None, source_dashboard_id: str = None):
+        """
+        Main method to extract news items related to dashboard filters.
+        When generated is given (items another dashboard with the same filters produced),
+        the LLM pipeline is skipped and those items and their vectors are reused.
+        """
+        print(f"Processing news for dashboard: {dashboard_id}")
+        try:
+            if generated is None:
+                news_with_url = self.generate_news_items(DashboardChoices.get(dashboard_id))
+            else:
+                news_with_url = [NewsSchema(**item) for item in generated]
 
             if not news_with_url:
                 print("[News] No news items with sourceUrl found, skipping save")
@@ -290,9 +262,10 @@ class  News:
                     scrape_result = self.url_scraper_helper.scrape_and_save_urls(
                         urls=news_urls,
                         dashboard_id=dashboard_id,
-                        source="news"
+                        source="news",
+                        copy_from_dashboard_id=source_dashboard_id
                     )
-                    print(f"[News] Scraped {scrape_result.get('scraped_count', 0)} URLs, skipped {scrape_result.get('skipped_count', 0)} URLs")
+                    print(f"[News] Scraped {scrape_result.get('scraped_count', 0)} URLs, copied {scrape_result.get('copied_count', 0)} URLs, skipped {scrape_result.get('skipped_count', 0)} URLs")
                     if scrape_result.get('errors'):
                         print(f"[News] Errors: {scrape_result.get('errors')}")
                 except Exception as e:
@@ -324,8 +297,10 @@ class  News:
                 news_doc.news.extend(new_news_items)
                 news_doc.updatedAt = datetime.utcnow()
 
-                # 2c. Generate images for new items
+                # 2c. Generate images for new items (shared items already carry one)
                 for news_item in new_news_items:
+                    if getattr(news_item, 'imageUrl', None):
+                        continue
                     item_id = getattr(news_item, 'id', None)
                     image_id = str(item_id) if item_id else f"{getattr(news_item, 'title', '')}_{getattr(news_item, 'sourceUrl', '')}"
                     image_url = self.news_image_generation.process_article(news_item.description, image_id)
@@ -357,6 +332,8 @@ class  News:
                 news_generated = self.news_model.get_news(dashboard_id)
                 for news_doc in news_generated:
                     for news_item in news_doc.news:
+                        if getattr(news_item, 'imageUrl', None):
+                            continue
                         item_id = getattr(news_item, 'id', None)
                         image_id = str(item_id) if item_id else f"{getattr(news_item, 'title', '')}_{getattr(news_item, 'sourceUrl', '')}"
                         image_url = self.news_image_generation.process_article(news_item.description, image_id)
@@ -364,7 +341,18 @@ class  News:
                     self.news_model.update_news(dashboard_id, news_doc.model_dump(by_alias=True, mode='python'))
                 news = self.news_model.get_news(dashboard_id)
 
-            return {"success": True, "data": news}
+            # Items as generated (with their image URLs) so dashboards with the same filters can reuse them
+            image_urls = {
+                (getattr(item, 'title', None), getattr(item, 'sourceUrl', None)): getattr(item, 'imageUrl', None)
+                for news_doc in news for item in getattr(news_doc, 'news', [])
+            }
+            shareable = []
+            for item in news_with_url:
+                data = item.model_dump(mode='json', exclude={'id'})
+                data['imageUrl'] = data.get('imageUrl') or image_urls.get((data.get('title'), data.get('sourceUrl')))
+                shareable.append(data)
+
+            return {"success": True, "data": news, "generated": shareable}
 
         except Exception as e:
             print(f"Error in generating news: {e}")
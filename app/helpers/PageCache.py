@@ -0,0 +1,90 @@
+import hashlib
+import os
+import threading
+import zlib
+from typing import Optional
+
+from app.models.PageCache import PageCacheModel
+
+
+class PageCache:
+    """
+    Crawl-time page cache. The crawler stores the HTML it already fetched for
+    link extraction; WebsiteScraper reads it back in the scrape phase, so each
+    crawled page costs one Spider call instead of two. Pages are compressed and
+    pages larger than PAGE_CACHE_MAX_BYTES compressed are not cached. Cache
+    failures never fail a crawl or a scrape; they only cost a fetch.
+    """
+
+    _lock = threading.Lock()
+    _store = None
+    _stats = {"stored": 0, "hits": 0, "misses": 0, "errors": 0, "bytesStored": 0, "bytesReused": 0}
+
+    @classmethod
+    def _get_store(cls) -> PageCacheModel:
+        if cls._store is None:
+            cls._store = PageCacheModel()
+        return cls._store
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        return hashlib.sha256(url.strip().encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _count(cls, key: str, amount: int = 1) -> None:
+        with cls._lock:
+            cls._stats[key] += amount
+
+    @classmethod
+    def put(cls, url: str, html: str) -> None:
+        if not html:
+            return
+        try:
+            raw = html.encode("utf-8")
+            compressed = zlib.compress(raw, 6)
+            if len(compressed) > int(os.getenv("PAGE_CACHE_MAX_BYTES", str(8 * 1024 * 1024))):
+                return
+            cls._get_store().save(cls.make_key(url), url, compressed, len(raw))
+            cls._count("stored")
+            cls._count("bytesStored", len(compressed))
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"[PageCache] Could not store {url}: {e}")
+            cls._count("errors")
+
+    @classmethod
+    def get(cls, url: str) -> Optional[str]:
+        """Return the cached HTML of url, or None on a miss."""
+        try:
+            document = cls._get_store().get(cls.make_key(url))
+            if not document:
+                cls._count("misses")
+                return None
+            html = zlib.decompress(bytes(document["html"])).decode("utf-8")
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"[PageCache] Could not read {url}: {e}")
+            cls._count("errors")
+            return None
+        cls._count("hits")
+        cls._count("bytesReused", len(html))
+        return html
+
+    @classmethod
+    def evict(cls, url: str) -> None:
+        """Drop the cached copy of url, e.g. because the page may have changed since."""
+        try:
+            cls._get_store().delete(cls.make_key(url))
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"[PageCache] Could not evict {url}: {e}")
+            cls._count("errors")
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._lock:
+            stats = dict(cls._stats)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            # Every hit is a page the scrape phase did not fetch again
+            "fetchesAvoided": stats["hits"],
+            "hitRate": round(stats["hits"] / lookups, 2) if lookups else 0.0,
+        }
@@ -4,6 +4,7 @@ from weasyprint import HTML, CSS
 from openai import AzureOpenAI
 from datetime import datetime
 from app.helpers.AzureStorage import AzureBlobUploader
+from app.helpers.ClientRegistry import ClientRegistry
 
 load_dotenv()
 
@@ -14,11 +15,7 @@ class PdfGenerator:
         azure_helper: optional class that handles Azure Blob upload, must have
         method upload_file_to_azure_blob(file_path, folder_name, extension)
         """
-        self.azure_client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_KEY"),
-            api_version="2024-12-01-preview",
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-        )
+        self.azure_client = ClientRegistry.get_azure_openai()
         self.azure_helper = AzureBlobUploader()  # external uploader helper
 
     def generate_pdf(self, content: str, title="Document", page_size="A4 portrait"):
@@ -127,13 +127,14 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from langchain_core.documents import Document
 
 from app.helpers.VectorDB import VectorDB
+from app.helpers.SlugResolver import SlugResolver
 from app.models.TopicSlug import TopicSlugModel
 
 
 class TopicMetaDataProcessor:
     def __init__(self):
         self.model = TopicSlugModel()
-        self.vector_helper = VectorDB("TopicSlug")
+        self.vector_helper = VectorDB.get("TopicSlug")
 
     def upload_to_vector(self, title: str):
         """Uploads a single title to the TopicSlug vector store."""
@@ -176,4 +177,6 @@ class TopicMetaDataProcessor:
                 except Exception as e:
                     results.append(f"❌ {e}")
 
+        # New topic vectors must be visible to chat slug resolution
+        SlugResolver.invalidate("topic")
         return results
\ No newline at end of file
@@ -0,0 +1,102 @@
+import os
+import random
+import re
+import threading
+from typing import Dict, Union
+
+
+class QueueRetry:
+    """
+    Retry policy for queue entries: classifies errors, computes jittered
+    exponential backoff and keeps retry metrics per error class.
+
+    Retryable classes (rate_limited, timeout, connection, server_error, unknown)
+    are retried until QUEUE_MAX_ATTEMPTS is reached and then dead-lettered;
+    invalid_request errors fail immediately since retrying cannot help.
+    """
+
+    RETRYABLE = {"rate_limited", "timeout", "connection", "server_error", "unknown"}
+
+    # Checked in order against the lowercased error text: (class, status codes, phrases).
+    # Status codes only match as whole numbers, so ids, URLs and counts containing
+    # the digits ("64f1a429...", "1500 tokens") are not mistaken for them.
+    PATTERNS = (
+        ("rate_limited", ("429",), ("rate limit", "ratelimit", "too many requests", "quota")),
+        ("timeout", (), ("timeout", "timed out", "deadline exceeded")),
+        ("connection", ("502", "503", "504"), ("connection", "bad gateway", "service unavailable",
+                                               "temporarily unavailable", "remote end closed")),
+        ("server_error", ("500",), ("internal server error", "server error")),
+        ("invalid_request", ("400", "401", "403", "404"), ("bad request", "unauthorized", "forbidden", "not found",
+                                                         "content_filter", "content management policy",
+                                                         "unsupported queue type")),
+    )
+    _STATUS_RE = {
+        error_class: re.compile(r"\b(?:" + "|".join(codes) + r")\b")
+        for error_class, codes, _ in PATTERNS if codes
+    }
+    TERMINAL_EXCEPTIONS = (ValueError, TypeError, KeyError, AttributeError)
+
+    _lock = threading.Lock()
+    _stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def max_attempts() -> int:
+        return int(os.getenv("QUEUE_MAX_ATTEMPTS", "5"))
+
+    @staticmethod
+    def _classify_status(status_code: int) -> str:
+        if status_code == 429:
+            return "rate_limited"
+        if status_code == 408:
+            return "timeout"
+        if status_code >= 500:
+            return "server_error"
+        return "invalid_request"
+
+    @classmethod
+    def classify(cls, error: Union[BaseException, str, None]) -> str:
+        if isinstance(error, BaseException):
+            status_code = getattr(error, "status_code", None)
+            if isinstance(status_code, int):
+                return cls._classify_status(status_code)
+            name = type(error).__name__.lower()
+            if "ratelimit" in name:
+                return "rate_limited"
+            if "timeout" in name:
+                return "timeout"
+            if "connection" in name:
+                return "connection"
+        text = str(error or "").lower()
+        for error_class, _, phrases in cls.PATTERNS:
+            status_re = cls._STATUS_RE.get(error_class)
+            if (status_re and status_re.search(text)) or any(phrase in text for phrase in phrases):
+                return error_class
+        if isinstance(error, cls.TERMINAL_EXCEPTIONS):
+            return "invalid_request"
+        return "unknown"
+
+    @classmethod
+    def is_retryable(cls, error_class: str) -> bool:
+        return error_class in cls.RETRYABLE
+
+    @staticmethod
+    def backoff_seconds(attempt: int) -> float:
+        """Exponential backoff for the given (1-based) attempt with equal jitter."""
+        base = float(os.getenv("QUEUE_RETRY_BASE_SECONDS", "30"))
+        cap = float(os.getenv("QUEUE_RETRY_MAX_SECONDS", "1800"))
+        delay = min(cap, base * (2 ** max(0, attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @classmethod
+    def record(cls, error_class: str, outcome: str) -> None:
+        """outcome is one of retried, recovered, dead_lettered or failed."""
+        with cls._lock:
+            counts = cls._stats.setdefault(
+                error_class, {"retried": 0, "recovered": 0, "dead_lettered": 0, "failed": 0}
+            )
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._lock:
+            return {error_class: dict(counts) for error_class, counts in cls._stats.items()}
@@ -0,0 +1,208 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from app.helpers.QueueRetry import QueueRetry
+from app.helpers.WorkNotifier import WorkNotifier
+from app.models.Queue import QueueModel
+from app.models.QueueLaneSettings import QueueLaneSettingsModel
+from app.schemas.Queue import QueueEntry, QueueType
+
+
+class QueueWorker:
+    """
+    Process-wide queue consumer that is safe to run on several pods at once.
+
+    Every QueueType is a lane with its own pool of slots and a priority; lanes
+    with a lower priority value are served first. Defaults come from
+    QUEUE_<TYPE>_WORKERS / QUEUE_<TYPE>_PRIORITY and can be changed at runtime
+    through QueueLaneSettings. Within a lane, interactive entries go before bulk
+    ones and tenants (dashboard owners) are served fairly.
+
+    Entries are leased atomically to this worker (workerId + leaseExpiresAt) and
+    only as many as there are free slots are claimed per poll. Every poll renews
+    the leases of entries still running and requeues entries whose lease expired,
+    e.g. because their pod crashed. QUEUE_LEASE_SECONDS must comfortably exceed
+    the poll interval. Wait and run times are kept as histograms per lane.
+    """
+
+    worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+    DEFAULT_LANES = {
+        QueueType.NEWS: {"workers": 4, "priority": 0},
+        QueueType.COMPLIANCE: {"workers": 2, "priority": 1},
+        QueueType.CALENDAR: {"workers": 2, "priority": 1},
+        QueueType.LAW_CHANGE: {"workers": 2, "priority": 2},
+    }
+    HISTOGRAM_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800)
+
+    _lock = threading.Lock()
+    _executors: Dict[QueueType, ThreadPoolExecutor] = {}
+    # entry id -> (lane, tenant key, future)
+    _in_flight: Dict[str, tuple] = {}
+    _histograms: Dict[str, Dict[str, dict]] = {}
+
+    @staticmethod
+    def lease_seconds() -> float:
+        return float(os.getenv("QUEUE_LEASE_SECONDS", "900"))
+
+    @staticmethod
+    def max_lane_threads() -> int:
+        return int(os.getenv("QUEUE_LANE_MAX_THREADS", "32"))
+
+    @classmethod
+    def lane_settings(cls) -> Dict[QueueType, dict]:
+        """Effective workers/priority per lane: runtime override, then env, then default."""
+        try:
+            overrides = QueueLaneSettingsModel().get_all()
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"[Queue] Could not load lane settings, using defaults: {e}")
+            overrides = {}
+        settings = {}
+        for lane, defaults in cls.DEFAULT_LANES.items():
+            override = overrides.get(lane.value, {})
+            workers = override.get("workers")
+            if workers is None:
+                workers = int(os.getenv(f"QUEUE_{lane.value}_WORKERS", str(defaults["workers"])))
+            priority = override.get("priority")
+            if priority is None:
+                priority = int(os.getenv(f"QUEUE_{lane.value}_PRIORITY", str(defaults["priority"])))
+            settings[lane] = {"workers": max(0, min(int(workers), cls.max_lane_threads())), "priority": int(priority)}
+        return settings
+
+    @classmethod
+    def _get_executor(cls, lane: QueueType) -> ThreadPoolExecutor:
+        executor = cls._executors.get(lane)
+        if executor is None:
+            # Sized for the largest allowed setting; the lane's slot count is what limits it
+            executor = ThreadPoolExecutor(
+                max_workers=cls.max_lane_threads(), thread_name_prefix=f"queue-{lane.value.lower()}"
+            )
+            cls._executors[lane] = executor
+        return executor
+
+    @classmethod
+    def _observe(cls, lane: QueueType, kind: str, seconds: float) -> None:
+        with cls._lock:
+            lane_histograms = cls._histograms.setdefault(lane.value, {})
+            histogram = lane_histograms.setdefault(
+                kind, {"count": 0, "sumSeconds": 0.0, "buckets": [0] * (len(cls.HISTOGRAM_BUCKETS) + 1)}
+            )
+            histogram["count"] += 1
+            histogram["sumSeconds"] += seconds
+            index = next(
+                (i for i, bound in enumerate(cls.HISTOGRAM_BUCKETS) if seconds <= bound),
+                len(cls.HISTOGRAM_BUCKETS),
+            )
+            histogram["buckets"][index] += 1
+
+    @classmethod
+    def _run(cls, process: Callable[[QueueEntry], tuple], entry: QueueEntry) -> tuple:
+        started = time.monotonic()
+        try:
+            return process(entry)
+        finally:
+            cls._observe(entry.type, "run", time.monotonic() - started)
+            # A slot just freed up
+            WorkNotifier.notify("queue")
+
+    @classmethod
+    def has_in_flight(cls) -> bool:
+        with cls._lock:
+            return any(not future.done() for _, _, future in cls._in_flight.values())
+
+    @classmethod
+    def poll(cls, process: Callable[[QueueEntry], tuple]) -> dict:
+        """
+        Renew held leases, requeue expired ones and claim entries for each lane's
+        free slots, submitting each to process(entry). Does not wait for them.
+        """
+        queue_model = QueueModel()
+        lease_seconds = cls.lease_seconds()
+        settings = cls.lane_settings()
+
+        with cls._lock:
+            for entry_id, (_, _, future) in list(cls._in_flight.items()):
+                if future.done():
+                    del cls._in_flight[entry_id]
+            held = list(cls._in_flight)
+            running = {lane: 0 for lane in settings}
+            tenant_load: Dict[str, int] = {}
+            for lane, tenant, _ in cls._in_flight.values():
+                running[lane] = running.get(lane, 0) + 1
+                tenant_load[tenant] = tenant_load.get(tenant, 0) + 1
+
+        renewed = queue_model.renew_leases(cls.worker_id, held, lease_seconds)
+        requeued = queue_model.requeue_expired(lease_seconds, QueueRetry.max_attempts())
+        if requeued:
+            print(f"[Queue] Requeued {requeued} entr{'y' if requeued == 1 else 'ies'} with expired leases")
+
+        claimed = {}
+        for lane in sorted(settings, key=lambda l: settings[l]["priority"]):
+            free_slots = settings[lane]["workers"] - running.get(lane, 0)
+            if free_slots <= 0:
+                continue
+            entries = queue_model.claim(cls.worker_id, lease_seconds, lane, free_slots, tenant_load)
+            if not entries:
+                continue
+            claimed[lane.value] = len(entries)
+            executor = cls._get_executor(lane)
+            with cls._lock:
+                for entry in entries:
+                    tenant = QueueModel.tenant_key(entry)
+                    tenant_load[tenant] = tenant_load.get(tenant, 0) + 1
+                    cls._in_flight[str(entry.id)] = (lane, tenant, executor.submit(cls._run, process, entry))
+            for entry in entries:
+                claimed_at = entry.claimedAt or datetime.utcnow()
+                cls._observe(lane, "wait", max(0.0, (claimed_at - entry.createdAt).total_seconds()))
+
+        with cls._lock:
+            in_flight = len(cls._in_flight)
+
+        return {
+            "workerId": cls.worker_id,
+            "claimed": sum(claimed.values()),
+            "claimedByLane": claimed,
+            "renewed": renewed,
+            "requeued": requeued,
+            "inFlight": in_flight,
+        }
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        settings = cls.lane_settings()
+        with cls._lock:
+            running: Dict[str, int] = {}
+            for lane, _, future in cls._in_flight.values():
+                if not future.done():
+                    running[lane.value] = running.get(lane.value, 0) + 1
+            histograms = {
+                lane: {kind: {**histogram, "buckets": list(histogram["buckets"])} for kind, histogram in kinds.items()}
+                for lane, kinds in cls._histograms.items()
+            }
+        bucket_labels = [f"le_{bound}s" for bound in cls.HISTOGRAM_BUCKETS] + ["inf"]
+        lanes = {}
+        for lane, lane_settings in settings.items():
+            lane_histograms = {}
+            for kind, histogram in histograms.get(lane.value, {}).items():
+                lane_histograms[f"{kind}Seconds"] = {
+                    "count": histogram["count"],
+                    "avg": round(histogram["sumSeconds"] / histogram["count"], 2) if histogram["count"] else 0.0,
+                    "buckets": dict(zip(bucket_labels, histogram["buckets"])),
+                }
+            lanes[lane.value] = {**lane_settings, "inFlight": running.get(lane.value, 0), **lane_histograms}
+        return {"workerId": cls.worker_id, "lanes": lanes, "retries": QueueRetry.get_stats()}
+
+    @classmethod
+    def shutdown(cls) -> None:
+        # Running entries are not awaited; their leases expire and another worker requeues them
+        with cls._lock:
+            for executor in cls._executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+            cls._executors.clear()
+            cls._in_flight.clear()
@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+from typing import Dict
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every caller of one external provider.
+
+    Limits are read from RATE_LIMIT_<PROVIDER>_PER_SECOND (or
+    RATE_LIMIT_<PROVIDER>_PER_MINUTE, matching how Azure quotas are stated) and
+    RATE_LIMIT_<PROVIDER>_BURST; a rate of 0 disables limiting. Providers
+    without a default, such as azure_openai, are only limited when configured.
+    """
+
+    DEFAULT_RATES = {
+        "brightdata": 2.0,
+        "spider": 2.0,
+    }
+
+    _registry_lock = threading.Lock()
+    _limiters: Dict[str, "RateLimiter"] = {}
+
+    def __init__(self, name: str, rate_per_second: float, burst: int):
+        self.name = name
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    @classmethod
+    def for_provider(cls, provider: str) -> "RateLimiter":
+        with cls._registry_lock:
+            limiter = cls._limiters.get(provider)
+            if limiter is None:
+                prefix = f"RATE_LIMIT_{provider.upper()}"
+                per_minute = os.getenv(f"{prefix}_PER_MINUTE")
+                if per_minute is not None:
+                    default_rate = str(float(per_minute) / 60)
+                else:
+                    default_rate = str(cls.DEFAULT_RATES.get(provider, 0))
+                rate = float(os.getenv(f"{prefix}_PER_SECOND", default_rate))
+                burst = int(os.getenv(f"{prefix}_BURST", str(max(1, int(rate)))))
+                limiter = cls(provider, rate, burst)
+                cls._limiters[provider] = limiter
+            return limiter
+
+    @classmethod
+    def acquire_for(cls, provider: str) -> float:
+        return cls.for_provider(provider).acquire()
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available. Returns the seconds spent waiting.
+        """
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.acquired += 1
+                    self.waited_seconds += waited
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._registry_lock:
+            return {
+                name: {
+                    "rate_per_second": limiter.rate,
+                    "burst": limiter.capacity,
+                    "acquired": limiter.acquired,
+                    "waited_seconds": round(limiter.waited_seconds, 2),
+                }
+                for name, limiter in cls._limiters.items()
+            }
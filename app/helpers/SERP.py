@@ -2,7 +2,6 @@ import json
 from urllib.parse import urlencode
 from langchain_openai import AzureChatOpenAI
 from pydantic import BaseModel, Field
-import requests
 import os
 from dotenv import load_dotenv
 from app.helpers.Crawler import hybrid_crawl_logic_async
@@ -14,19 +13,14 @@ import concurrent.futures
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from app.helpers.VectorDB import VectorDB
+from app.helpers.ClientRegistry import ClientRegistry
+from app.helpers.HttpClient import HttpClient
 from app.helpers.Scraper import WebsiteScraper
+from app.helpers.WorkNotifier import WorkNotifier
 from app.models.SerpUrl import SerpUrlModel
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import re
 from threading import Event
 
-scheduler = BackgroundScheduler(job_defaults={
-    'coalesce': True,
-    'max_instances': 1,
-    'misfire_grace_time': 30,
-})
-scheduler.start()
 stop_event = Event()
 load_dotenv()
 
@@ -37,16 +31,8 @@ class SERPHelper:
     def __init__(self):
         self.scraper=WebsiteScraper()
         self.serp_url_model = SerpUrlModel()
-        self.chat = AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-            streaming=False,
-        )
-        self.vector_db = VectorDB("source-hr-knowledge")
+        self.chat = ClientRegistry.get_chat_llm()
+        self.vector_db = VectorDB.get("source-hr-knowledge")
         
 
     def markdown_to_text(self,md: str) -> str:
@@ -83,6 +69,7 @@ class SERPHelper:
                     "url": url,
                     "rawContent": raw_content,
                 })
+                WorkNotifier.notify("serp")
                 
                 structured_llm = self.chat.with_structured_output(WebPageSummary)
                 final_resp = structured_llm.invoke(
@@ -163,7 +150,7 @@ class SERPHelper:
             "format": "json"
         }
 
-        r = requests.post("https://api.brightdata.com/request", headers=headers, json=payload)
+        r = HttpClient.post("brightdata", "https://api.brightdata.com/request", headers=headers, json=payload)
 
         if r.status_code != 200:
             raise RuntimeError(
@@ -206,7 +193,7 @@ class SERPHelper:
             "format": "json"
         }
 
-        r = requests.post("https://api.brightdata.com/request", headers=headers, json=payload)
+        r = HttpClient.post("brightdata", "https://api.brightdata.com/request", headers=headers, json=payload)
 
         if r.status_code != 200:
             raise RuntimeError(
@@ -245,23 +232,28 @@ class SERPHelper:
                 self.serp_url_model.collection.update_one({"_id": pending_url.get("_id", "")}, {"$set": {"status": "SUCCESS", "vectorDocIds": results}})
                 self.serp_url_model.collection.update_one({"_id": pending_url.get("_id", "")}, {"$unset": {"rawContent": ""}})
                 print(f"Scraped pending SERP URL: {pending_url.get('url', '')}")
+                return True
                 
             else:
                 print("No pending SERP URL found")
+                return False
                 
         except Exception as e:
             self.serp_url_model.collection.update_one({"_id": pending_url.get("_id", "")}, {"$set": {"status": "ERROR"}})
             print(f"Error scraping pending SERP URL: {e}")
+            return True
             
 
             
     def schedule_scrape_pending_serp_url(self):
         try:
-            scheduler.add_job(
+            # Ingest SERP pages as soon as they are stored; polling every minute is only the fallback
+            WorkNotifier.register(
+                "serp",
                 self.scrape_pending_serp_url,
-                'interval',
-                minutes=1,
-                id='scrape_pending_serp_url',
+                collection_name=self.serp_url_model.collection.name,
+                pipeline=WorkNotifier.status_pipeline("status", "PENDING"),
+                poll_seconds=60,
             )
             return {
                 "success": True,
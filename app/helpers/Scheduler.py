@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.schedulers.background import BackgroundScheduler
+
+
+class Scheduler:
+    """
+    The process's single APScheduler instance.
+
+    Nothing starts at import time: modules register jobs with add_job() and the
+    app starts and stops the scheduler from its lifespan. Jobs run on named
+    executors, each with its own thread budget:
+
+    - "default": short periodic jobs (SCHEDULER_DEFAULT_WORKERS, default 4)
+    - "long": the daily per-dashboard generation jobs (SCHEDULER_LONG_WORKERS, default 4)
+
+    Each job also has a concurrency budget (max_instances, default 1). Runs that
+    would exceed it count as overlaps and runs that start too late count as
+    misfires; both are reported by get_jobs_report() with the next run time
+    and the last run's duration.
+    """
+
+    EXECUTORS = {
+        "default": "SCHEDULER_DEFAULT_WORKERS",
+        "long": "SCHEDULER_LONG_WORKERS",
+    }
+
+    _lock = threading.Lock()
+    _scheduler: Optional[BackgroundScheduler] = None
+    _job_stats: Dict[str, dict] = {}
+
+    @classmethod
+    def get(cls) -> BackgroundScheduler:
+        with cls._lock:
+            if cls._scheduler is None:
+                executors = {
+                    name: ThreadPoolExecutor(int(os.getenv(env, "4"))) for name, env in cls.EXECUTORS.items()
+                }
+                scheduler = BackgroundScheduler(
+                    executors=executors,
+                    job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 300},
+                )
+                scheduler.add_listener(cls._on_event, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED | EVENT_JOB_ERROR)
+                cls._scheduler = scheduler
+            return cls._scheduler
+
+    @classmethod
+    def _stats_for(cls, job_id: str) -> dict:
+        return cls._job_stats.setdefault(job_id, {
+            "runs": 0,
+            "errors": 0,
+            "overlaps": 0,
+            "misfires": 0,
+            "running": 0,
+            "lastStartedAt": None,
+            "lastDurationSeconds": None,
+        })
+
+    @classmethod
+    def _on_event(cls, event) -> None:
+        with cls._lock:
+            stats = cls._stats_for(event.job_id)
+            if event.code == EVENT_JOB_MAX_INSTANCES:
+                stats["overlaps"] += 1
+            elif event.code == EVENT_JOB_MISSED:
+                stats["misfires"] += 1
+            elif event.code == EVENT_JOB_ERROR:
+                stats["errors"] += 1
+
+    @classmethod
+    def _timed(cls, job_id: str, func: Callable) -> Callable:
+        @wraps(func)
+        def run(*args, **kwargs):
+            started = time.perf_counter()
+            with cls._lock:
+                stats = cls._stats_for(job_id)
+                stats["running"] += 1
+                stats["lastStartedAt"] = datetime.utcnow()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with cls._lock:
+                    stats["running"] -= 1
+                    stats["runs"] += 1
+                    stats["lastDurationSeconds"] = round(time.perf_counter() - started, 2)
+        return run
+
+    @classmethod
+    def add_job(cls, func: Callable, trigger: str, job_id: str, executor: str = "default",
+                max_instances: int = 1, **trigger_args):
+        """Register (or replace) a job on the shared scheduler."""
+        return cls.get().add_job(
+            cls._timed(job_id, func),
+            trigger=trigger,
+            id=job_id,
+            executor=executor,
+            max_instances=max_instances,
+            replace_existing=True,
+            **trigger_args,
+        )
+
+    @classmethod
+    def get_jobs(cls) -> list:
+        return cls.get().get_jobs()
+
+    @classmethod
+    def start(cls) -> None:
+        scheduler = cls.get()
+        if not scheduler.running:
+            scheduler.start()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            scheduler = cls._scheduler
+        if scheduler is not None and scheduler.running:
+            scheduler.shutdown(wait=False)
+
+    @classmethod
+    def get_jobs_report(cls) -> list:
+        report = []
+        for job in cls.get_jobs():
+            # Jobs added before start() have no next_run_time yet
+            next_run = getattr(job, "next_run_time", None)
+            with cls._lock:
+                stats = dict(cls._stats_for(job.id))
+            report.append({
+                "id": job.id,
+                "executor": job.executor,
+                "trigger": str(job.trigger),
+                "maxInstances": job.max_instances,
+                "nextRunTime": next_run.isoformat() if next_run else None,
+                **stats,
+                "lastStartedAt": stats["lastStartedAt"].isoformat() if stats["lastStartedAt"] else None,
+            })
+        return report
@@ -2,8 +2,11 @@ import requests
 import json
 import random
 import os
-from playwright.sync_api import sync_playwright
 import html2text
+import httpx
+from app.helpers.BrowserPool import BrowserPool
+from app.helpers.HttpClient import HttpClient
+from app.helpers.PageCache import PageCache
 
 
 
@@ -104,14 +107,16 @@ class WebsiteScraper:
         }
 
         try:
-            response = requests.post(
+            # Pooled keep-alive connection with timeout and retries; rate limited per attempt
+            response = HttpClient.post(
+                "spider",
                 'https://api.spider.cloud/crawl',
                 headers=headers,
-                data=json.dumps(payload)
+                content=json.dumps(payload)
             )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return {
                 "success": False,
                 "error": str(e)
@@ -170,31 +175,13 @@ class WebsiteScraper:
             url = f'https://{url.strip("/")}/'
 
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.connect_over_cdp(self.PLAYWRIGHT_WSS)
-                context = browser.contexts[0] if browser.contexts else browser.new_context()
-                page = context.new_page()
-
-                # Block unnecessary resources
-                def handle_route(route, request):
-                    if request.resource_type in ["image", "media", "font"]:
-                        route.abort()
-                    else:
-                        route.continue_()
-
-                page.route("**/*", handle_route)
-
-                page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                page.wait_for_selector("body", timeout=20000)
-                html_content = page.content()
-
-                browser.close()
-
-                return {
-                    "success": True,
-                    "url": url,
-                    "html": html_content
-                }
+            # Pages are fetched on the shared pool of persistent browser connections
+            html_content = BrowserPool.fetch(url)
+            return {
+                "success": True,
+                "url": url,
+                "html": html_content
+            }
 
         except Exception as e:
             return {
@@ -204,7 +191,12 @@ class WebsiteScraper:
 
 
 
-    def _fetch_html(self, url: str) -> dict:
+    def _fetch_html(self, url: str, use_cache: bool = False) -> dict:
+        # Pages fetched by the crawler are reused instead of fetched again
+        if use_cache:
+            html = PageCache.get(url)
+            if html:
+                return {"html": html, "status": "Success", "cached": True}
         # Try Spider first
         result = self._scrape_url_with_spider(url)
         if isinstance(result, list) and result and result[0].get("status") == 200 and result[0].get("content"):
@@ -226,15 +218,16 @@ class WebsiteScraper:
         except Exception as e:
             return ''
     
-    def scrape_url(self,url:str):
+    def scrape_url(self,url:str, use_cache: bool = False):
         try:
-            html_content = self._fetch_html(url)
+            html_content = self._fetch_html(url, use_cache)
             if html_content["status"] == "Success":
                 markdown_content = self.html_to_markdown(html_content["html"])
                 return {
                     "success": True,
                     "data": {
-                        "markdown": markdown_content
+                        "markdown": markdown_content,
+                        "cached": html_content.get("cached", False)
                     }
                 }
             else:
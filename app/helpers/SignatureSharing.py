@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+from app.helpers.DashboardChoices import DashboardChoices
+from app.models.SignatureResult import SignatureResultModel
+
+
+class SignatureSharing:
+    """
+    Generates a job's results once per canonical filter signature and fans them
+    out to every dashboard with the same locations, industries, topics and regions.
+
+    The first dashboard of a signature runs the full pipeline and its items are
+    stored in SignatureResults. Later dashboards within SIGNATURE_FRESHNESS_HOURS
+    get a copy of those items (and of the source dashboard's URL vectors) instead.
+    Dashboards of one signature are serialized within the process so concurrent
+    workers wait for the first generation rather than duplicating it.
+    """
+
+    _registry_lock = threading.Lock()
+    _locks: Dict[tuple, threading.Lock] = {}
+    _stats: Dict[str, dict] = {}
+
+    @staticmethod
+    def signature(dashboard_id: str) -> str:
+        choices = DashboardChoices.get(dashboard_id)
+        canonical = {
+            "locations": sorted(set(choices.get("location_slugs", []))),
+            "industries": sorted(set(choices.get("industry_slugs", []))),
+            "topics": sorted(set(choices.get("topic_slugs", []))),
+            "regions": sorted(set(str(region) for region in choices.get("regions", []))),
+        }
+        return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _lock_for(cls, job: str, signature: str) -> threading.Lock:
+        with cls._registry_lock:
+            return cls._locks.setdefault((job, signature), threading.Lock())
+
+    @classmethod
+    def _count(cls, job: str, key: str) -> None:
+        with cls._registry_lock:
+            stats = cls._stats.setdefault(job, {"generated": 0, "reused": 0})
+            stats[key] += 1
+
+    @classmethod
+    def run(cls, job: str, dashboard_id: str, retrieve: Callable[[Optional[list], Optional[str]], dict]) -> dict:
+        """
+        Call retrieve(generated, source_dashboard_id) for dashboard_id. generated is
+        None when this dashboard has to generate; a successful result's "generated"
+        items are then stored for the other dashboards of the signature.
+        """
+        signature = cls.signature(dashboard_id)
+        freshness_hours = float(os.getenv("SIGNATURE_FRESHNESS_HOURS", "20"))
+        model = SignatureResultModel()
+
+        with cls._lock_for(job, signature):
+            shared = model.get_fresh(job, signature, freshness_hours)
+            if shared and shared.get("sourceDashboardId") != dashboard_id:
+                print(f"[{job}] dashboard={dashboard_id} reusing results of dashboard={shared['sourceDashboardId']}")
+                cls._count(job, "reused")
+                return retrieve(shared.get("items") or [], shared["sourceDashboardId"])
+
+            result = retrieve(None, None)
+            cls._count(job, "generated")
+            if result and result.get("success") and result.get("generated"):
+                try:
+                    model.save(job, signature, dashboard_id, result["generated"])
+                except Exception as e:
+                    print(f"[{job}] Failed to save shared results for dashboard={dashboard_id}: {e}")
+            return result
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._registry_lock:
+            return {job: dict(stats) for job, stats in cls._stats.items()}
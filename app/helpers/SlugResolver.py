@@ -0,0 +1,179 @@
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.helpers.ClientRegistry import ClientRegistry
+
+
+class SlugResolver:
+    """
+    In-memory resolver for the location/industry/topic/region slug namespaces.
+
+    Each slug namespace is pulled from Pinecone once (ids, vectors and text)
+    into a row-normalised NumPy matrix. Exact and alias matches are answered
+    from a dictionary; everything else is embedded and scored against the
+    matrix with a single matrix multiply per slug type. Snapshots are reloaded
+    after SLUG_RESOLVER_TTL_SECONDS or invalidate().
+    """
+
+    NAMESPACES = {
+        "location": "LocationsSlug",
+        "primary_industry": "PrimaryIndustrySlug",
+        "secondary_industry": "SecondaryIndustrySlug",
+        "topic": "TopicSlug",
+        "region": "RegionsSlug",
+    }
+
+    _lock = threading.Lock()
+    _snapshots: Dict[str, dict] = {}
+
+    @classmethod
+    def _ttl_seconds(cls) -> float:
+        return float(os.getenv("SLUG_RESOLVER_TTL_SECONDS", "3600"))
+
+    @classmethod
+    def _score_threshold(cls) -> float:
+        # Relevance score cut-off, compared against (cosine + 1) / 2 like the
+        # langchain_pinecone similarity_score_threshold retrievers this replaces
+        return float(os.getenv("SLUG_RESOLVER_SCORE_THRESHOLD", "0.5"))
+
+    @staticmethod
+    def _relevance(cosine: float) -> float:
+        return (cosine + 1.0) / 2.0
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+    @classmethod
+    def _aliases(cls, name: str) -> List[str]:
+        normalized = cls._normalize(name)
+        slugified = re.sub(r"[^a-z0-9]+", "-", normalized).strip("-")
+        return [normalized, slugified, slugified.replace("-", " ")]
+
+    @classmethod
+    def _load_snapshot(cls, namespace: str) -> dict:
+        started = time.perf_counter()
+        index = ClientRegistry.get_index()
+        ids = []
+        for page in index.list(namespace=namespace):
+            ids.extend(page)
+
+        names, vectors = [], []
+        for start in range(0, len(ids), 100):
+            fetched = index.fetch(ids=ids[start:start + 100], namespace=namespace)
+            for vector in fetched.vectors.values():
+                name = (vector.metadata or {}).get("text")
+                if not name or not vector.values:
+                    continue
+                names.append(name)
+                vectors.append(vector.values)
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if len(matrix):
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1.0, norms)
+
+        exact = {}
+        for name in names:
+            for alias in cls._aliases(name):
+                exact.setdefault(alias, name)
+
+        print(f"[SlugResolver] Loaded {len(names)} slugs from {namespace} "
+              f"in {time.perf_counter() - started:.2f}s")
+        return {"names": names, "matrix": matrix, "exact": exact, "loaded_at": time.monotonic()}
+
+    @classmethod
+    def _get_snapshot(cls, query_type: str) -> dict:
+        namespace = cls.NAMESPACES[query_type]
+        with cls._lock:
+            snapshot = cls._snapshots.get(namespace)
+            if snapshot is None or time.monotonic() - snapshot["loaded_at"] > cls._ttl_seconds():
+                snapshot = cls._load_snapshot(namespace)
+                cls._snapshots[namespace] = snapshot
+            return snapshot
+
+    @classmethod
+    def invalidate(cls, query_type: Optional[str] = None) -> None:
+        """
+        Drop one (or every) snapshot so it is reloaded on next use.
+        """
+        with cls._lock:
+            if query_type is None:
+                cls._snapshots.clear()
+            else:
+                cls._snapshots.pop(cls.NAMESPACES.get(query_type), None)
+
+    @classmethod
+    def top_k(cls, query_type: str, query_vectors: np.ndarray, k: int = 3) -> List[List[tuple]]:
+        """
+        Cosine top-k for a batch of query vectors against one slug type.
+        Returns [(name, score), ...] per query, best first.
+        """
+        snapshot = cls._get_snapshot(query_type)
+        matrix = snapshot["matrix"]
+        if not len(matrix) or not len(query_vectors):
+            return [[] for _ in range(len(query_vectors))]
+
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1.0, norms)
+        scores = queries @ matrix.T
+
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        matches = []
+        for row, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-scores[row, candidates])]
+            matches.append([(snapshot["names"][i], float(scores[row, i])) for i in ordered])
+        return matches
+
+    @classmethod
+    def resolve(cls, queries: List[dict]) -> List[dict]:
+        """
+        Resolve [{"type", "query"}, ...] to [{"type", "query", "slug"}, ...],
+        keeping the order of queries.
+        """
+        results: List[Optional[dict]] = [None] * len(queries)
+        pending: Dict[str, List[tuple]] = {}
+
+        for position, query_item in enumerate(queries):
+            query_type = query_item.get("type")
+            query = (query_item.get("query") or "").strip()
+
+            if not query:
+                results[position] = {"type": query_type, "query": query, "slug": None, "error": "Empty query"}
+                continue
+            if query_type not in cls.NAMESPACES:
+                results[position] = {
+                    "type": query_type, "query": query, "slug": None,
+                    "error": f"Unsupported type: {query_type}"
+                }
+                continue
+
+            exact = cls._get_snapshot(query_type)["exact"]
+            match = next((exact[alias] for alias in cls._aliases(query) if alias in exact), None)
+            if match is not None:
+                results[position] = {"type": query_type, "query": query, "slug": match}
+            else:
+                pending.setdefault(query_type, []).append((position, query))
+
+        if pending:
+            # One embedding request for every unresolved query, then one matrix multiply per slug type
+            ordered = [(query_type, item) for query_type, items in pending.items() for item in items]
+            embedded = ClientRegistry.get_cached_embeddings().embed_documents([query for _, (_, query) in ordered])
+            vectors = np.asarray(embedded, dtype=np.float32)
+            threshold = cls._score_threshold()
+            offset = 0
+            for query_type, items in pending.items():
+                batch = vectors[offset:offset + len(items)]
+                offset += len(items)
+                for (position, query), matches in zip(items, cls.top_k(query_type, batch, k=3)):
+                    slug = matches[0][0] if matches and cls._relevance(matches[0][1]) >= threshold else None
+                    results[position] = {"type": query_type, "query": query, "slug": slug}
+
+        return results
@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+from typing import Optional
+
+from app.models.Industries import IndustriesModel
+from app.models.Locations import LocationsModel
+from app.models.Topics import TopicsModel
+
+
+class TaxonomyCache:
+    """
+    Process-wide snapshot of the region/industry/topic taxonomy rendered as the
+    prompt block used by metadata extraction.
+
+    The snapshot is built once and shared across chunks and threads. It is
+    rebuilt when it is older than TAXONOMY_CACHE_TTL_SECONDS or after
+    invalidate() bumps the version (e.g. a new industry or topic was inserted).
+    """
+
+    _lock = threading.Lock()
+    _snapshot: Optional[dict] = None
+    _version = 0
+
+    @classmethod
+    def _ttl_seconds(cls) -> float:
+        return float(os.getenv("TAXONOMY_CACHE_TTL_SECONDS", "600"))
+
+    @classmethod
+    def _build_snapshot(cls, version: int) -> dict:
+        regions = list(LocationsModel().collection.find({}, {'region_name': 1, 'region_slug': 1, 'locations': 1}))
+        region_lines = []
+        for r in regions:
+            locations = ", ".join([loc['name'] for loc in r['locations']])
+            region_lines.append(f"- {r['region_name']} (Slug: {r['region_slug']}) → [{locations}]")
+
+        industries = list(IndustriesModel().collection.find({}))
+        industry_lines = []
+        for industry in industries:
+            primary = industry["primary_industry"]
+            primary_slug = industry["primary_industry_slug"]
+            secondaries = ", ".join([
+                f"{s['name']} (Slug: {s['slug']})" for s in industry.get("secondary_industry", [])
+            ])
+            industry_lines.append(f"- {primary} (Slug: {primary_slug}) → [{secondaries}]")
+
+        topics = list(TopicsModel().collection.find({}))
+        topic_lines = []
+        for topic_group in topics:
+            category = topic_group["category"]
+            category_slug = topic_group["category_slug"]
+            titles = ", ".join([
+                f"{t['title']} (Slug: {t['slug']})" for t in topic_group.get("topics", [])
+            ])
+            topic_lines.append(f"- {category} (Slug: {category_slug}) → [{titles}]")
+
+        return {
+            "version": version,
+            "built_at": time.monotonic(),
+            "region_lines": "\n".join(region_lines),
+            "industry_lines": "\n".join(industry_lines),
+            "topic_lines": "\n".join(topic_lines),
+        }
+
+    @classmethod
+    def get_prompt_block(cls) -> dict:
+        """
+        Return {"region_lines", "industry_lines", "topic_lines"} for the extraction prompt,
+        rebuilding the snapshot only when it is stale.
+        """
+        with cls._lock:
+            snapshot = cls._snapshot
+            if (
+                snapshot is None
+                or snapshot["version"] != cls._version
+                or time.monotonic() - snapshot["built_at"] > cls._ttl_seconds()
+            ):
+                snapshot = cls._build_snapshot(cls._version)
+                cls._snapshot = snapshot
+                print(f"[TaxonomyCache] Rebuilt taxonomy snapshot (version={snapshot['version']})")
+            return snapshot
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """
+        Force the next get_prompt_block() call to reload the taxonomy from Mongo.
+        """
+        with cls._lock:
+            cls._version += 1
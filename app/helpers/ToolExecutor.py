@@ -0,0 +1,100 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, List, Tuple
+
+
+class ToolExecutor:
+    """
+    Runs the tool calls of one LLM tool-calling round concurrently.
+
+    Tools are blocking (Pinecone, SERP, scraping), so they run on bounded
+    thread pools. Web tools (SERP, page scraping) get their own "web" pool so
+    a slow third-party site cannot starve vector searches, which run on the
+    "default" pool. Pool sizes come from TOOL_EXECUTOR_<POOL>_MAX_WORKERS,
+    falling back to TOOL_EXECUTOR_MAX_WORKERS. Every call gets its own
+    timeout: TOOL_TIMEOUT_<TOOL_NAME> if set, otherwise TOOL_TIMEOUT_SECONDS.
+    Results come back in the order the calls were given; a call that fails
+    or times out yields {"error": ...} instead of raising.
+    """
+
+    TOOL_POOLS = {
+        "fetch_serp_content": "web",
+        "get_webpage_content": "web",
+    }
+
+    _lock = threading.Lock()
+    _executors = {}
+
+    @classmethod
+    def get_executor(cls, tool_name: str = None) -> ThreadPoolExecutor:
+        pool = cls.TOOL_POOLS.get(tool_name, "default")
+        with cls._lock:
+            executor = cls._executors.get(pool)
+            if executor is None:
+                default_workers = os.getenv("TOOL_EXECUTOR_MAX_WORKERS", "16")
+                executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv(f"TOOL_EXECUTOR_{pool.upper()}_MAX_WORKERS", default_workers)),
+                    thread_name_prefix=f"tool-{pool}"
+                )
+                cls._executors[pool] = executor
+            return executor
+
+    @staticmethod
+    def timeout_for(name: str) -> float:
+        default = os.getenv("TOOL_TIMEOUT_SECONDS", "60")
+        return float(os.getenv(f"TOOL_TIMEOUT_{(name or '').upper()}", default))
+
+    @staticmethod
+    def _failed(name: str, e: Exception) -> dict:
+        print(f"[ToolExecutor] Tool {name} failed: {e}")
+        return {"error": f"Tool {name} failed: {e}"}
+
+    @staticmethod
+    def _timed_out(name: str, timeout: float) -> dict:
+        print(f"[ToolExecutor] Tool {name} timed out after {timeout}s")
+        return {"error": f"Tool {name} timed out after {timeout}s"}
+
+    @classmethod
+    def run_all(cls, calls: List[Tuple[str, Callable[[], Any]]]) -> List[Any]:
+        """
+        Blocking variant for the synchronous tool loops. calls is [(tool_name, fn), ...].
+        """
+        if not calls:
+            return []
+        submitted_at = time.monotonic()
+        futures = [(name, cls.get_executor(name).submit(fn)) for name, fn in calls]
+        results = []
+        for name, future in futures:
+            timeout = cls.timeout_for(name)
+            try:
+                remaining = max(0.0, timeout - (time.monotonic() - submitted_at))
+                results.append(future.result(timeout=remaining))
+            except FutureTimeoutError:
+                future.cancel()
+                results.append(cls._timed_out(name, timeout))
+            except Exception as e:
+                results.append(cls._failed(name, e))
+        return results
+
+    @classmethod
+    async def run_all_async(cls, calls: List[Tuple[str, Callable[[], Any]]]) -> List[Any]:
+        """
+        Event-loop variant: offloads every call to the pool and awaits them together.
+        """
+        if not calls:
+            return []
+        loop = asyncio.get_running_loop()
+
+        async def run_one(name, fn):
+            timeout = cls.timeout_for(name)
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(cls.get_executor(name), fn), timeout=timeout)
+            except asyncio.TimeoutError:
+                return cls._timed_out(name, timeout)
+            except Exception as e:
+                return cls._failed(name, e)
+
+        return await asyncio.gather(*(run_one(name, fn) for name, fn in calls))
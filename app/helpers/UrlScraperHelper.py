@@ -19,7 +19,8 @@ class UrlScraperHelper:
         self, 
         urls: List[str], 
         dashboard_id: str, 
-        source: str
+        source: str,
+        copy_from_dashboard_id: Optional[str] = None
     ) -> dict:
         """
         Scrape URLs and save to vector DB if not already scraped.
@@ -28,20 +29,23 @@ class UrlScraperHelper:
             urls: List of URLs to scrape
             dashboard_id: Dashboard ID for namespace and tracking
             source: Source type ("news", "calendar", or "compliance")
+            copy_from_dashboard_id: Dashboard that already ingested these URLs; its
+                vectors are copied instead of scraping and embedding again
             
         Returns:
             dict with success status and details
         """
         if not urls:
-            return {"success": True, "scraped_count": 0, "skipped_count": 0}
+            return {"success": True, "scraped_count": 0, "skipped_count": 0, "copied_count": 0}
         
         scraped_count = 0
         skipped_count = 0
+        copied_count = 0
         errors = []
         
         # Create vector DB instance with dashboard-specific namespace
         namespace = f"{dashboard_id}-memory"
-        vector_db = VectorDB(namespace)
+        vector_db = VectorDB.get(namespace)
         
         for url in urls:
             if not url or not url.strip():
@@ -62,6 +66,13 @@ class UrlScraperHelper:
                     continue
                 
                 # If existing entry has error or failed scraping, we'll retry and update
+
+                if copy_from_dashboard_id:
+                    copied_ids = self._copy_url_vectors(copy_from_dashboard_id, source, url, vector_db)
+                    if copied_ids:
+                        self._record_scraped(existing, dashboard_id, source, url, copied_ids)
+                        copied_count += 1
+                        continue
                 
                 # Scrape the URL
                 scraped_content = self.scraper.scrape_url(url)
@@ -93,21 +104,7 @@ class UrlScraperHelper:
                     vector_db_ids = [r.get("uuid") for r in results if r.get("uuid")]
                     
                     # Save tracking info to MongoDB
-                    if existing:
-                        # Update existing record
-                        self.scraped_url_model.update_scraped_url(
-                            dashboard_id, source, url, vector_db_ids
-                        )
-                    else:
-                        # Create new record
-                        self.scraped_url_model.create({
-                            "dashboardId": dashboard_id,
-                            "source": source,
-                            "url": url,
-                            "scraped": True,
-                            "vectorDbIds": vector_db_ids,
-                            "error": None
-                        })
+                    self._record_scraped(existing, dashboard_id, source, url, vector_db_ids)
                     
                     scraped_count += 1
                 else:
@@ -138,8 +135,37 @@ class UrlScraperHelper:
             "success": True,
             "scraped_count": scraped_count,
             "skipped_count": skipped_count,
+            "copied_count": copied_count,
             "errors": errors if errors else None
         }
 
+    def _record_scraped(self, existing, dashboard_id: str, source: str, url: str, vector_db_ids: List[str]):
+        if existing:
+            # Update existing record
+            self.scraped_url_model.update_scraped_url(
+                dashboard_id, source, url, vector_db_ids
+            )
+        else:
+            # Create new record
+            self.scraped_url_model.create({
+                "dashboardId": dashboard_id,
+                "source": source,
+                "url": url,
+                "scraped": True,
+                "vectorDbIds": vector_db_ids,
+                "error": None
+            })
+
+    def _copy_url_vectors(self, source_dashboard_id: str, source: str, url: str, vector_db) -> Optional[List[str]]:
+        """
+        Copy the vectors another dashboard stored for url into this dashboard's namespace.
+        Returns the copied vector ids, or None if the source dashboard has none.
+        """
+        origin = self.scraped_url_model.get_by_dashboard_source_url(source_dashboard_id, source, url)
+        if not origin or not origin.scraped or not origin.vectorDbIds:
+            return None
+        copied_ids = vector_db.copy_vectors_from(f"{source_dashboard_id}-memory", origin.vectorDbIds)
+        return copied_ids or None
+
 
 
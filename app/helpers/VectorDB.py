@@ -3,7 +3,9 @@ import random
 from dotenv import load_dotenv
 import time
 from datetime import datetime
+import json
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 import os
 import requests
@@ -11,7 +13,9 @@ import docx  # python-docx
 from langchain_openai import AzureChatOpenAI, OpenAIEmbeddings, AzureOpenAIEmbeddings
 from pinecone import Pinecone, ServerlessSpec, Index
 from pinecone.exceptions import NotFoundException
+from openai import RateLimitError
 from app.helpers.Utilities import Utils
+from app.helpers.ClientRegistry import ClientRegistry
 from langchain_pinecone import PineconeVectorStore
 from langchain_community.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter, MarkdownTextSplitter
@@ -24,30 +28,49 @@ from langchain.schema import HumanMessage, SystemMessage
 from app.schemas.Dashboard import  LawChangeListByLocation, NewsList,LegalCalendar, CourtDecisionList
 from app.schemas.MetaDataSchema import MetaDataSchemaList
 from app.helpers.MetaDataHelper import MetaDataHelper
+from app.helpers.TaxonomyCache import TaxonomyCache
 from app.models.Locations import LocationsModel
 from app.models.Industries import IndustriesModel
 from app.models.Topics import TopicsModel
+from app.models.ContentFingerprint import ContentFingerprintModel
 load_dotenv()
 
 class VectorDB:
     def __init__(self,namespace):
-        pc = Pinecone(api_key=os.getenv('PINECONE_API_KEY'))
-        index_name = os.getenv("PINECONE_INDEX")
-        # embeddings = OpenAIEmbeddings(model="text-embedding-3-large", api_key=os.getenv('OPENAI_API_KEY'))
-        self.embeddings = AzureOpenAIEmbeddings(
-            model="text-embedding-3-large",
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            openai_api_version='2024-12-01-preview'
-        )
-        
-        self.index = pc.Index(index_name)
+        # Pinecone/Azure clients are pooled process-wide, see ClientRegistry
+        self.embeddings = ClientRegistry.get_embeddings()
+        self.query_embeddings = ClientRegistry.get_cached_embeddings()
+        self.index = ClientRegistry.get_index()
         self.namespace = namespace
-        self.vector_store = PineconeVectorStore(index=self.index, embedding=self.embeddings,namespace=namespace)
-        self.meta_data_helper = MetaDataHelper()
-        self.locations_model=LocationsModel()
-        self.industries_model=IndustriesModel()
-        self.topics_model=TopicsModel()
+        self.vector_store = ClientRegistry.get_vector_store(namespace)
+        # Mongo helpers do not depend on the namespace, so every view shares one set
+        shared = ClientRegistry.get_or_create("vector_db_models", lambda: {
+            "meta_data_helper": MetaDataHelper(),
+            "locations_model": LocationsModel(),
+            "industries_model": IndustriesModel(),
+            "topics_model": TopicsModel(),
+            "fingerprint_model": ContentFingerprintModel(),
+        })
+        self.meta_data_helper = shared["meta_data_helper"]
+        self.locations_model = shared["locations_model"]
+        self.industries_model = shared["industries_model"]
+        self.topics_model = shared["topics_model"]
+        self.fingerprint_model = shared["fingerprint_model"]
+        self.embed_batch_size = int(os.getenv("VECTOR_EMBED_BATCH_SIZE", "64"))
+        self.upsert_batch_size = int(os.getenv("VECTOR_UPSERT_BATCH_SIZE", "32"))
+        self.upsert_max_bytes = int(os.getenv("VECTOR_UPSERT_MAX_BYTES", "2000000"))
+        self.upsert_concurrency = int(os.getenv("VECTOR_UPSERT_CONCURRENCY", "4"))
+        self.extraction_concurrency = int(os.getenv("METADATA_EXTRACTION_CONCURRENCY", "4"))
+        self.extraction_max_retries = int(os.getenv("METADATA_EXTRACTION_MAX_RETRIES", "5"))
+
+    @classmethod
+    def get(cls, namespace: str) -> "VectorDB":
+        """
+        VectorDB view for a namespace. Clients and Mongo models come from
+        ClientRegistry, so building a view per call is cheap and nothing is kept
+        per namespace (chat and memory namespaces are per dashboard).
+        """
+        return cls(namespace)
         
         
     def generate_embedding(self, text: str):
@@ -56,36 +79,272 @@ class VectorDB:
         #     input=text
         # )
         
-        response = self.embeddings.embed_query(text)
+        # Query vectors are served from the two-tier EmbeddingCache when possible
+        response = self.query_embeddings.embed_query(text)
         return response 
 
+    def _query_by_vector(self, query_vector, metadata_filter: dict, k: int) -> list:
+        """
+        Run one Pinecone query and return (Document, score) pairs.
+        """
+        response = self.index.query(
+            vector=query_vector,
+            top_k=k,
+            filter=metadata_filter,
+            namespace=self.namespace,
+            include_metadata=True
+        )
+        return [
+            (
+                Document(
+                    page_content=match['metadata'].get("text", ""),
+                    metadata=match['metadata'],
+                    id = match['id']
+                ),
+                match.get('score', 0.0)
+            )
+            for match in response['matches']
+        ]
+
     def retrieve_by_metadata(self, query: str, metadata_filter: dict, k: int = 5):
             """
             Retrieve documents based on query + metadata filtering.
             """
             try:
                 query_vector = self.generate_embedding(query)
-                response = self.index.query(
-                    vector=query_vector,
-                    top_k=k,
-                    filter=metadata_filter,
-                    namespace=self.namespace,
-                    include_metadata=True
-                )
-
                 # Convert results to LangChain Document objects
-                docs = [
-                    Document(
-                        page_content=match['metadata'].get("text", ""),
-                        metadata=match['metadata'],
-                        id = match['id']
-                    )
-                    for match in response['matches']
-                ]
-                return docs
+                return [doc for doc, _ in self._query_by_vector(query_vector, metadata_filter, k)]
             except Exception as e:
                 print(f"Error in retrieve_by_metadata: {e}")
                 return []
+
+    def retrieve_with_fallback(self, query: str, metadata_filter: dict, k: int = 10, fallback_k: int = 5):
+        """
+        Embed the query once, then run the filtered query and an unfiltered
+        fallback query concurrently. Results are deduplicated by vector id and
+        ordered by similarity score (stored in metadata["score"]).
+        """
+        try:
+            query_vector = self.generate_embedding(query)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                filtered = executor.submit(self._query_by_vector, query_vector, metadata_filter or {}, k)
+                fallback = executor.submit(self._query_by_vector, query_vector, {}, fallback_k)
+                matches = filtered.result() + fallback.result()
+
+            best = {}
+            for doc, score in matches:
+                if doc.id not in best or score > best[doc.id][1]:
+                    best[doc.id] = (doc, score)
+
+            docs = []
+            for doc, score in sorted(best.values(), key=lambda pair: pair[1], reverse=True):
+                doc.metadata["score"] = score
+                docs.append(doc)
+            return docs
+        except Exception as e:
+            print(f"Error in retrieve_with_fallback: {e}")
+            return []
+
+    def _extract_meta_data_with_retry(self, text: str):
+        """
+        Run metadata extraction for one chunk, retrying rate limited (429) calls
+        with jittered exponential backoff. Returns None if the chunk fails.
+        """
+        for attempt in range(self.extraction_max_retries + 1):
+            try:
+                return self.extract_meta_data_from_chunk(text)
+            except Exception as e:
+                rate_limited = isinstance(e, RateLimitError) or getattr(e, "status_code", None) == 429
+                if not rate_limited or attempt == self.extraction_max_retries:
+                    print(f"Metadata extraction failed for chunk: {e}")
+                    return None
+                delay = min(2 ** attempt, 60) + random.uniform(0, 1)
+                print(f"[VectorDB] Rate limited during metadata extraction, retrying in {delay:.1f}s "
+                      f"(attempt {attempt + 1}/{self.extraction_max_retries})")
+                time.sleep(delay)
+
+    def extract_meta_data_from_chunks(self, texts: list) -> list:
+        """
+        Extract metadata for many chunks with at most METADATA_EXTRACTION_CONCURRENCY
+        LLM calls in flight. Results keep the order of texts; failed chunks are None.
+        """
+        if not texts:
+            return []
+        workers = max(1, min(self.extraction_concurrency, len(texts)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._extract_meta_data_with_retry, texts))
+
+    def _build_event_document(self, event_chunk, extra_metadata: dict) -> Document:
+        """
+        Build the vector store document for one extracted event chunk.
+        """
+        return Document(
+            id=str(uuid4()),
+            page_content=event_chunk.chunkText,
+            metadata={
+                "region_slug": event_chunk.region_slug,
+                "location_slug": event_chunk.location_slug,
+                "primary_industry_slug": event_chunk.primary_industry_slug,
+                "secondary_industry_slug": event_chunk.secondary_industry_slug,
+                "topic_slug": event_chunk.topic_slug,
+                "newsPublishTimestamp": datetime.fromisoformat(event_chunk.newsPublishTimestamp).timestamp(),
+                "discussedTimestamp": datetime.fromisoformat(event_chunk.discussedTimestamp).timestamp(),
+                **extra_metadata,
+            }
+        )
+
+    def _split_upsert_batches(self, vectors: list) -> list:
+        """
+        Split vectors into upsert batches bounded by count and approximate request size.
+        """
+        batches, current, current_bytes = [], [], 0
+        for vector in vectors:
+            # floats serialise to roughly 12 bytes each, metadata is sent as JSON
+            vector_bytes = len(vector["values"]) * 12 + len(json.dumps(vector["metadata"], default=str))
+            if current and (len(current) >= self.upsert_batch_size or current_bytes + vector_bytes > self.upsert_max_bytes):
+                batches.append(current)
+                current, current_bytes = [], 0
+            current.append(vector)
+            current_bytes += vector_bytes
+        if current:
+            batches.append(current)
+        return batches
+
+    def _upsert_batch(self, batch_idx: int, batch: list) -> dict:
+        started = time.perf_counter()
+        try:
+            self.index.upsert(vectors=batch, namespace=self.namespace)
+            error = None
+        except Exception as e:
+            error = str(e)
+        return {
+            "batch": batch_idx,
+            "size": len(batch),
+            "ids": [vector["id"] for vector in batch],
+            "seconds": round(time.perf_counter() - started, 3),
+            "error": error,
+        }
+
+    def add_documents_batched(self, documents: list) -> dict:
+        """
+        Embed documents with bulk embed_documents calls and upsert them in
+        size-bounded batches concurrently.
+
+        Returns {"ingested_ids": [...], "failed_ids": [...], "batches": [...]}
+        where every batch entry carries its size, timing and error (if any).
+        """
+        stats = {"ingested_ids": [], "failed_ids": [], "batches": []}
+        if not documents:
+            return stats
+
+        texts = [doc.page_content for doc in documents]
+        embeddings = []
+        for start in range(0, len(texts), self.embed_batch_size):
+            embed_started = time.perf_counter()
+            embeddings.extend(self.embeddings.embed_documents(texts[start:start + self.embed_batch_size]))
+            print(f"[VectorDB] Embedded {len(texts[start:start + self.embed_batch_size])} documents in "
+                  f"{time.perf_counter() - embed_started:.2f}s (namespace={self.namespace})")
+
+        vectors = [
+            {
+                "id": doc.id,
+                "values": values,
+                # Keep the text under the same key PineconeVectorStore uses so retrieval is unchanged
+                "metadata": {**doc.metadata, "text": doc.page_content},
+            }
+            for doc, values in zip(documents, embeddings)
+        ]
+
+        batches = self._split_upsert_batches(vectors)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.upsert_concurrency, len(batches)))) as executor:
+            futures = [executor.submit(self._upsert_batch, idx, batch) for idx, batch in enumerate(batches)]
+            for future in as_completed(futures):
+                result = future.result()
+                if result["error"]:
+                    stats["failed_ids"].extend(result["ids"])
+                    print(f"[VectorDB] Upsert batch {result['batch']} ({result['size']} vectors) failed "
+                          f"after {result['seconds']}s: {result['error']}")
+                else:
+                    stats["ingested_ids"].extend(result["ids"])
+                    print(f"[VectorDB] Upsert batch {result['batch']} ({result['size']} vectors) "
+                          f"took {result['seconds']}s")
+                stats["batches"].append({k: v for k, v in result.items() if k != "ids"})
+
+        stats["batches"].sort(key=lambda b: b["batch"])
+        print(f"[VectorDB] Ingested {len(stats['ingested_ids'])}/{len(vectors)} vectors in {len(batches)} batches, "
+              f"{len(stats['failed_ids'])} failed (namespace={self.namespace})")
+        return stats
+
+    def copy_vectors_from(self, source_namespace: str, ids: list) -> list:
+        """
+        Copy existing vectors (values and metadata) from another namespace into this
+        one under the same ids, without re-extracting or re-embedding. Returns the copied ids.
+        """
+        copied = []
+        for start in range(0, len(ids), 100):
+            fetched = self.index.fetch(ids=ids[start:start + 100], namespace=source_namespace)
+            vectors = [
+                {"id": vector_id, "values": vector.values, "metadata": vector.metadata or {}}
+                for vector_id, vector in fetched.vectors.items()
+            ]
+            for batch in self._split_upsert_batches(vectors):
+                self.index.upsert(vectors=batch, namespace=self.namespace)
+                copied.extend(vector["id"] for vector in batch)
+        return copied
+
+    def _ingest_deduplicated(self, source_key: str, source_hash: str, previous, event_documents: list) -> list:
+        """
+        Ingest the event documents of one page/file, reusing vectors for chunks
+        this source already ingested with the same normalized text, then record
+        the new fingerprints and retire vectors the previous version no longer
+        produces. Returns [] when any upsert failed; the previous vectors are
+        then kept, and the chunks that did land are reused on the next attempt.
+        """
+        chunk_hashes = [self.fingerprint_model.content_hash(doc.page_content) for doc in event_documents]
+        known = self.fingerprint_model.get_chunk_vectors(self.namespace, source_key, chunk_hashes)
+
+        results, reused_hashes, new_documents, new_hashes = [], [], [], {}
+        duplicate_chunks = 0
+        for doc, chunk_hash in zip(event_documents, chunk_hashes):
+            if chunk_hash in known:
+                results.append({"uuid": known[chunk_hash], "metadata": doc.metadata})
+                reused_hashes.append(chunk_hash)
+            elif chunk_hash in new_hashes.values():
+                duplicate_chunks += 1
+            else:
+                new_documents.append(doc)
+                new_hashes[doc.id] = chunk_hash
+
+        ingest_stats = self.add_documents_batched(new_documents)
+        ingested_ids = set(ingest_stats["ingested_ids"])
+        results.extend(
+            {"uuid": doc.id, "metadata": doc.metadata}
+            for doc in new_documents if doc.id in ingested_ids
+        )
+
+        self.fingerprint_model.save_chunks(
+            self.namespace, source_key,
+            {new_hashes[doc_id]: doc_id for doc_id in ingested_ids}
+        )
+
+        if ingest_stats["failed_ids"]:
+            print(f"[VectorDB] Ingest of {source_key} incomplete: {len(ingest_stats['failed_ids'])} vectors "
+                  f"failed to upsert, previous vectors kept (namespace={self.namespace})")
+            return []
+
+        retired = []
+        if previous is not None:
+            current_ids = {item["uuid"] for item in results}
+            stale_ids = [vid for vid in previous.vectorDocIds if vid not in current_ids]
+            retired = self.release_vectors(source_key, stale_ids)
+
+        if results:
+            self.fingerprint_model.save_source(self.namespace, source_key, source_hash, results)
+
+        print(f"[VectorDB] Dedup for {source_key}: {len(ingested_ids)} chunks embedded, "
+              f"{len(reused_hashes)} unchanged chunks skipped, {duplicate_chunks} duplicate chunks skipped, "
+              f"{len(retired)} stale vectors retired (namespace={self.namespace})")
+        return results
                 
     def enterDocumentToKnowledge(self, file_path, file_name='Untitled document',source_type=''):
         try:
@@ -141,46 +400,40 @@ class VectorDB:
                     except Exception:
                         pass
 
+            source_hash = self.fingerprint_model.content_hash("\n".join(d.page_content for d in documents))
+            previous = self.fingerprint_model.get_source(self.namespace, file_path)
+            if previous is not None and previous.contentHash == source_hash and previous.results:
+                print(f"[VectorDB] Skipping unchanged document {file_path}: "
+                      f"{len(previous.results)} vectors already ingested (namespace={self.namespace})")
+                return previous.results
+
             text_splitter = RecursiveCharacterTextSplitter(
                 chunk_size=20000,
                 chunk_overlap=200,
             )
             chunks = text_splitter.split_documents(documents)
 
-            results = []
-            for chunk in chunks:
+            event_documents = []
+            extracted = self.extract_meta_data_from_chunks([chunk.page_content for chunk in chunks])
+            for event_chunk_list in extracted:
+                if event_chunk_list is None:
+                    continue
                 try:
-                    event_chunk_list = self.extract_meta_data_from_chunk(chunk.page_content)
                     for event_chunk in event_chunk_list.metaData:
-                        event_chunk_uuid = str(uuid4())
-                        event_chunk_document = Document(
-                            id=event_chunk_uuid,
-                            page_content=event_chunk.chunkText,
-                            metadata={
-                                "region_slug": event_chunk.region_slug,
-                                "location_slug": event_chunk.location_slug,
-                                "primary_industry_slug": event_chunk.primary_industry_slug,
-                                "secondary_industry_slug": event_chunk.secondary_industry_slug,
-                                "topic_slug": event_chunk.topic_slug,
-                                "newsPublishTimestamp": datetime.fromisoformat(event_chunk.newsPublishTimestamp).timestamp(),
-                                "discussedTimestamp": datetime.fromisoformat(event_chunk.discussedTimestamp).timestamp(),
-                                "file_name": file_name,
-                                "file_url": file_path,
-                                 "sourceType": source_type,
-                                "ingestion_date": utc_string,
-                            }
-                        )
-                        try:
-                            self.vector_store.add_documents(documents=[event_chunk_document], ids=[event_chunk_uuid], namespace=self.namespace)
-                        except Exception as e:
-                            print(f"Error adding document to vector store: {e}")
-                        results.append({
-                            "uuid": event_chunk_uuid,
-                            "metadata": event_chunk_document.metadata,
-                        })
+                        event_documents.append(self._build_event_document(event_chunk, {
+                            "file_name": file_name,
+                            "file_url": file_path,
+                            "sourceType": source_type,
+                            "ingestion_date": utc_string,
+                        }))
                 except Exception as e:
                     print(f"Metadata extraction failed for chunk: {e}")
-            return results
+
+            try:
+                return self._ingest_deduplicated(file_path, source_hash, previous, event_documents)
+            except Exception as e:
+                print(f"Error adding documents to vector store: {e}")
+                return []
         except Exception as e:
             print(f"Error in enterDocumentToKnowledge: {e}")
             return None
@@ -224,6 +477,14 @@ class VectorDB:
         try:
             utc_now = datetime.utcnow()
             utc_string = utc_now.strftime("%Y-%m-%dT%H:%M:%S.%fZ") 
+
+            source_hash = self.fingerprint_model.content_hash(page_content)
+            previous = self.fingerprint_model.get_source(self.namespace, url)
+            if previous is not None and previous.contentHash == source_hash and previous.results:
+                print(f"[VectorDB] Skipping unchanged page {url}: "
+                      f"{len(previous.results)} vectors already ingested (namespace={self.namespace})")
+                return previous.results
+
             documents = []
             doc = Document(
                 page_content=page_content,
@@ -237,44 +498,28 @@ class VectorDB:
 
             chunks = [doc]
 
-            for chunk in chunks:
-                results = []
+            event_documents = []
+            extracted = self.extract_meta_data_from_chunks([chunk.page_content for chunk in chunks])
+            for event_chunk_list in extracted:
+                if event_chunk_list is None:
+                    continue
                 try:
-                        event_chunk_list = self.extract_meta_data_from_chunk(chunk.page_content)
                         for event_chunk in event_chunk_list.metaData:
                             # self.meta_data_helper.check_if_new_data(event_chunk)
-                            event_chunk_uuid = str(uuid4())
-
-                            event_chunk_document = Document(
-                            id=event_chunk_uuid,
-                            page_content=event_chunk.chunkText,
-                            metadata={
-                                "region_slug": event_chunk.region_slug,
-                                "location_slug": event_chunk.location_slug,
-                                "primary_industry_slug": event_chunk.primary_industry_slug,
-                                "secondary_industry_slug": event_chunk.secondary_industry_slug,                   
-                                "topic_slug": event_chunk.topic_slug,
-                                "newsPublishTimestamp": datetime.fromisoformat(event_chunk.newsPublishTimestamp).timestamp(),
-                                "discussedTimestamp": datetime.fromisoformat(event_chunk.discussedTimestamp).timestamp(),
+                            event_documents.append(self._build_event_document(event_chunk, {
                                 "pageUrl": url,
                                 "sourceType": source_type,
                                 "ingestion_date": utc_string,
-                            }
-                        )
-                            
-                            try:
-                                ingested=self.vector_store.add_documents(documents=[event_chunk_document], ids=[event_chunk_uuid], namespace=self.namespace)
-                            except Exception as e:
-                                print(f"Error adding document to vector store: {e}")
-                            results.append({
-                            "uuid": event_chunk_uuid,
-                            "metadata": event_chunk_document.metadata,
-                            })
+                            }))
 
                 except Exception as e:
                     print(f"Metadata extraction failed for chunk: {e}")
 
-            return results
+            try:
+                return self._ingest_deduplicated(url, source_hash, previous, event_documents)
+            except Exception as e:
+                print(f"Error adding documents to vector store: {e}")
+                return []
         except Exception as e:
             print(f"Error in enterWebsiteToKnowledge: {e}")
             return None
@@ -308,6 +553,32 @@ class VectorDB:
     #     except Exception as e:
     #         return None
         
+    def release_vectors(self, source_key: str, ids) -> list:
+        """
+        Drop source_key's reference to the given vectors and delete the ones no
+        other source still uses. Returns the deleted ids.
+        """
+        # Support both list of dicts (with 'uuid') and list of strings
+        if ids and isinstance(ids[0], dict) and 'uuid' in ids[0]:
+            ids = [item['uuid'] for item in ids]
+        orphaned = self.fingerprint_model.release_chunks(self.namespace, source_key, list(ids or []))
+        if orphaned and not self.deleteDocument(orphaned):
+            raise RuntimeError(f"Unable to delete {len(orphaned)} vectors of {source_key}")
+        return orphaned
+
+    def retire_source(self, source_key: str, ids) -> bool:
+        """
+        Remove a page/file from the knowledge base: release its vectors (deleting
+        those no other source uses) and forget its source fingerprint.
+        """
+        try:
+            self.release_vectors(source_key, ids)
+            self.fingerprint_model.forget_source(self.namespace, source_key)
+            return True
+        except Exception as e:
+            print(f"Error retiring {source_key}: {e}")
+            return False
+
     def deleteDocument(self, ids):
         try:
             # Support both list of dicts (with 'uuid') and list of strings
@@ -316,6 +587,7 @@ class VectorDB:
             else:
                 id_list = ids
             resp = self.vector_store.delete(id_list)
+            self.fingerprint_model.forget_vectors(self.namespace, id_list)
             return True
         except Exception as e:
             print(e)
@@ -324,6 +596,7 @@ class VectorDB:
     def deleteNamespace(self,namespace):
         try:
             resp = self.vector_store.delete(delete_all=True,namespace=namespace)
+            self.fingerprint_model.forget_namespace(namespace)
             return True
         except NotFoundException as e:
             print(f"Namespace '{namespace}' not found: {e}")
@@ -338,48 +611,11 @@ class VectorDB:
         return retriever
     
     def extract_meta_data_from_chunk(self, scrapped_data: str):
-        llm=AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-            streaming=True,
-            callbacks=[StreamingStdOutCallbackHandler()]
-        )
-        
+        llm=ClientRegistry.get_chat_llm(streaming=True)
         
-        regions=list(self.locations_model.collection.find({}, {'region_name': 1, 'region_slug': 1, 'locations': 1}))
-        region_lines = []
-        for r in regions:
-            locations = ", ".join([loc['name'] for loc in r['locations']])
-            region_lines.append(f"- {r['region_name']} (Slug: {r['region_slug']}) → [{locations}]")
-            
-        industries=list(self.industries_model.collection.find({}))
-        industry_lines = []
-        for industry in industries:
-            primary = industry["primary_industry"]
-            primary_slug = industry["primary_industry_slug"]
-            secondaries = ", ".join([
-                f"{s['name']} (Slug: {s['slug']})" for s in industry.get("secondary_industry", [])
-            ])
-            line = f"- {primary} (Slug: {primary_slug}) → [{secondaries}]"
-            industry_lines.append(line)
-        topics=list(self.topics_model.collection.find({}))
-        topic_lines = []
-        for topic_group in topics:
-            category = topic_group["category"]
-            category_slug = topic_group["category_slug"]
-            titles = ", ".join([
-                f"{t['title']} (Slug: {t['slug']})" for t in topic_group.get("topics", [])
-            ])
-            line = f"- {category} (Slug: {category_slug}) → [{titles}]"
-            topic_lines.append(line)
         
+        taxonomy = TaxonomyCache.get_prompt_block()
 
-
-        
         now = datetime.utcnow().isoformat() + "Z"
         system_message = SystemMessage(
             content=f"""
@@ -396,13 +632,13 @@ class VectorDB:
             - Regulatory announcements
         
         ### Valid Regions:
-        {chr(10).join(region_lines)}
+        {taxonomy["region_lines"]}
 
         ### Valid Industries:
-        {chr(10).join(industry_lines)}
+        {taxonomy["industry_lines"]}
 
         ### Valid Topics:
-        {chr(10).join(topic_lines)}
+        {taxonomy["topic_lines"]}
 
         ### Guidelines:
         - Extract all HR-relevant events
@@ -448,13 +684,7 @@ class VectorDB:
         vectors_as_string = "\n\n---\n\n".join([
             f"Text: {v['text']}\n\nMetadata: {v['metadata']}" for v in vector_list
         ])
-        llm=AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure"        )
+        llm=ClientRegistry.get_chat_llm()
         
         location_names = [slug.replace('-', ' ').title() for slug in location_slugs]
         industry_names = [slug.replace('-', ' ').title() for slug in industry_slugs]
@@ -502,16 +732,7 @@ class VectorDB:
         vectors_as_string = "\n\n---\n\n".join([
             f"Text: {v['text']}\n\nMetadata: {v['metadata']}" for v in vector_list
         ])
-        llm=AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-            streaming=True,
-            callbacks=[StreamingStdOutCallbackHandler()]
-        )
+        llm=ClientRegistry.get_chat_llm(streaming=True)
         system_message = SystemMessage(
             content=f"""You are a legal news analyst. Analyze the provided documents and extract at least 4 unique structured news items about
             changes in employment law or HR regulations.""")
@@ -537,16 +758,7 @@ class VectorDB:
             f"Text: {v['text']}\n\nMetadata: {v['metadata']}" for v in vector_list
         ])
 
-        llm = AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-            streaming=True,
-            callbacks=[StreamingStdOutCallbackHandler()]
-        )
+        llm = ClientRegistry.get_chat_llm(streaming=True)
         location_slugs = location_slugs or []
         industry_slugs = industry_slugs or []
         topic_slugs = topic_slugs or []
@@ -606,16 +818,7 @@ class VectorDB:
                 f"Text: {v['text']}\n\nMetadata: {v['metadata']}" for v in vector_list
             ])
 
-            llm = AzureChatOpenAI(
-                azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-                azure_deployment=os.getenv('gpt-4o-mini'),
-                api_key=os.getenv('AZURE_OPENAI_KEY'),
-                api_version="2024-12-01-preview",
-                model_name="gpt-4o-mini",
-                openai_api_type="azure",
-                streaming=True,
-                callbacks=[StreamingStdOutCallbackHandler()]
-            )
+            llm = ClientRegistry.get_chat_llm(streaming=True)
 
             system_message = SystemMessage(
                 content="""You are a legal news analyst. Analyze the following text and extract unique legal calendar events related to changes in employment laws or HR regulation
@@ -0,0 +1,175 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+from app.helpers.Database import MongoDB
+
+
+class _Consumer:
+    def __init__(self, name: str, work: Callable[[], bool], poll_seconds: float, idle_poll_seconds: float,
+                 drain: bool, busy: Optional[Callable[[], bool]], next_due: Optional[Callable[[], Optional[float]]]):
+        self.name = name
+        self.work = work
+        self.poll_seconds = poll_seconds
+        self.idle_poll_seconds = idle_poll_seconds
+        self.drain = drain
+        self.busy = busy
+        self.next_due = next_due
+        self.event = threading.Event()
+        self.stream_ok = False
+        self.threads: List[threading.Thread] = []
+        self.stats = {"notified": 0, "changeEvents": 0, "fallbackPolls": 0, "runs": 0, "errors": 0}
+
+
+class WorkNotifier:
+    """
+    Event-driven wake-up for the background consumers (queue, documents, crawler,
+    scraper, SERP URLs).
+
+    Each consumer runs on its own thread and sleeps until it is notified, either
+    in-process via notify(name) when work is created here, or by a Mongo change
+    stream on its collection when another pod or service inserts work. After a
+    wake-up, drain consumers call work() until it reports nothing was done.
+
+    Polling stays as a fallback: every poll_seconds while the change stream is
+    unavailable (e.g. standalone Mongo without a replica set) or the consumer is
+    busy, and only every WORK_IDLE_POLL_SECONDS while the stream is healthy.
+    """
+
+    _lock = threading.Lock()
+    _consumers: Dict[str, _Consumer] = {}
+    _stop = threading.Event()
+
+    @classmethod
+    def register(
+        cls,
+        name: str,
+        work: Callable[[], bool],
+        collection_name: Optional[str] = None,
+        pipeline: Optional[list] = None,
+        poll_seconds: float = 10,
+        drain: bool = True,
+        busy: Optional[Callable[[], bool]] = None,
+        next_due: Optional[Callable[[], Optional[float]]] = None,
+    ) -> None:
+        """
+        Start consuming. work() returns True when it processed something. With
+        collection_name, changes matching pipeline (default: any insert or update)
+        on that collection wake the consumer. next_due() returns the seconds until
+        delayed work (e.g. a retry backoff) becomes due, or None; the consumer
+        wakes up for it without waiting for the next idle poll.
+        """
+        with cls._lock:
+            if name in cls._consumers:
+                return
+            idle_poll_seconds = float(os.getenv("WORK_IDLE_POLL_SECONDS", "300"))
+            consumer = _Consumer(name, work, poll_seconds, max(poll_seconds, idle_poll_seconds), drain, busy, next_due)
+            cls._consumers[name] = consumer
+        cls._stop.clear()
+
+        runner = threading.Thread(target=cls._run_consumer, args=(consumer,), name=f"work-{name}", daemon=True)
+        consumer.threads.append(runner)
+        if collection_name:
+            watcher = threading.Thread(
+                target=cls._watch, args=(consumer, collection_name, pipeline), name=f"watch-{name}", daemon=True
+            )
+            consumer.threads.append(watcher)
+        for thread in consumer.threads:
+            thread.start()
+        # Pick up whatever is already waiting
+        consumer.event.set()
+
+    @staticmethod
+    def status_pipeline(field: str, value: str) -> list:
+        """Change stream filter for documents inserted with, or updated to, field == value."""
+        return [{
+            "$match": {
+                "$or": [
+                    {"operationType": {"$in": ["insert", "replace"]}, f"fullDocument.{field}": value},
+                    {"operationType": "update", f"updateDescription.updatedFields.{field}": value},
+                ]
+            }
+        }]
+
+    @classmethod
+    def notify(cls, name: str) -> None:
+        consumer = cls._consumers.get(name)
+        if consumer is not None:
+            consumer.stats["notified"] += 1
+            consumer.event.set()
+
+    @classmethod
+    def _run_consumer(cls, consumer: _Consumer) -> None:
+        while not cls._stop.is_set():
+            busy = False
+            if consumer.busy is not None:
+                try:
+                    busy = consumer.busy()
+                except Exception:  # pylint: disable=broad-except
+                    busy = False
+            timeout = consumer.idle_poll_seconds if consumer.stream_ok and not busy else consumer.poll_seconds
+            if consumer.next_due is not None:
+                try:
+                    due_in = consumer.next_due()
+                except Exception:  # pylint: disable=broad-except
+                    # Cannot tell when delayed work is due: fall back to the regular poll
+                    due_in = consumer.poll_seconds
+                if due_in is not None:
+                    # Wake when the earliest delayed entry becomes due (plus a second of slack)
+                    timeout = min(timeout, due_in + 1.0)
+            if not consumer.event.wait(timeout):
+                consumer.stats["fallbackPolls"] += 1
+            consumer.event.clear()
+            if cls._stop.is_set():
+                break
+            while not cls._stop.is_set():
+                consumer.stats["runs"] += 1
+                try:
+                    did_work = consumer.work()
+                except Exception as e:  # pylint: disable=broad-except
+                    consumer.stats["errors"] += 1
+                    print(f"[WorkNotifier] {consumer.name} failed: {e}")
+                    did_work = False
+                if not (did_work and consumer.drain):
+                    break
+
+    @classmethod
+    def _watch(cls, consumer: _Consumer, collection_name: str, pipeline: Optional[list]) -> None:
+        pipeline = pipeline or [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+        retry_seconds = 5.0
+        while not cls._stop.is_set():
+            try:
+                collection = MongoDB.get_database(os.getenv("DB_NAME"))[collection_name]
+                with collection.watch(pipeline, max_await_time_ms=1000) as stream:
+                    consumer.stream_ok = True
+                    retry_seconds = 5.0
+                    while not cls._stop.is_set() and stream.alive:
+                        if stream.try_next() is not None:
+                            consumer.stats["changeEvents"] += 1
+                            consumer.event.set()
+            except Exception as e:  # pylint: disable=broad-except
+                # Anything else (DB not configured yet, InvalidOperation, ...) would end the thread silently
+                if consumer.stream_ok or retry_seconds == 5.0:
+                    print(f"[WorkNotifier] Change stream on {collection_name} unavailable, polling every "
+                          f"{consumer.poll_seconds:.0f}s: {type(e).__name__}: {e}")
+                consumer.stream_ok = False
+                cls._stop.wait(retry_seconds)
+                retry_seconds = min(retry_seconds * 2, 300.0)
+            finally:
+                consumer.stream_ok = False
+
+    @classmethod
+    def stop(cls) -> None:
+        cls._stop.set()
+        with cls._lock:
+            for consumer in cls._consumers.values():
+                consumer.event.set()
+            cls._consumers.clear()
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._lock:
+            return {
+                name: {**consumer.stats, "changeStream": consumer.stream_ok}
+                for name, consumer in cls._consumers.items()
+            }
@@ -1,32 +1,54 @@
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Iterable, Optional
+from contextlib import asynccontextmanager
+from typing import Optional
 import pytz
 
-from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 
+from app.helpers.BrowserPool import BrowserPool
 from app.helpers.Calendar import Calendar as CalendarHelper
+from app.helpers.ClientRegistry import ClientRegistry
 from app.helpers.CourtDecisions import CourtDecisions
 from app.helpers.DashboardCompliance import DashboardCompliance
 from app.helpers.Database import MongoDB
+from app.helpers.EmbeddingCache import EmbeddingCache
 from app.helpers.GeneralNews import GeneralNewsHelper
+from app.helpers.HttpClient import HttpClient
+from app.helpers.JobExecutor import JobExecutor
+from app.helpers.QueueRetry import QueueRetry
+from app.helpers.QueueWorker import QueueWorker
+from app.helpers.SignatureSharing import SignatureSharing
+from app.helpers.WorkNotifier import WorkNotifier
+from app.helpers.LoopLagMonitor import LoopLagMonitor
 from app.helpers.News import News as NewsHelper
+from app.helpers.PageCache import PageCache
 from app.helpers.SERP import SERPHelper
+from app.helpers.Scheduler import Scheduler
 from app.helpers.Scraper import WebsiteScraper
 from app.middleware.Cors import add_cors_middleware
 from app.middleware.GlobalErrorHandling import GlobalErrorHandlingMiddleware
-from app.models.Dashboard import DashboardModel
+from app.models.JobRun import JobRunModel
 from app.models.Queue import QueueModel
-from app.schemas.Queue import QueueEntry, QueueStatus, QueueType
+from app.models.QueueLaneSettings import QueueLaneSettingsModel
+from app.schemas.Queue import QueueEntry, QueueLaneUpdate, QueueStatus, QueueType
 from app.services.Documents import DocumentService
 from app.services.WebsiteCrawl import WebsiteCrawlService
 
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background work starts here rather than as an import side effect
+    startup_event()
+    LoopLagMonitor.start()
+    yield
+    shutdown_event()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Source HR Engine",
     description="Source HR Engine - Long Running Scheduled Tasks",
     version="1.0.0",
@@ -38,62 +60,62 @@ app = FastAPI(
 app.add_middleware(GlobalErrorHandlingMiddleware)
 add_cors_middleware(app)
 
-scheduler = BackgroundScheduler(job_defaults={"coalesce": True, "max_instances": 1})
-
-
-def _iter_dashboards(limit: Optional[int] = None) -> Iterable[dict]:
-    model = DashboardModel()
-    return model.list_dashboards({}, 0, limit) if limit else model.list_dashboards()
-
-
-def run_news_job(limit: Optional[int] = None) -> None:
-    news_helper = NewsHelper()
-    for dashboard in _iter_dashboards(limit):
-        dashboard_id = str(dashboard.get("_id")) if isinstance(dashboard, dict) else str(getattr(dashboard, "id", ""))
-        if not dashboard_id:
-            continue
-        result = news_helper.retrieve_news(dashboard_id)
+def run_news_job(limit: Optional[int] = None) -> dict:
+    def handle(dashboard_id: str) -> dict:
+        result = SignatureSharing.run(
+            "news_job", dashboard_id,
+            lambda generated, source_id: NewsHelper().retrieve_news(dashboard_id, generated, source_id),
+        )
         success = result.get("success")
         items = len(result.get("data", []) or []) if success else 0
         print(f"[News] dashboard={dashboard_id} success={success} items={items}")
+        return result
 
+    return JobExecutor("news_job").run(handle, limit)
 
-def run_compliance_job(limit: Optional[int] = None) -> None:
-    court_decisions_helper = CourtDecisions()
-    for dashboard in _iter_dashboards(limit):
-        dashboard_id = str(dashboard.get("_id")) if isinstance(dashboard, dict) else str(getattr(dashboard, "id", ""))
-        if not dashboard_id:
-            continue
-        result = court_decisions_helper.retrieve_court_decisions(dashboard_id)
+
+def run_compliance_job(limit: Optional[int] = None) -> dict:
+    def handle(dashboard_id: str) -> dict:
+        result = SignatureSharing.run(
+            "compliance_job", dashboard_id,
+            lambda generated, source_id: CourtDecisions().retrieve_court_decisions(dashboard_id, generated, source_id),
+        )
         success = result.get("success")
         entries = len(result.get("data", []) or []) if success else 0
         print(f"[Compliance] dashboard={dashboard_id} success={success} entries={entries}")
+        return result
 
+    return JobExecutor("compliance_job").run(handle, limit)
 
-def run_calendar_job(limit: Optional[int] = None) -> None:
-    calendar_helper = CalendarHelper()
-    for dashboard in _iter_dashboards(limit):
-        dashboard_id = str(dashboard.get("_id")) if isinstance(dashboard, dict) else str(getattr(dashboard, "id", ""))
-        if not dashboard_id:
-            continue
-        result = calendar_helper.retrieve_calendar(dashboard_id)
+
+def run_calendar_job(limit: Optional[int] = None) -> dict:
+    def handle(dashboard_id: str) -> dict:
+        result = SignatureSharing.run(
+            "calendar_job", dashboard_id,
+            lambda generated, source_id: CalendarHelper().retrieve_calendar(dashboard_id, generated, source_id),
+        )
         success = result.get("success")
         events = len(result.get("data", []) or []) if success else 0
         print(f"[Calendar] dashboard={dashboard_id} success={success} events={events}")
+        return result
 
+    return JobExecutor("calendar_job").run(handle, limit)
 
-def run_law_changes_job(limit: Optional[int] = None) -> None:
+
+def run_law_changes_job(limit: Optional[int] = None) -> dict:
     """Run law changes retrieval for all dashboards."""
-    compliance_helper = DashboardCompliance()
-    for dashboard in _iter_dashboards(limit):
-        dashboard_id = str(dashboard.get("_id")) if isinstance(dashboard, dict) else str(getattr(dashboard, "id", ""))
-        if not dashboard_id:
-            continue
-        result = compliance_helper.retrieve_law_changes(dashboard_id)
+    def handle(dashboard_id: str) -> dict:
+        result = SignatureSharing.run(
+            "law_changes_job", dashboard_id,
+            lambda generated, source_id: DashboardCompliance().retrieve_law_changes(dashboard_id, generated, source_id),
+        )
         success = result.get("success")
         law_changes = result.get("data", [])
         items = len(law_changes) if success and law_changes else 0
         print(f"[LawChanges] dashboard={dashboard_id} success={success} items={items}")
+        return result
+
+    return JobExecutor("law_changes_job").run(handle, limit)
 
 
 def run_general_news_job() -> None:
@@ -116,11 +138,37 @@ def run_general_news_job() -> None:
 
 
 def _process_queue_entry(entry: QueueEntry) -> tuple[str, bool, Optional[str]]:
-    """Process a single queue entry. Returns (entry_id, success, error_message)."""
+    """Process a single leased queue entry. Returns (entry_id, success, error_message)."""
     queue_model = QueueModel()
     dashboard_id = entry.dashboardId
     entry_id = entry.id
-    print(f"[Queue] Processing entry {entry_id} type={entry.type} dashboard={dashboard_id}")
+    print(f"[Queue] Processing entry {entry_id} type={entry.type} dashboard={dashboard_id} attempt={entry.attempts}")
+
+    def finish(status: QueueStatus, error: Optional[str] = None, error_class: Optional[str] = None) -> None:
+        # Only the lease holder may finish the entry; a reaped lease belongs to someone else now
+        if not queue_model.mark_status(entry_id, status, error, worker_id=entry.workerId, error_class=error_class):
+            print(f"[Queue] Lease on entry {entry_id} was lost, not marking it {status.value}")
+
+    def fail(error_msg: str, exc: Optional[BaseException] = None) -> tuple:
+        error_class = QueueRetry.classify(exc if exc is not None else error_msg)
+        if QueueRetry.is_retryable(error_class) and entry.attempts < QueueRetry.max_attempts():
+            delay = QueueRetry.backoff_seconds(entry.attempts)
+            if queue_model.schedule_retry(entry_id, entry.workerId, error_msg, error_class, delay):
+                QueueRetry.record(error_class, "retried")
+                print(f"[Queue] Entry {entry_id} failed ({error_class}), retrying in {delay:.0f}s: {error_msg}")
+            else:
+                print(f"[Queue] Lease on entry {entry_id} was lost, not scheduling a retry")
+            return (str(entry_id), False, error_msg)
+
+        if QueueRetry.is_retryable(error_class):
+            finish(QueueStatus.DEAD_LETTER, error_msg, error_class)
+            QueueRetry.record(error_class, "dead_lettered")
+            print(f"[Queue] Dead-lettered entry {entry_id} after {entry.attempts} attempts ({error_class}): {error_msg}")
+        else:
+            finish(QueueStatus.FAILED, error_msg, error_class)
+            QueueRetry.record(error_class, "failed")
+            print(f"[Queue] Failed entry {entry_id} ({error_class}): {error_msg}")
+        return (str(entry_id), False, error_msg)
 
     try:
         if entry.type == QueueType.NEWS:
@@ -136,61 +184,29 @@ def _process_queue_entry(entry: QueueEntry) -> tuple[str, bool, Optional[str]]:
 
         # Check the return value - only mark COMPLETED if success is True
         if result and result.get("success"):
-            queue_model.mark_status(entry_id, QueueStatus.COMPLETED)
+            finish(QueueStatus.COMPLETED)
+            if entry.attempts > 1:
+                QueueRetry.record(entry.lastErrorClass or "unknown", "recovered")
             print(f"[Queue] Completed entry {entry_id}")
             return (str(entry_id), True, None)
         else:
-            # Retrieve function returned success=False, mark as FAILED
+            # Retrieve function returned success=False; retry or fail depending on the error
             error_msg = result.get("error", "Unknown error") if result else "No result returned"
-            queue_model.mark_status(entry_id, QueueStatus.FAILED, error_msg)
-            print(f"[Queue] Failed entry {entry_id}: {error_msg}")
-            return (str(entry_id), False, error_msg)
+            return fail(error_msg)
     except Exception as exc:  # pylint: disable=broad-except
-        queue_model.mark_status(entry_id, QueueStatus.FAILED, str(exc))
-        print(f"[Queue] Failed entry {entry_id}: {exc}")
-        return (str(entry_id), False, str(exc))
+        return fail(str(exc), exc)
 
 
 def run_queue_job() -> None:
-    """Process all pending queue entries in parallel without blocking the main thread."""
-    queue_model = QueueModel()
-    entries = queue_model.claim_all_pending()
-    
-    if not entries:
+    """Lease pending queue entries for this worker's free slots without blocking the scheduler."""
+    stats = QueueWorker.poll(_process_queue_entry)
+    if not stats["claimed"] and not stats["inFlight"]:
         print("[Queue] No pending entries")
         return
-
-    print(f"[Queue] Found {len(entries)} pending entries, processing in parallel...")
-    
-    # Process entries in parallel using ThreadPoolExecutor
-    # Using max_workers to limit concurrent processing (adjust as needed)
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        # Submit all tasks
-        future_to_entry = {
-            executor.submit(_process_queue_entry, entry): entry 
-            for entry in entries
-        }
-        
-        # Wait for all tasks to complete and collect results
-        completed = 0
-        failed = 0
-        for future in as_completed(future_to_entry):
-            entry = future_to_entry[future]
-            try:
-                entry_id, success, error = future.result()
-                if success:
-                    completed += 1
-                else:
-                    failed += 1
-            except Exception as exc:  # pylint: disable=broad-except
-                print(f"[Queue] Unexpected error processing entry {entry.id}: {exc}")
-                failed += 1
-    
-    print(f"[Queue] Batch processed {len(entries)} entr{'y' if len(entries) == 1 else 'ies'}: "
-          f"{completed} completed, {failed} failed")
+    print(f"[Queue] worker={stats['workerId']} claimed {stats['claimed']} {stats['claimedByLane']}, in flight {stats['inFlight']}, "
+          f"renewed {stats['renewed']} leases, requeued {stats['requeued']} expired")
 
 
-@app.on_event("startup")
 def startup_event():
     connection_string = os.getenv("MONGODB_CONNECTION_STRING")
     MongoDB.connect(connection_string)
@@ -217,50 +233,55 @@ def startup_event():
     print(f"Document processor: {doc_result.get('data', 'scheduled')}")
 
     # Regular news job - commented out for one-time run
-    scheduler.add_job(
+    Scheduler.add_job(
         run_news_job,
         trigger="interval",
         hours=23.5,
-        id="news_job",
-        replace_existing=True,
+        job_id="news_job",
+        executor="long",
     )
     
-    scheduler.add_job(
+    Scheduler.add_job(
         run_compliance_job,
         trigger="interval",
         hours=23.5,
-        id="compliance_job",
-        replace_existing=True,
+        job_id="compliance_job",
+        executor="long",
     )
-    scheduler.add_job(
+    Scheduler.add_job(
         run_calendar_job,
         trigger="interval",
         hours=23.5,
-        id="calendar_job",
-        replace_existing=True,
+        job_id="calendar_job",
+        executor="long",
     )
-    scheduler.add_job(
+    Scheduler.add_job(
         run_general_news_job,
         trigger="interval",
         hours=24,
-        id="general_news_job",
-        replace_existing=True,
+        job_id="general_news_job",
+        executor="long",
     )
-    scheduler.add_job(
+    # Queue entries start as soon as they are inserted (change stream) or a slot frees up;
+    # the one-minute poll remains as fallback and keeps leases of running entries renewed
+    WorkNotifier.register(
+        "queue",
         run_queue_job,
-        trigger="interval",
-        minutes=1,
-        id="queue_job",
-        replace_existing=True,
+        collection_name=QueueModel().collection.name,
+        pipeline=WorkNotifier.status_pipeline("status", QueueStatus.PENDING.value),
+        poll_seconds=60,
+        drain=False,
+        busy=QueueWorker.has_in_flight,
+        next_due=lambda: QueueModel().seconds_until_next_due(),
     )
-    scheduler.add_job(
+    Scheduler.add_job(
         run_law_changes_job,
         trigger="cron",
         day_of_week="sun",
         hour=0,
         minute=1,
-        id="law_changes_job",
-        replace_existing=True,
+        job_id="law_changes_job",
+        executor="long",
     )
     
     # Add specific operators scrape and map job to run on Tuesday at 3 PM
@@ -275,23 +296,27 @@ def startup_event():
     # )
     
     print("General news job scheduled to run every 24 hours")
-    print("Queue job scheduled to run every minute")
+    print("Queue worker listening for new entries (fallback poll every minute)")
     print("Law changes job scheduled to run every Sunday at midnight")
     print("Specific operators scrape and map job scheduled to run every Tuesday at 3 PM IST")
 
-    scheduler.start()
+    Scheduler.start()
 
     print("All scheduled tasks initialized successfully")
 
 
-
-@app.on_event("shutdown")
 def shutdown_event():
     print("Shutting down Source HR Engine...")
     try:
-        scheduler.shutdown(wait=False)
+        Scheduler.shutdown()
     except Exception:
         pass
+    WorkNotifier.stop()
+    QueueWorker.shutdown()
+    WebsiteCrawlService.shutdown_scraper()
+    BrowserPool.shutdown()
+    HttpClient.shutdown()
+    LoopLagMonitor.stop()
 
 
 @app.get("/")
@@ -314,6 +339,92 @@ def health_check():
     }
 
 
+@app.get("/clients")
+def client_stats():
+    """Pooled Pinecone/Azure OpenAI clients and how often they were reused"""
+    return ClientRegistry.get_stats()
+
+
+@app.get("/http-clients")
+def http_client_stats():
+    """Pooled Spider/BrightData HTTP clients: requests, retries, errors and latency"""
+    return HttpClient.get_stats()
+
+
+@app.get("/job-runs")
+def job_runs(job: Optional[str] = None, limit: int = 20):
+    """Most recent scheduled job run summaries"""
+    return JobRunModel().list_recent(job, limit)
+
+
+@app.get("/queue-worker")
+def queue_worker_stats():
+    """This worker's lanes: slots, priority, in-flight entries and wait/run time histograms"""
+    return QueueWorker.get_stats()
+
+
+@app.get("/queue/dead-letter")
+def dead_letter_entries(type: Optional[QueueType] = None, limit: int = 50):
+    """Dead-lettered queue entries (retries exhausted) with counts per error class"""
+    return QueueModel().list_dead_letter(type, limit)
+
+
+@app.post("/queue/dead-letter/{entry_id}/requeue")
+def requeue_dead_letter_entry(entry_id: str):
+    """Put a dead-lettered entry back in the queue with a fresh set of attempts"""
+    if not QueueModel().requeue_dead_letter(entry_id):
+        raise HTTPException(status_code=404, detail={"data": None, "error": "Dead-lettered entry not found", "success": False})
+    return {"success": True, "data": {"id": entry_id, "status": QueueStatus.PENDING.value}}
+
+
+@app.put("/queue-lanes/{lane}")
+def update_queue_lane(lane: QueueType, payload: QueueLaneUpdate):
+    """Change a lane's worker slots or priority at runtime; workers pick it up on their next poll"""
+    return QueueLaneSettingsModel().update(lane, workers=payload.workers, priority=payload.priority)
+
+
+@app.get("/scheduler/jobs")
+def scheduler_jobs():
+    """Scheduled jobs with executor, next run, last duration and overlap/misfire counts"""
+    return Scheduler.get_jobs_report()
+
+
+@app.get("/browser-pool")
+def browser_pool_stats():
+    """Persistent Playwright connections: size, utilisation, queue and recycle counts"""
+    return BrowserPool.get_stats()
+
+
+@app.get("/work-notifier")
+def work_notifier_stats():
+    """Wake-ups per background consumer: notifications, change events and fallback polls"""
+    return WorkNotifier.get_stats()
+
+
+@app.get("/loop-lag")
+def loop_lag_stats():
+    """Event loop wake-up lag; high values mean blocking work on the loop"""
+    return LoopLagMonitor.get_stats()
+
+
+@app.get("/signature-sharing")
+def signature_sharing_stats():
+    """Per-job counts of generated vs reused filter-signature results"""
+    return SignatureSharing.get_stats()
+
+
+@app.get("/page-cache")
+def page_cache_stats():
+    """Crawl-time page cache: pages stored, scrape-phase fetches avoided and bytes reused"""
+    return PageCache.get_stats()
+
+
+@app.get("/embedding-cache")
+def embedding_cache_stats():
+    """Query embedding cache hit/miss counts"""
+    return EmbeddingCache.get_stats()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,144 @@
+import os
+import re
+import hashlib
+import unicodedata
+from typing import Optional, List, Dict
+from datetime import datetime
+from app.helpers.Database import MongoDB
+from app.schemas.ContentFingerprint import ContentFingerprintSchema
+
+
+class ContentFingerprintModel:
+    """
+    Persistent index of what has already been ingested into each namespace:
+    one "source" entry per page/file URL and one "chunk" entry per extracted
+    event chunk, both keyed by a hash of their normalized text.
+    """
+
+    def __init__(self, db_name=os.getenv('DB_NAME'), collection_name="ContentFingerprints"):
+        self.collection = MongoDB.get_database(db_name)[collection_name]
+        self.collection.create_index([("namespace", 1), ("kind", 1), ("key", 1)], unique=True)
+        self.collection.create_index([("namespace", 1), ("vectorDocIds", 1)])
+        self.collection.create_index([("namespace", 1), ("kind", 1), ("contentHash", 1)])
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """
+        sha256 of the text after unicode, case and whitespace normalization, so
+        cosmetic re-renders of the same page hash identically.
+        """
+        normalized = unicodedata.normalize("NFKC", text or "").lower()
+        normalized = re.sub(r"\s+", " ", normalized).strip()
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get_source(self, namespace: str, key: str) -> Optional[ContentFingerprintSchema]:
+        document = self.collection.find_one({"namespace": namespace, "kind": "source", "key": key})
+        if document:
+            return ContentFingerprintSchema(**document)
+        return None
+
+    def save_source(self, namespace: str, key: str, content_hash: str, results: List[dict]) -> None:
+        """
+        Record the hash and ingestion result of a page/file.
+        """
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"namespace": namespace, "kind": "source", "key": key},
+            {
+                "$set": {
+                    "contentHash": content_hash,
+                    "results": results,
+                    "vectorDocIds": [item["uuid"] for item in results],
+                    "updatedAt": now,
+                },
+                "$setOnInsert": {"createdAt": now},
+            },
+            upsert=True
+        )
+
+    def get_chunk_vectors(self, namespace: str, source_key: str, hashes: List[str]) -> Dict[str, str]:
+        """
+        Map of chunk hash -> vector id for the hashes source_key already ingested
+        in namespace. Only vectors owned by source_key alone are returned: their
+        metadata (pageUrl/file_url) names this source, so reusing them keeps
+        citations correct.
+        """
+        if not hashes:
+            return {}
+        cursor = self.collection.find(
+            {
+                "namespace": namespace,
+                "kind": "chunk",
+                "contentHash": {"$in": list(set(hashes))},
+                "sourceKeys": [source_key],
+            },
+            {"contentHash": 1, "vectorDocIds": 1}
+        )
+        return {doc["contentHash"]: doc["vectorDocIds"][0] for doc in cursor if doc.get("vectorDocIds")}
+
+    @staticmethod
+    def chunk_key(source_key: str, chunk_hash: str) -> str:
+        return f"{chunk_hash}@{source_key}"
+
+    def save_chunks(self, namespace: str, source_key: str, chunk_vectors: Dict[str, str]) -> None:
+        """
+        Record newly ingested chunks (hash -> vector id) for source_key. Chunks are
+        tracked per source, so identical text in two sources gets two vectors.
+        """
+        now = datetime.utcnow()
+        for chunk_hash, vector_id in chunk_vectors.items():
+            self.collection.update_one(
+                {"namespace": namespace, "kind": "chunk", "key": self.chunk_key(source_key, chunk_hash)},
+                {
+                    "$set": {
+                        "contentHash": chunk_hash,
+                        "vectorDocIds": [vector_id],
+                        "sourceKeys": [source_key],
+                        "updatedAt": now,
+                    },
+                    "$setOnInsert": {"createdAt": now},
+                },
+                upsert=True
+            )
+
+    def release_chunks(self, namespace: str, source_key: str, vector_ids: List[str]) -> List[str]:
+        """
+        Drop source_key's reference to the given chunk vectors and return the
+        vector ids no other source references any more (safe to delete). Chunk
+        entries written before chunks were tracked per source may still be shared.
+        """
+        if not vector_ids:
+            return []
+        self.collection.update_many(
+            {"namespace": namespace, "kind": "chunk", "vectorDocIds": {"$in": vector_ids}},
+            {"$pull": {"sourceKeys": source_key}}
+        )
+        orphaned = []
+        for doc in self.collection.find(
+            {"namespace": namespace, "kind": "chunk", "vectorDocIds": {"$in": vector_ids}},
+            {"vectorDocIds": 1, "sourceKeys": 1}
+        ):
+            if not doc.get("sourceKeys"):
+                orphaned.extend(doc["vectorDocIds"])
+        # Vectors ingested before fingerprinting existed have no chunk entry and belong to this source only
+        tracked = set(self.collection.distinct(
+            "vectorDocIds", {"namespace": namespace, "kind": "chunk", "vectorDocIds": {"$in": vector_ids}}
+        ))
+        orphaned.extend(vid for vid in vector_ids if vid not in tracked)
+        return orphaned
+
+    def forget_source(self, namespace: str, key: str) -> None:
+        self.collection.delete_one({"namespace": namespace, "kind": "source", "key": key})
+
+    def forget_vectors(self, namespace: str, vector_ids: List[str]) -> int:
+        """
+        Remove every fingerprint pointing at deleted vectors so the content is ingested again next time.
+        """
+        if not vector_ids:
+            return 0
+        result = self.collection.delete_many({"namespace": namespace, "vectorDocIds": {"$in": vector_ids}})
+        return result.deleted_count
+
+    def forget_namespace(self, namespace: str) -> int:
+        result = self.collection.delete_many({"namespace": namespace})
+        return result.deleted_count
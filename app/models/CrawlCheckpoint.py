@@ -0,0 +1,72 @@
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from app.helpers.Database import MongoDB
+
+
+class CrawlCheckpointModel:
+    """
+    Frontier of a running crawl, one document per crawl key: the URLs already
+    crawled, the ones that failed and the (url, depth) pairs still queued. A crawl
+    that dies keeps status "running", so it can be resumed where it stopped.
+    Checkpoints expire CRAWL_CHECKPOINT_TTL_DAYS after their last update.
+    """
+
+    def __init__(self, db_name: Optional[str] = None, collection_name: str = "CrawlCheckpoints") -> None:
+        database_name = db_name or os.getenv("DB_NAME")
+        if not database_name:
+            raise ValueError("DB_NAME environment variable is not set")
+        database = MongoDB.get_database(database_name)
+        self.collection = database[collection_name]
+        self.collection.create_index("key", unique=True)
+        self.collection.create_index([("status", 1), ("updatedAt", 1)])
+        ttl_days = int(os.getenv("CRAWL_CHECKPOINT_TTL_DAYS", "7"))
+        self.collection.create_index("expiresAt", expireAfterSeconds=0)
+        self.ttl = timedelta(days=ttl_days)
+
+    def load(self, key: str, root_url: str) -> Optional[dict]:
+        """Return the running checkpoint of key for root_url, if any."""
+        return self.collection.find_one({"key": key, "rootUrl": root_url, "status": "running"}, {"_id": 0})
+
+    def save(self, key: str, root_url: str, visited: List[str], failed: List[str], frontier: Dict[str, int]) -> None:
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"key": key},
+            {
+                "$set": {
+                    "rootUrl": root_url,
+                    "status": "running",
+                    "visited": visited,
+                    "failed": failed,
+                    "frontier": [{"url": url, "depth": depth} for url, depth in frontier.items()],
+                    "updatedAt": now,
+                    "expiresAt": now + self.ttl,
+                },
+                "$setOnInsert": {"startedAt": now},
+            },
+            upsert=True,
+        )
+
+    def complete(self, key: str) -> None:
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"key": key},
+            {"$set": {"status": "completed", "frontier": [], "updatedAt": now, "completedAt": now}},
+        )
+
+    def claim_stale(self, stale_seconds: float) -> Optional[str]:
+        """
+        Atomically take over a running checkpoint that has not been saved for
+        stale_seconds (its crawler died). Returns its key.
+        """
+        now = datetime.utcnow()
+        doc = self.collection.find_one_and_update(
+            {"status": "running", "updatedAt": {"$lt": now - timedelta(seconds=stale_seconds)}},
+            {"$set": {"updatedAt": now}, "$inc": {"resumes": 1}},
+            projection={"key": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc["key"] if doc else None
@@ -1,7 +1,7 @@
 from copy import deepcopy
 from dataclasses import fields
 import os
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from bson import ObjectId
 from datetime import datetime
 from app.helpers.Database import MongoDB
@@ -24,6 +24,26 @@ class DashboardModel:
         return list(cursor)
     
    
+    def iter_dashboards(self, filters: dict = None, fields: List[str] = None, batch_size: int = 200,
+                        start_after: ObjectId = None) -> Iterator[dict]:
+        """
+        Stream every matching dashboard in _id order, fetching batch_size documents per
+        query by _id range so memory stays flat and no skip/limit ceiling applies.
+        Pass start_after to resume after a given dashboard _id.
+        """
+        projection = {field: 1 for field in fields} if fields else None
+        last_id = start_after
+        while True:
+            query = dict(filters or {})
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            batch = list(self.collection.find(query, projection).sort("_id", 1).limit(batch_size))
+            for document in batch:
+                yield document
+            if len(batch) < batch_size:
+                return
+            last_id = batch[-1]["_id"]
+
     def get_dashboards_with_projection(self, filters: dict = {}, skip: int = 0, limit: int = 100, fields: List[str] = None) -> List[dict]:
         if fields is None:
             projection = {}
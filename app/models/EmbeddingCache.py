@@ -0,0 +1,36 @@
+import os
+from datetime import datetime
+from typing import Optional, List
+from app.helpers.Database import MongoDB
+
+
+class EmbeddingCacheModel:
+    def __init__(self, db_name=os.getenv('DB_NAME'), collection_name="EmbeddingCache"):
+        self.collection = MongoDB.get_database(db_name)[collection_name]
+        self.collection.create_index("key", unique=True)
+        # Entries not read for EMBEDDING_CACHE_TTL_DAYS are expired by Mongo
+        ttl_days = int(os.getenv("EMBEDDING_CACHE_TTL_DAYS", "30"))
+        self.collection.create_index("lastUsedAt", expireAfterSeconds=ttl_days * 86400)
+
+    def get_vector(self, key: str) -> Optional[List[float]]:
+        """Return the cached embedding for key and refresh its last use"""
+        document = self.collection.find_one_and_update(
+            {"key": key},
+            {"$set": {"lastUsedAt": datetime.utcnow()}},
+            projection={"vector": 1}
+        )
+        if document:
+            return document["vector"]
+        return None
+
+    def save_vector(self, key: str, model: str, vector: List[float]):
+        """Insert or replace the embedding stored for key"""
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"key": key},
+            {
+                "$set": {"model": model, "vector": vector, "lastUsedAt": now},
+                "$setOnInsert": {"createdAt": now}
+            },
+            upsert=True
+        )
@@ -0,0 +1,67 @@
+import os
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+
+from app.helpers.Database import MongoDB
+
+
+class JobCheckpointModel:
+    """
+    Progress of the per-dashboard scheduled jobs, one document per job name.
+    A run that dies before complete() leaves status "running" and the last
+    finished dashboard id, so the next run resumes after it.
+    """
+
+    def __init__(self, db_name: Optional[str] = None, collection_name: str = "JobCheckpoints") -> None:
+        database_name = db_name or os.getenv("DB_NAME")
+        if not database_name:
+            raise ValueError("DB_NAME environment variable is not set")
+        database = MongoDB.get_database(database_name)
+        self.collection = database[collection_name]
+        self.collection.create_index("job", unique=True)
+
+    def begin(self, job: str) -> Optional[ObjectId]:
+        """
+        Start or resume a run of job. Returns the dashboard _id to resume after,
+        or None when the previous run completed.
+        """
+        now = datetime.utcnow()
+        doc = self.collection.find_one({"job": job})
+        if doc and doc.get("status") == "running" and doc.get("lastDashboardId"):
+            self.collection.update_one({"job": job}, {"$set": {"updatedAt": now}, "$inc": {"resumes": 1}})
+            return doc["lastDashboardId"]
+
+        self.collection.update_one(
+            {"job": job},
+            {
+                "$set": {
+                    "status": "running",
+                    "lastDashboardId": None,
+                    "processed": 0,
+                    "resumes": 0,
+                    "startedAt": now,
+                    "updatedAt": now,
+                    "completedAt": None,
+                }
+            },
+            upsert=True,
+        )
+        return None
+
+    def advance(self, job: str, dashboard_id: ObjectId, processed: int = 1) -> None:
+        self.collection.update_one(
+            {"job": job},
+            {"$set": {"lastDashboardId": dashboard_id, "updatedAt": datetime.utcnow()}, "$inc": {"processed": processed}},
+        )
+
+    def complete(self, job: str) -> None:
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"job": job},
+            {"$set": {"status": "completed", "updatedAt": now, "completedAt": now}},
+        )
+
+    def get(self, job: str) -> Optional[dict]:
+        return self.collection.find_one({"job": job}, {"_id": 0})
@@ -0,0 +1,25 @@
+import os
+from typing import List, Optional
+
+from app.helpers.Database import MongoDB
+
+
+class JobRunModel:
+    """Summaries of scheduled job runs (counts and per-dashboard timings)."""
+
+    def __init__(self, db_name: Optional[str] = None, collection_name: str = "JobRuns") -> None:
+        database_name = db_name or os.getenv("DB_NAME")
+        if not database_name:
+            raise ValueError("DB_NAME environment variable is not set")
+        database = MongoDB.get_database(database_name)
+        self.collection = database[collection_name]
+        self.collection.create_index([("job", 1), ("startedAt", -1)])
+
+    def create(self, summary: dict):
+        result = self.collection.insert_one(dict(summary))
+        return result.inserted_id
+
+    def list_recent(self, job: Optional[str] = None, limit: int = 20) -> List[dict]:
+        filters = {"job": job} if job else {}
+        cursor = self.collection.find(filters, {"_id": 0}).sort("startedAt", -1).limit(limit)
+        return list(cursor)
@@ -0,0 +1,46 @@
+import os
+from datetime import datetime
+from typing import Optional
+
+from bson.binary import Binary
+
+from app.helpers.Database import MongoDB
+
+
+class PageCacheModel:
+    """
+    zlib-compressed HTML of pages fetched while crawling, keyed by a hash of the
+    URL, so the scrape phase can ingest a page without fetching it again.
+    Entries are expired by Mongo PAGE_CACHE_TTL_HOURS after the fetch.
+    """
+
+    def __init__(self, db_name: Optional[str] = None, collection_name: str = "PageCache") -> None:
+        database_name = db_name or os.getenv("DB_NAME")
+        if not database_name:
+            raise ValueError("DB_NAME environment variable is not set")
+        database = MongoDB.get_database(database_name)
+        self.collection = database[collection_name]
+        self.collection.create_index("key", unique=True)
+        ttl_hours = int(os.getenv("PAGE_CACHE_TTL_HOURS", "72"))
+        self.collection.create_index("fetchedAt", expireAfterSeconds=ttl_hours * 3600)
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.collection.find_one({"key": key}, {"_id": 0, "html": 1, "fetchedAt": 1})
+
+    def save(self, key: str, url: str, compressed_html: bytes, size: int) -> None:
+        self.collection.update_one(
+            {"key": key},
+            {
+                "$set": {
+                    "url": url,
+                    "html": Binary(compressed_html),
+                    "size": size,
+                    "compressedSize": len(compressed_html),
+                    "fetchedAt": datetime.utcnow(),
+                }
+            },
+            upsert=True,
+        )
+
+    def delete(self, key: str) -> None:
+        self.collection.delete_one({"key": key})
@@ -1,12 +1,15 @@
 import os
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 from bson import ObjectId
 from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from app.helpers.Database import MongoDB
-from app.schemas.Queue import QueueEntry, QueueStatus, QueueType
+from app.helpers.WorkNotifier import WorkNotifier
+from app.models.Dashboard import DashboardModel
+from app.schemas.Queue import QueueEntry, QueuePriority, QueueStatus, QueueType
 
 
 class QueueModel:
@@ -17,62 +20,337 @@ class QueueModel:
         database = MongoDB.get_database(database_name)
         self.collection = database[collection_name]
         self.collection.create_index([("status", 1), ("createdAt", 1)])
+        self.collection.create_index([("status", 1), ("leaseExpiresAt", 1)])
+        self.collection.create_index([("status", 1), ("type", 1), ("priority", 1), ("createdAt", 1)])
+        self.collection.create_index([("dashboardId", 1), ("type", 1), ("status", 1)])
+        self.collection.create_index("coalescedInto", sparse=True)
+        self.collection.create_index(
+            "activeKey", unique=True, partialFilterExpression={"activeKey": {"$type": "string"}}
+        )
+
+    @staticmethod
+    def active_key(dashboard_id: str, queue_type: QueueType) -> str:
+        return f"{dashboard_id}:{QueueType(queue_type).value}"
+
+    def _tenant_of(self, dashboard_id: str) -> Optional[str]:
+        try:
+            dashboard = DashboardModel().collection.find_one({"_id": ObjectId(dashboard_id)}, {"userId": 1})
+        except Exception:  # pylint: disable=broad-except
+            return None
+        return str(dashboard["userId"]) if dashboard and dashboard.get("userId") else None
 
-    def enqueue(self, dashboard_id: str, queue_type: QueueType) -> QueueEntry:
-        entry = QueueEntry(dashboardId=dashboard_id, type=queue_type)
+    def enqueue(
+        self,
+        dashboard_id: str,
+        queue_type: QueueType,
+        priority: QueuePriority = QueuePriority.INTERACTIVE,
+        tenant_id: Optional[str] = None,
+    ) -> QueueEntry:
+        """
+        Add an entry. If a pending or processing entry already exists for the same
+        dashboard and type, the new entry is attached to it and finishes with its result.
+        Bulk refreshes should pass QueuePriority.BULK so user-triggered ones go first.
+        """
+        key = self.active_key(dashboard_id, queue_type)
+        tenant_id = tenant_id or self._tenant_of(dashboard_id)
+        fields = {"priority": QueuePriority(priority).value, "tenantId": tenant_id}
+        for _ in range(3):
+            entry = QueueEntry(dashboardId=dashboard_id, type=queue_type, activeKey=key, **fields)
+            try:
+                result = self.collection.insert_one(entry.model_dump(by_alias=True))
+                entry.id = result.inserted_id
+                WorkNotifier.notify("queue")
+                return entry
+            except DuplicateKeyError:
+                active = self.collection.find_one({"activeKey": key}, {"_id": 1, "status": 1})
+                if active is None:
+                    # The active entry finished in between; try to become the active one
+                    continue
+                duplicate = QueueEntry(
+                    dashboardId=dashboard_id,
+                    type=queue_type,
+                    **fields,
+                    status=QueueStatus(active["status"]),
+                    coalescedInto=active["_id"],
+                )
+                result = self.collection.insert_one(duplicate.model_dump(by_alias=True))
+                duplicate.id = result.inserted_id
+                print(f"[Queue] Coalesced entry {duplicate.id} into active entry {active['_id']}")
+                return duplicate
+
+        entry = QueueEntry(dashboardId=dashboard_id, type=queue_type, **fields)
         result = self.collection.insert_one(entry.model_dump(by_alias=True))
         entry.id = result.inserted_id
+        WorkNotifier.notify("queue")
         return entry
 
-    def claim_next(self) -> Optional[QueueEntry]:
+    @staticmethod
+    def tenant_key(entry) -> str:
+        """Fairness key: the dashboard owner, or the dashboard itself for entries without one."""
+        if isinstance(entry, QueueEntry):
+            return entry.tenantId or entry.dashboardId
+        return entry.get("tenantId") or entry.get("dashboardId")
+
+    def _lease(self, entry_id: ObjectId, worker_id: str, lease_seconds: float) -> Optional[QueueEntry]:
+        """Atomically lease one pending entry to worker_id; None if another worker got it first."""
+        now = datetime.utcnow()
         doc = self.collection.find_one_and_update(
-            {"status": QueueStatus.PENDING.value},
+            {"_id": entry_id, "status": QueueStatus.PENDING.value, "coalescedInto": None},
             {
                 "$set": {
                     "status": QueueStatus.PROCESSING.value,
-                    "updatedAt": datetime.utcnow(),
-                }
+                    "workerId": worker_id,
+                    "leaseExpiresAt": now + timedelta(seconds=lease_seconds),
+                    "claimedAt": now,
+                    "updatedAt": now,
+                },
+                "$inc": {"attempts": 1},
             },
-            sort=[("createdAt", 1)],
             return_document=ReturnDocument.AFTER,
         )
         if doc:
             return QueueEntry(**doc)
         return None
 
-    def claim_all_pending(self) -> List[QueueEntry]:
-        """Claim all pending entries and mark them as processing."""
-        # First, find all pending entries
-        pending_docs = list(self.collection.find(
-            {"status": QueueStatus.PENDING.value}
-        ).sort("createdAt", 1))
-        
-        if not pending_docs:
+    @staticmethod
+    def _fair_order(candidates: List[dict], tenant_load: Dict[str, int]) -> List[dict]:
+        """
+        Order candidates so priority always wins, and within a priority the tenant
+        with the fewest running entries goes next (oldest entry breaks ties). A
+        burst from one tenant is thereby interleaved with everyone else's work.
+        """
+        queues: Dict[str, List[dict]] = {}
+        for candidate in candidates:
+            queues.setdefault(QueueModel.tenant_key(candidate), []).append(candidate)
+        load = dict(tenant_load)
+        ordered = []
+        while queues:
+            tenant = min(
+                queues,
+                key=lambda t: (queues[t][0].get("priority") or 0, load.get(t, 0), queues[t][0]["createdAt"]),
+            )
+            ordered.append(queues[tenant].pop(0))
+            load[tenant] = load.get(tenant, 0) + 1
+            if not queues[tenant]:
+                del queues[tenant]
+        return ordered
+
+    def claim(
+        self,
+        worker_id: str,
+        lease_seconds: float,
+        queue_type: QueueType,
+        limit: int,
+        tenant_load: Optional[Dict[str, int]] = None,
+    ) -> List[QueueEntry]:
+        """
+        Lease up to limit pending entries of one lane (queue_type), by priority and
+        fair share between tenants (tenant_load: entries already running per tenant).
+        Claimed entries that duplicate a run already in progress are attached to it
+        instead of being returned.
+        """
+        if limit <= 0:
             return []
-        
-        # Extract IDs and mark them as processing
-        entry_ids = [doc["_id"] for doc in pending_docs]
+        scan = max(limit * 5, int(os.getenv("QUEUE_CLAIM_SCAN", "100")))
+        candidates = list(
+            self.collection.find(
+                {
+                    "status": QueueStatus.PENDING.value,
+                    "coalescedInto": None,
+                    "type": QueueType(queue_type).value,
+                    # Entries waiting out a retry backoff are not due yet
+                    "$or": [{"nextAttemptAt": None}, {"nextAttemptAt": {"$lte": datetime.utcnow()}}],
+                },
+                {"_id": 1, "dashboardId": 1, "tenantId": 1, "priority": 1, "createdAt": 1},
+            ).sort([("priority", 1), ("createdAt", 1)]).limit(scan)
+        )
+        entries = []
+        for candidate in self._fair_order(candidates, tenant_load or {}):
+            if len(entries) >= limit:
+                break
+            entry = self._lease(candidate["_id"], worker_id, lease_seconds)
+            if entry is None or self._coalesce_claimed(entry):
+                continue
+            entries.append(entry)
+        return entries
+
+    def _coalesce_claimed(self, entry: QueueEntry) -> bool:
+        """
+        Claim-time coalescing for entries inserted without enqueue(). If an older run
+        for the same dashboard and type is processing, attach entry to it and return
+        True. Otherwise attach the pending duplicates of entry to entry.
+        """
+        now = datetime.utcnow()
+        same_pair = {"dashboardId": entry.dashboardId, "type": entry.type.value, "coalescedInto": None}
+        # Ties resolve towards the oldest entry so two workers never wait on each other
+        running = self.collection.find_one(
+            {**same_pair, "status": QueueStatus.PROCESSING.value, "_id": {"$lt": entry.id}},
+            {"_id": 1},
+            sort=[("_id", 1)],
+        )
+        if running:
+            self.collection.update_one(
+                {"_id": entry.id, "workerId": entry.workerId},
+                {
+                    "$set": {"coalescedInto": running["_id"], "updatedAt": now},
+                    "$unset": {"workerId": "", "leaseExpiresAt": "", "activeKey": ""},
+                },
+            )
+            print(f"[Queue] Coalesced entry {entry.id} into running entry {running['_id']}")
+            return True
+
+        # Duplicates attached at enqueue time follow the run's status
         self.collection.update_many(
-            {"_id": {"$in": entry_ids}},
+            {"coalescedInto": entry.id, "status": QueueStatus.PENDING.value},
+            {"$set": {"status": QueueStatus.PROCESSING.value, "updatedAt": now}},
+        )
+        attached = self.collection.update_many(
+            {**same_pair, "status": QueueStatus.PENDING.value, "_id": {"$ne": entry.id}, "activeKey": None},
+            {"$set": {"status": QueueStatus.PROCESSING.value, "coalescedInto": entry.id, "updatedAt": now}},
+        )
+        if attached.modified_count:
+            print(f"[Queue] Coalesced {attached.modified_count} pending duplicate(s) into entry {entry.id}")
+        return False
+
+    def renew_leases(self, worker_id: str, entry_ids: List[ObjectId], lease_seconds: float) -> int:
+        """Extend the leases worker_id still holds. Returns how many were renewed."""
+        if not entry_ids:
+            return 0
+        now = datetime.utcnow()
+        result = self.collection.update_many(
             {
-                "$set": {
-                    "status": QueueStatus.PROCESSING.value,
-                    "updatedAt": datetime.utcnow(),
-                }
-            }
+                "_id": {"$in": [ObjectId(entry_id) for entry_id in entry_ids]},
+                "status": QueueStatus.PROCESSING.value,
+                "workerId": worker_id,
+            },
+            {"$set": {"leaseExpiresAt": now + timedelta(seconds=lease_seconds), "updatedAt": now}},
+        )
+        return result.modified_count
+
+    def requeue_expired(self, lease_seconds: float, max_attempts: Optional[int] = None) -> int:
+        """
+        Return entries whose lease expired (crashed or stalled worker) to PENDING.
+        Entries left PROCESSING without a lease are requeued once they are older
+        than one lease period. Entries that already used max_attempts are
+        dead-lettered instead, so an entry that keeps killing its worker stops.
+        """
+        now = datetime.utcnow()
+        expired = {
+            "status": QueueStatus.PROCESSING.value,
+            "coalescedInto": None,
+            "$or": [
+                {"leaseExpiresAt": {"$lt": now}},
+                {"leaseExpiresAt": None, "updatedAt": {"$lt": now - timedelta(seconds=lease_seconds)}},
+            ],
+        }
+        if max_attempts:
+            for doc in self.collection.find({**expired, "attempts": {"$gte": max_attempts}}, {"_id": 1}):
+                self.mark_status(
+                    doc["_id"], QueueStatus.DEAD_LETTER, "Lease expired on the last attempt", error_class="lease_expired"
+                )
+        result = self.collection.update_many(
+            expired,
+            {
+                "$set": {"status": QueueStatus.PENDING.value, "updatedAt": now},
+                "$unset": {"workerId": "", "leaseExpiresAt": ""},
+                "$inc": {"reclaims": 1},
+            },
         )
-        
-        # Return the entries
-        return [QueueEntry(**doc) for doc in pending_docs]
+        return result.modified_count
 
-    def mark_status(self, entry_id: ObjectId, status: QueueStatus, error: Optional[str] = None) -> None:
+    def mark_status(
+        self,
+        entry_id: ObjectId,
+        status: QueueStatus,
+        error: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        error_class: Optional[str] = None,
+    ) -> bool:
+        """
+        Set the entry's status. With worker_id the update only applies while that
+        worker still holds the lease; returns False if the lease was lost.
+        """
         update_set = {
             "status": status.value,
             "updatedAt": datetime.utcnow(),
         }
+        finished = status in (QueueStatus.COMPLETED, QueueStatus.FAILED, QueueStatus.DEAD_LETTER)
+        unset = {"leaseExpiresAt": "", "activeKey": ""} if finished else {}
         if error is not None:
             update_set["error"] = error
-            update = {"$set": update_set}
         else:
-            update = {"$set": update_set, "$unset": {"error": ""}}
-        self.collection.update_one({"_id": ObjectId(entry_id)}, update, upsert=False)
+            unset["error"] = ""
+        if error_class is not None:
+            update_set["lastErrorClass"] = error_class
+        update = {"$set": update_set}
+        if unset:
+            update["$unset"] = unset
+        filters = {"_id": ObjectId(entry_id)}
+        if worker_id is not None:
+            filters["workerId"] = worker_id
+        result = self.collection.update_one(filters, update, upsert=False)
+        if result.matched_count and finished:
+            # Duplicates attached to this run finish with its result
+            self.collection.update_many({"coalescedInto": ObjectId(entry_id)}, update)
+        return result.matched_count > 0
+
+    def schedule_retry(
+        self, entry_id: ObjectId, worker_id: str, error: str, error_class: str, delay_seconds: float
+    ) -> bool:
+        """Return a leased entry to PENDING, due again after delay_seconds. False if the lease was lost."""
+        now = datetime.utcnow()
+        result = self.collection.update_one(
+            {"_id": ObjectId(entry_id), "workerId": worker_id},
+            {
+                "$set": {
+                    "status": QueueStatus.PENDING.value,
+                    "nextAttemptAt": now + timedelta(seconds=delay_seconds),
+                    "error": error,
+                    "lastErrorClass": error_class,
+                    "updatedAt": now,
+                },
+                "$unset": {"workerId": "", "leaseExpiresAt": ""},
+            },
+        )
+        return result.matched_count > 0
+
+    def seconds_until_next_due(self) -> Optional[float]:
+        """Seconds until the earliest delayed (retrying) pending entry is due, None if there is none."""
+        doc = self.collection.find_one(
+            {"status": QueueStatus.PENDING.value, "coalescedInto": None, "nextAttemptAt": {"$gt": datetime.utcnow()}},
+            {"nextAttemptAt": 1},
+            sort=[("nextAttemptAt", 1)],
+        )
+        if not doc:
+            return None
+        return max(0.0, (doc["nextAttemptAt"] - datetime.utcnow()).total_seconds())
+
+    def list_dead_letter(self, queue_type: Optional[QueueType] = None, limit: int = 50) -> dict:
+        filters = {"status": QueueStatus.DEAD_LETTER.value}
+        if queue_type:
+            filters["type"] = QueueType(queue_type).value
+        entries = []
+        for doc in self.collection.find(filters).sort("updatedAt", -1).limit(limit):
+            doc["_id"] = str(doc["_id"])
+            if doc.get("coalescedInto"):
+                doc["coalescedInto"] = str(doc["coalescedInto"])
+            entries.append(doc)
+        by_class = {
+            row["_id"] or "unknown": row["count"]
+            for row in self.collection.aggregate([
+                {"$match": filters},
+                {"$group": {"_id": "$lastErrorClass", "count": {"$sum": 1}}},
+            ])
+        }
+        return {"total": sum(by_class.values()), "byErrorClass": by_class, "entries": entries}
+
+    def requeue_dead_letter(self, entry_id: str) -> bool:
+        """Give a dead-lettered entry a fresh set of attempts."""
+        result = self.collection.update_one(
+            {"_id": ObjectId(entry_id), "status": QueueStatus.DEAD_LETTER.value},
+            {
+                "$set": {"status": QueueStatus.PENDING.value, "attempts": 0, "updatedAt": datetime.utcnow()},
+                "$unset": {"nextAttemptAt": "", "workerId": "", "leaseExpiresAt": ""},
+            },
+        )
+        return result.modified_count > 0
@@ -0,0 +1,34 @@
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.helpers.Database import MongoDB
+from app.schemas.Queue import QueueType
+
+
+class QueueLaneSettingsModel:
+    """
+    Runtime overrides for the queue lanes (one document per QueueType). Workers
+    re-read them on every poll, so pool sizes and lane priorities can be changed
+    without a restart. Missing values fall back to the environment defaults.
+    """
+
+    def __init__(self, db_name: Optional[str] = None, collection_name: str = "QueueLaneSettings") -> None:
+        database_name = db_name or os.getenv("DB_NAME")
+        if not database_name:
+            raise ValueError("DB_NAME environment variable is not set")
+        database = MongoDB.get_database(database_name)
+        self.collection = database[collection_name]
+        self.collection.create_index("lane", unique=True)
+
+    def get_all(self) -> Dict[str, dict]:
+        return {doc["lane"]: doc for doc in self.collection.find({}, {"_id": 0})}
+
+    def update(self, lane: QueueType, workers: Optional[int] = None, priority: Optional[int] = None) -> dict:
+        update_set = {"updatedAt": datetime.utcnow()}
+        if workers is not None:
+            update_set["workers"] = workers
+        if priority is not None:
+            update_set["priority"] = priority
+        self.collection.update_one({"lane": QueueType(lane).value}, {"$set": update_set}, upsert=True)
+        return self.collection.find_one({"lane": QueueType(lane).value}, {"_id": 0})
@@ -0,0 +1,43 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.helpers.Database import MongoDB
+
+
+class SignatureResultModel:
+    """
+    Latest generated items per (job, filter signature), so dashboards sharing the
+    same locations/industries/topics reuse one generation instead of each running
+    the LLM pipeline. Entries expire after SIGNATURE_RESULT_TTL_DAYS.
+    """
+
+    def __init__(self, db_name: Optional[str] = None, collection_name: str = "SignatureResults") -> None:
+        database_name = db_name or os.getenv("DB_NAME")
+        if not database_name:
+            raise ValueError("DB_NAME environment variable is not set")
+        database = MongoDB.get_database(database_name)
+        self.collection = database[collection_name]
+        self.collection.create_index([("job", 1), ("signature", 1)], unique=True)
+        ttl_days = int(os.getenv("SIGNATURE_RESULT_TTL_DAYS", "7"))
+        self.collection.create_index("generatedAt", expireAfterSeconds=ttl_days * 86400)
+
+    def get_fresh(self, job: str, signature: str, max_age_hours: float) -> Optional[dict]:
+        cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+        return self.collection.find_one(
+            {"job": job, "signature": signature, "generatedAt": {"$gte": cutoff}},
+            {"_id": 0},
+        )
+
+    def save(self, job: str, signature: str, source_dashboard_id: str, items: List[dict]) -> None:
+        self.collection.update_one(
+            {"job": job, "signature": signature},
+            {
+                "$set": {
+                    "sourceDashboardId": source_dashboard_id,
+                    "items": items,
+                    "generatedAt": datetime.utcnow(),
+                }
+            },
+            upsert=True,
+        )
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional, Literal, Dict
+from datetime import datetime
+from bson import ObjectId
+from app.schemas.PyObjectId import PyObjectId
+
+
+class ContentFingerprintSchema(BaseModel):
+    id: Optional[PyObjectId] = Field(default_factory=ObjectId, alias="_id")
+    namespace: str = Field(..., description="Pinecone namespace the content was ingested into")
+    kind: Literal["source", "chunk"] = Field(..., description="source: a whole page/file, chunk: one extracted event chunk")
+    key: str = Field(..., description="Page URL / file URL for sources, '<content hash>@<source>' for chunks")
+    contentHash: str = Field(..., description="sha256 of the normalized text")
+    vectorDocIds: List[str] = Field(default_factory=list, description="Vector ids holding this content")
+    results: Optional[List[Dict]] = Field(default=None, description="Ingestion result ({uuid, metadata}) returned for a source")
+    sourceKeys: Optional[List[str]] = Field(default=None, description="Source referencing a chunk (only ever its owner since chunks are per source); emptied when the source releases it, which orphans the vector")
+    createdAt: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    updatedAt: Optional[datetime] = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
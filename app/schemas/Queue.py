@@ -14,11 +14,18 @@ class QueueType(str, Enum):
     COMPLIANCE = "COMPLIANCE"
     LAW_CHANGE = "LAW_CHANGE"
 
+class QueuePriority(int, Enum):
+    # Lower values are claimed first within a lane
+    INTERACTIVE = 0
+    BULK = 10
+
 class QueueStatus(str, Enum):
     PENDING = "PENDING"
     PROCESSING = "PROCESSING"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
+    # Retryable failures that used up QUEUE_MAX_ATTEMPTS
+    DEAD_LETTER = "DEAD_LETTER"
 
 
 class QueueEntry(BaseModel):
@@ -26,9 +33,23 @@ class QueueEntry(BaseModel):
     dashboardId: str
     type: QueueType
     status: QueueStatus = QueueStatus.PENDING
+    priority: int = QueuePriority.INTERACTIVE.value
+    # Owner of the dashboard (its userId); entries are shared fairly between tenants
+    tenantId: Optional[str] = None
+    claimedAt: Optional[datetime] = None
+    attempts: int = 0
+    nextAttemptAt: Optional[datetime] = None
+    lastErrorClass: Optional[str] = None
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
     error: Optional[str] = None
+    workerId: Optional[str] = None
+    leaseExpiresAt: Optional[datetime] = None
+    reclaims: int = 0
+    # Set on duplicates of an active (dashboardId, type) entry; they finish with its result
+    coalescedInto: Optional[PyObjectId] = None
+    # "<dashboardId>:<type>" while this entry is the active run for that pair (unique)
+    activeKey: Optional[str] = None
 
     class Config:
         allow_population_by_field_name = True
@@ -39,6 +60,12 @@ class QueueEntry(BaseModel):
 class QueueCreateRequest(BaseModel):
     dashboardId: str
     type: QueueType
+    priority: QueuePriority = QueuePriority.INTERACTIVE
+
+
+class QueueLaneUpdate(BaseModel):
+    workers: Optional[int] = Field(default=None, ge=0, description="Concurrent entries of this type per worker; 0 pauses the lane")
+    priority: Optional[int] = Field(default=None, description="Lanes with lower values are served first")
 
 
 class QueueResponse(BaseModel):
@@ -18,6 +18,14 @@ class CrawlableURL(BaseModel):
     ingestionStatus:str="PENDING"
     ingestedOn: Optional[datetime]=None
     vectorDocIds:List[Dict]=[]
+    claimedAt: Optional[datetime]=None
+    # Change detection for incremental re-crawls
+    etag: Optional[str]=None
+    lastModified: Optional[str]=None
+    contentHash: Optional[str]=None
+    lastCheckedOn: Optional[datetime]=None
+    # etag/lastModified seen on a changed page, stored once its re-scrape is ingested
+    pendingValidators: Optional[Dict]=None
 
 
 
@@ -14,6 +14,7 @@ from dotenv import load_dotenv
 from app.models.ChatSession import ChatSessionModel
 from datetime import datetime
 import json
+import asyncio
 
 load_dotenv()
 
@@ -34,7 +35,7 @@ class ChatService:
             random_hex = Utils.generate_hex_string(6)
             file_name = f"{text[:15].replace(' ','-')}-{random_hex}"
             
-            vector_db_helper = VectorDB(knowledge_base.vectorDatabase.namespace)
+            vector_db_helper = VectorDB.get(knowledge_base.vectorDatabase.namespace)
             vector_docs_ids = vector_db_helper.enterTextKnowledge(text,file_name)
             if vector_docs_ids == None:
                 return {
@@ -85,7 +86,9 @@ class ChatService:
             return None
         
     async def chat_stream(self, question, session_id):
-        sessions = self.model.get_session_with_projection(
+        # Mongo and client setup are blocking; keep them off the event loop shared by all streams
+        sessions = await asyncio.to_thread(
+            self.model.get_session_with_projection,
             filters={"_id": ObjectId(session_id)},
             fields=["messages"]
         )
@@ -97,7 +100,7 @@ class ChatService:
         session = sessions[0]
         session["messages"] = session.get("messages", [])[-5:]
 
-        ai_chat = AIChat("source-hr-knowledge")
+        ai_chat = await asyncio.to_thread(AIChat, "source-hr-knowledge")
         full_response = ""
         final_citations = []
 
@@ -134,8 +137,8 @@ class ChatService:
                 "createdAt": datetime.utcnow()
             }
 
-            success_user = self.model.add_message(session_id, user_message)
-            success_assistant = self.model.add_message(session_id, assistant_message)
+            success_user = await asyncio.to_thread(self.model.add_message, session_id, user_message)
+            success_assistant = await asyncio.to_thread(self.model.add_message, session_id, assistant_message)
 
             if not success_user or not success_assistant:
                 yield {"error": "Failed to save messages"}
@@ -403,7 +406,7 @@ class ChatService:
             }   
             
     async def regenerate_response_stream(self, session_id: str, ai_message_id: str):
-        session = self.model.get_session({"_id": ObjectId(session_id)})
+        session = await asyncio.to_thread(self.model.get_session, {"_id": ObjectId(session_id)})
         if not session:
             yield {"error": "Session not found"}
             return
@@ -427,7 +430,7 @@ class ChatService:
         session_context = session.copy()
         session_context["messages"] = messages[-5:]
 
-        ai_chat = AIChat("source-hr-knowledge")
+        ai_chat = await asyncio.to_thread(AIChat, "source-hr-knowledge")
         full_response = ""
         citations = []
 
@@ -445,7 +448,9 @@ class ChatService:
                     "message": content,
                     "citations": []
                 }
-            self.model.update_message_with_message_id(session_id, ai_message_id, full_response, citations)
+            await asyncio.to_thread(
+                self.model.update_message_with_message_id, session_id, ai_message_id, full_response, citations
+            )
 
             # Yield the messageId at the end
             yield {
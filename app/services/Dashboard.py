@@ -22,7 +22,7 @@ from app.helpers.News import News
 class DashboardService:
     def __init__(self):
         self.model = DashboardModel()
-        self.vector_store = VectorDB("source-hr-knowledge")
+        self.vector_store = VectorDB.get("source-hr-knowledge")
         self.industries_model = IndustriesModel()
         self.topics_model = TopicsModel()
         self.locations_model=LocationsModel()
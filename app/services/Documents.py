@@ -5,17 +5,11 @@ from app.helpers.Utilities import Utils
 from app.helpers.VectorDB import VectorDB
 from app.helpers.AzureStorage import AzureBlobUploader
 from app.helpers.AIChat import AIChat
+from app.helpers.WorkNotifier import WorkNotifier
 from pydantic import ValidationError
 from bson import ObjectId
 import os
 from dotenv import load_dotenv
-from apscheduler.schedulers.background import BackgroundScheduler
-scheduler = BackgroundScheduler(job_defaults={
-    'coalesce': True,
-    'max_instances': 1,
-    'misfire_grace_time': 30,
-})
-scheduler.start()
 
 
 load_dotenv()
@@ -31,8 +25,9 @@ class DocumentService:
     def delete_document(self,document_id):
         try:
             document = self.document_model.get_document({'_id':ObjectId(document_id)})
-            vector_db_helper = VectorDB("source-hr-knowledge")
-            resp = vector_db_helper.deleteDocument(document.vectorDocId)
+            vector_db_helper = VectorDB.get("source-hr-knowledge")
+            # Vectors still used by other documents/pages are kept
+            resp = vector_db_helper.retire_source(document.originalSource, document.vectorDocId)
             data = False
             if resp:
                 data = self.document_model.delete_document(document_id)
@@ -94,6 +89,7 @@ class DocumentService:
             "vectorDocId": []
         })
         if data:
+            WorkNotifier.notify("documents")
             return {
                 "success": True,
                 "data": "Document uploaded and queued for processing.",
@@ -174,7 +170,7 @@ class DocumentService:
             doc_id = pending_doc["_id"]
             file_path = pending_doc["originalSource"]
             file_name = pending_doc["name"]
-            vector_db_helper = VectorDB("source-hr-knowledge")
+            vector_db_helper = VectorDB.get("source-hr-knowledge")
             try:
                 source_type = pending_doc.get("sourceType", "")
                 vector_docs_results = vector_db_helper.enterDocumentToKnowledge(file_path, file_name, source_type)
@@ -192,16 +188,13 @@ class DocumentService:
             
     def schedule_processor(self):
         try:
-            # Schedule the document processor to run every 10 seconds (adjust as needed)
-            scheduler.add_job(
-                self.process_pending_documents,
-                'interval',
-                seconds=10,
-                id='document_processor_job',
-                max_instances=1,
-                coalesce=True,
-                misfire_grace_time=30,
-                replace_existing=True,
+            # Process documents as soon as they are queued; polling every 10 seconds is only the fallback
+            WorkNotifier.register(
+                "documents",
+                lambda: self.process_pending_documents().get("data") is not None,
+                collection_name=self.document_model.collection.name,
+                pipeline=WorkNotifier.status_pipeline("status", "PENDING"),
+                poll_seconds=10,
             )
             return {"success": True, "data": "Document processor scheduled successfully"}
         except Exception as e:
@@ -10,6 +10,7 @@ from openai import AzureOpenAI
 from openevals.llm import create_llm_as_judge
 from openevals.prompts import RAG_GROUNDEDNESS_PROMPT,HALLUCINATION_PROMPT,CONCISENESS_PROMPT,CORRECTNESS_PROMPT,RAG_RETRIEVAL_RELEVANCE_PROMPT
 from app.helpers.AIChat import AIChat
+from app.helpers.ClientRegistry import ClientRegistry
 from app.models.Evaluation import EvaluationModel
 from app.models.EvaluationDataset import EvaluationDatasetModel
 from app.schemas.Evaluation import EvaluationScores
@@ -21,14 +22,7 @@ class EvaluationService:
         self.evaluation_model = EvaluationModel()
         self.client = Client()
         self.evaluation_dataset_model=EvaluationDatasetModel()
-        self.llm = AzureChatOpenAI(
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            azure_deployment=os.getenv('gpt-4o-mini'),
-            api_key=os.getenv('AZURE_OPENAI_KEY'),
-            api_version="2024-12-01-preview",
-            model_name="gpt-4o-mini",
-            openai_api_type="azure",
-        )
+        self.llm = ClientRegistry.get_chat_llm()
          
 
         
@@ -1,25 +1,30 @@
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
+import os
 from fastapi import HTTPException
 from bson import ObjectId
-from typing import Optional
+from pymongo import UpdateOne
+from typing import Dict, Optional
+from app.models.ContentFingerprint import ContentFingerprintModel
+from app.models.CrawlCheckpoint import CrawlCheckpointModel
 from app.models.WebsiteCrawl import WebsiteCrawlModel
 from app.schemas.WebsiteCrawl import WebsiteCrawlSchema, WebsiteCrawlCreate
 from app.helpers.Scraper import WebsiteScraper
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from threading import Event
+from urllib.parse import urlparse
 from app.helpers.VectorDB import VectorDB 
-scheduler = BackgroundScheduler(job_defaults={
-    'coalesce': True,
-    'max_instances': 1,
-    'misfire_grace_time': 30,
-})
-scheduler.start()
+from app.helpers.Scheduler import Scheduler
+from app.helpers.WorkNotifier import WorkNotifier
 stop_event = Event()
 from app.helpers.Crawler import hybrid_crawl_logic_async
+from app.helpers.IncrementalCrawl import IncrementalCrawl
+from app.helpers.PageCache import PageCache
 from app.schemas.WebsiteCrawl import CrawlableURL
 from datetime import datetime
 
@@ -27,16 +32,28 @@ from datetime import datetime
 
 
 class WebsiteCrawlService:
+    # Pending-URL scraper shared by every instance in the process: a bounded pool
+    # of SCRAPER_WORKERS threads with at most SCRAPER_PER_DOMAIN scrapes per host
+    _scrape_lock = threading.Lock()
+    _scrape_executor: Optional[ThreadPoolExecutor] = None
+    # (crawl id, url) -> (domain, future)
+    _scrapes_in_flight: Dict[tuple, tuple] = {}
+    # crawl id -> counts, durations and recent completion times of this process's scrapes
+    _scrape_progress: Dict[str, dict] = {}
+    _last_stale_release = 0.0
+
     def __init__(self):
         self.model = WebsiteCrawlModel()
+        self.checkpoint_model = CrawlCheckpointModel()
         # self.crawler=WebsiteCrawler()
         self.scraper=WebsiteScraper()
-        self.vector_db=VectorDB("source-hr-knowledge")
+        self.vector_db=VectorDB.get("source-hr-knowledge")
 
     def create_website_crawl(self, data: WebsiteCrawlCreate) -> dict:
         try:
             crawl_data = data.model_dump()
             inserted_id = self.model.create_website_crawl(crawl_data)
+            WorkNotifier.notify("crawler")
             return {
                 "success": True,
                 "data": inserted_id
@@ -51,7 +68,7 @@ class WebsiteCrawlService:
     def list_website_crawls(self, page: int = 1, limit: int = 10, filters: dict = {}) -> dict:
         try:
             # Get scheduled jobs and map by job ID for quick lookup
-            jobs = scheduler.get_jobs()
+            jobs = Scheduler.get_jobs()
             job_map = {job.id: str(job.next_run_time) for job in jobs}
 
             # Fetch paginated crawls from DB
@@ -204,7 +221,7 @@ class WebsiteCrawlService:
     def list_jobs(self):
         try:
             print("asjdasjdahsj")
-            jobs = scheduler.get_jobs()
+            jobs = Scheduler.get_jobs()
             job_list = []
             for job in jobs:
                 job_list.append({
@@ -225,9 +242,6 @@ class WebsiteCrawlService:
             website = self.model.collection.find_one({"_id": ObjectId(crawl_id)})
             if not website:
                 return {"success": False, "data": None, "error": "Crawl entry not found"}
-            # Check if crawlable URLs already exist
-            if website.get("listOfCrawlableUrls") and len(website["listOfCrawlableUrls"]) > 0:
-                return {"success": False, "data": website["listOfCrawlableUrls"], "error": "Already crawlable urls present"}
             self.model.collection.update_one(
                 {"_id": ObjectId(crawl_id)},
                 {
@@ -236,11 +250,15 @@ class WebsiteCrawlService:
                     }
                 }
             )
+            # Crawled before: only pick up new, changed and removed pages
+            if website.get("listOfCrawlableUrls") and len(website["listOfCrawlableUrls"]) > 0:
+                return await self.recrawl_incremental(website)
             url = website.get("urlOfWebsite")
             max_depth = website.get("maxDepth", 1)
             max_urls = website.get("maxUrls", 50)
 
-            discovered_urls = await hybrid_crawl_logic_async(url, max_depth, max_urls)
+            # Checkpointed under the crawl id so an interrupted crawl resumes
+            discovered_urls = await hybrid_crawl_logic_async(url, max_depth, max_urls, checkpoint_key=crawl_id)
 
             crawlable_urls = [
                 CrawlableURL(
@@ -261,6 +279,7 @@ class WebsiteCrawlService:
                     "lastCrawled": datetime.utcnow()
                 }
             )
+            WorkNotifier.notify("scraper")
             print(f"Successfully crawled all urls from {url}")
 
             return {"success": True, "data": crawlable_urls}
@@ -268,28 +287,176 @@ class WebsiteCrawlService:
             return {"success": False, "data": str(e), "error": "Unable to fetch crawlable URLs"}
         
         
+    async def recrawl_incremental(self, website: dict) -> dict:
+        """
+        Re-crawl a website that already has crawlable URLs. Seeds come from its
+        sitemaps/feeds (falling back to a link crawl); pages the sitemap reports
+        as unmodified since ingestion are skipped, the rest get a conditional GET.
+        New and changed pages, and pages whose last ingestion failed, are set back
+        to PENDING for the scraper; pages that are gone are dropped and their
+        vectors retired. A changed page's new validators are only stored once its
+        re-scrape is ingested (see scrape_website_and_ingest_data).
+        """
+        crawl_id = website["_id"]
+        url = website.get("urlOfWebsite")
+        max_depth = website.get("maxDepth", 1)
+        max_urls = website.get("maxUrls", 50)
+        try:
+            seeds = await IncrementalCrawl.discover_seeds(url, max_urls)
+            seeded_from = "sitemap"
+            if not seeds:
+                discovered = await hybrid_crawl_logic_async(url, max_depth, max_urls, checkpoint_key=str(crawl_id))
+                seeds = {u: None for u in discovered}
+                seeded_from = "links"
+
+            now = datetime.utcnow()
+            existing = {entry["url"]: entry for entry in website.get("listOfCrawlableUrls", [])}
+            stats = {"new": 0, "changed": 0, "unchanged": 0, "removed": 0, "retiredVectors": 0}
+            updates, to_check = [], []
+            for page_url, entry in existing.items():
+                if entry.get("crawlStatus") in ("PENDING", "IN_PROGRESS"):
+                    continue
+                if entry.get("ingestionStatus") != "SUCCESS":
+                    # Its stored validators may describe content that never made it into the index
+                    stats["changed"] += 1
+                    updates.append(self._rescrape_update(crawl_id, page_url, now))
+                    continue
+                modified = seeds.get(page_url)
+                ingested = entry.get("ingestedOn")
+                if modified and ingested and modified <= ingested:
+                    stats["unchanged"] += 1
+                    updates.append(UpdateOne(
+                        {"_id": crawl_id, "listOfCrawlableUrls.url": page_url},
+                        {"$set": {"listOfCrawlableUrls.$.lastCheckedOn": now}},
+                    ))
+                else:
+                    to_check.append(entry)
+
+            checks = await asyncio.gather(*(IncrementalCrawl.check_page(entry) for entry in to_check))
+            removed = []
+            for entry, check in zip(to_check, checks):
+                if check["status"] == "gone":
+                    removed.append(entry["url"])
+                    # Vectors other pages still reference are kept; only this page's own go
+                    try:
+                        stats["retiredVectors"] += len(self.vector_db.release_vectors(entry["url"], entry.get("vectorDocIds") or []))
+                        self.vector_db.fingerprint_model.forget_source(self.vector_db.namespace, entry["url"])
+                    except Exception as e:
+                        print(f"Unable to retire vectors of {entry['url']}: {e}")
+                elif check["status"] == "unchanged":
+                    stats["unchanged"] += 1
+                    validators = {
+                        f"listOfCrawlableUrls.$.{field}": check[field]
+                        for field in ("etag", "lastModified", "contentHash") if field in check
+                    }
+                    updates.append(UpdateOne(
+                        {"_id": crawl_id, "listOfCrawlableUrls.url": entry["url"]},
+                        {"$set": {**validators, "listOfCrawlableUrls.$.lastCheckedOn": now}},
+                    ))
+                else:
+                    # Changed, or the site would not answer directly: re-scrape through the usual path
+                    stats["changed"] += 1
+                    pending = None
+                    if check["status"] == "changed":
+                        pending = {"etag": check.get("etag"), "lastModified": check.get("lastModified")}
+                    else:
+                        # No fresh copy was fetched, so a cached crawl-time copy would be stale
+                        PageCache.evict(entry["url"])
+                    updates.append(self._rescrape_update(crawl_id, entry["url"], now, pending))
+            stats["removed"] = len(removed)
+            if removed:
+                updates.append(UpdateOne(
+                    {"_id": crawl_id}, {"$pull": {"listOfCrawlableUrls": {"url": {"$in": removed}}}}
+                ))
+
+            room = max(0, max_urls - (len(existing) - len(removed)))
+            new_urls = [u for u in seeds if u not in existing][:room]
+            stats["new"] = len(new_urls)
+            if new_urls:
+                updates.append(UpdateOne(
+                    {"_id": crawl_id},
+                    {"$push": {"listOfCrawlableUrls": {"$each": [
+                        CrawlableURL(url=u, crawlStatus="PENDING", updatedOn=now, ingestionStatus="PENDING").dict()
+                        for u in new_urls
+                    ]}}},
+                ))
+
+            updates.append(UpdateOne(
+                {"_id": crawl_id},
+                {"$set": {
+                    "crawlStatus": "SUCCESS",
+                    "lastCrawled": now,
+                    "lastRecrawl": {**stats, "seededFrom": seeded_from, "at": now},
+                }},
+            ))
+            self.model.collection.bulk_write(updates, ordered=True)
+            if stats["new"] or stats["changed"]:
+                WorkNotifier.notify("scraper")
+            print(f"Incremental re-crawl of {url}: {stats}")
+            return {"success": True, "data": stats}
+        except Exception as e:
+            self.model.collection.update_one({"_id": crawl_id}, {"$set": {"crawlStatus": "FAILED"}})
+            return {"success": False, "data": str(e), "error": "Unable to re-crawl website"}
+
+    @staticmethod
+    def _rescrape_update(crawl_id, page_url: str, now: datetime, pending_validators: Optional[dict] = None) -> UpdateOne:
+        return UpdateOne(
+            {"_id": crawl_id, "listOfCrawlableUrls.url": page_url},
+            {"$set": {
+                "listOfCrawlableUrls.$.crawlStatus": "PENDING",
+                "listOfCrawlableUrls.$.ingestionStatus": "PENDING",
+                "listOfCrawlableUrls.$.pendingValidators": pending_validators,
+                "listOfCrawlableUrls.$.updatedOn": now,
+                "listOfCrawlableUrls.$.lastCheckedOn": now,
+            }},
+        )
+
+    def queue_due_recrawls(self) -> int:
+        """Set crawls last crawled more than CRAWL_RECRAWL_DAYS ago back to PENDING."""
+        cutoff = datetime.utcnow() - timedelta(days=float(os.getenv("CRAWL_RECRAWL_DAYS", "7")))
+        result = self.model.collection.update_many(
+            {"crawlStatus": {"$in": ["SUCCESS", "FAILED"]}, "lastCrawled": {"$lt": cutoff}},
+            {"$set": {"crawlStatus": "PENDING"}},
+        )
+        if result.modified_count:
+            WorkNotifier.notify("crawler")
+        return result.modified_count
+
     def scrape_website_and_ingest_data(self,url:str,crawl_id):
         try:
             print(f"scrapping url: {url} from crawler {crawl_id}")
-            scraped_content = self.scraper.scrape_url(url)
+            scraped_content = self.scraper.scrape_url(url, use_cache=True)
             website_doc = self.model.collection.find_one({"_id": ObjectId(crawl_id)}, {"sourceType": 1})
             source_type = website_doc.get("sourceType", "") if website_doc else ""
             if scraped_content["success"]:
                 markdown_content = scraped_content["data"]["markdown"]
+                if scraped_content["data"].get("cached"):
+                    # Served from the crawl-time page cache instead of a second fetch
+                    self.model.collection.update_one({"_id": ObjectId(crawl_id)}, {"$inc": {"fetchesAvoided": 1}})
                 results=self.vector_db.enterWebsiteToKnowledge(
                     page_content=markdown_content,
                     url=url,
                     source_type=source_type
                 )
                 if results:
+                    entry = self.model.collection.find_one(
+                        {"_id": ObjectId(crawl_id)},
+                        {"listOfCrawlableUrls": {"$elemMatch": {"url": url}}},
+                    )
+                    pending = ((entry or {}).get("listOfCrawlableUrls") or [{}])[0].get("pendingValidators") or {}
+                    # Validators from the re-crawl check only count once the content they describe is indexed
+                    validators = {f"listOfCrawlableUrls.$.{field}": value for field, value in pending.items()}
                     self.model.collection.update_one(
                         {"_id":ObjectId(crawl_id),"listOfCrawlableUrls.url": url},
                         {
                             "$set": {
+                                **validators,
                                 "listOfCrawlableUrls.$.ingestionStatus": "SUCCESS",
                                 "listOfCrawlableUrls.$.ingestedOn": datetime.utcnow(),
                                 "listOfCrawlableUrls.$.crawlStatus": "SUCCESS",
-                                "listOfCrawlableUrls.$.vectorDocIds": results
+                                "listOfCrawlableUrls.$.vectorDocIds": results,
+                                "listOfCrawlableUrls.$.contentHash": ContentFingerprintModel.content_hash(markdown_content),
+                                "listOfCrawlableUrls.$.pendingValidators": None,
                             }
                         }
                     )
@@ -326,35 +493,161 @@ class WebsiteCrawlService:
         
         
         
+    @staticmethod
+    def scraper_workers() -> int:
+        return max(1, int(os.getenv("SCRAPER_WORKERS", "8")))
+
+    @staticmethod
+    def scraper_per_domain() -> int:
+        return max(1, int(os.getenv("SCRAPER_PER_DOMAIN", "2")))
+
+    @classmethod
+    def scraper_busy(cls) -> bool:
+        with cls._scrape_lock:
+            return any(not future.done() for _, future in cls._scrapes_in_flight.values())
+
+    @classmethod
+    def shutdown_scraper(cls) -> None:
+        # Running scrapes are not awaited; their claims are released once they go stale
+        with cls._scrape_lock:
+            if cls._scrape_executor is not None:
+                cls._scrape_executor.shutdown(wait=False, cancel_futures=True)
+                cls._scrape_executor = None
+            cls._scrapes_in_flight.clear()
+
+    def _release_stale_claims(self) -> None:
+        """
+        Put URLs claimed longer than SCRAPER_CLAIM_TIMEOUT_MINUTES ago (dead worker),
+        or left IN_PROGRESS without a claimedAt by older scrapers, back to PENDING.
+        Scrapes still running in this process are skipped and their claims
+        refreshed, so other pods do not release them either.
+        """
+        with self._scrape_lock:
+            if time.monotonic() - WebsiteCrawlService._last_stale_release < 60:
+                return
+            WebsiteCrawlService._last_stale_release = time.monotonic()
+            running: Dict[str, list] = {}
+            for (crawl_id, url), (_, future) in self._scrapes_in_flight.items():
+                if not future.done():
+                    running.setdefault(crawl_id, []).append(url)
+
+        now = datetime.utcnow()
+        for crawl_id, urls in running.items():
+            self.model.collection.update_one(
+                {"_id": ObjectId(crawl_id)},
+                {"$set": {"listOfCrawlableUrls.$[live].claimedAt": now}},
+                array_filters=[{"live.url": {"$in": urls}, "live.crawlStatus": "IN_PROGRESS"}],
+            )
+
+        cutoff = now - timedelta(minutes=float(os.getenv("SCRAPER_CLAIM_TIMEOUT_MINUTES", "30")))
+        stale = {
+            "crawlStatus": "IN_PROGRESS",
+            "$or": [{"claimedAt": {"$lt": cutoff}}, {"claimedAt": None}],
+        }
+        stale_filter = {
+            "stale.crawlStatus": "IN_PROGRESS",
+            "$or": [{"stale.claimedAt": {"$lt": cutoff}}, {"stale.claimedAt": None}],
+        }
+        release = {"$set": {"listOfCrawlableUrls.$[stale].crawlStatus": "PENDING"}}
+        running_ids = [ObjectId(crawl_id) for crawl_id in running]
+        self.model.collection.update_many(
+            {"_id": {"$nin": running_ids}, "listOfCrawlableUrls": {"$elemMatch": stale}},
+            release,
+            array_filters=[stale_filter],
+        )
+        for crawl_id, urls in running.items():
+            self.model.collection.update_one(
+                {"_id": ObjectId(crawl_id), "listOfCrawlableUrls": {"$elemMatch": stale}},
+                release,
+                array_filters=[{**stale_filter, "stale.url": {"$nin": urls}}],
+            )
+
+    def _claim_pending_url(self, skip_crawl_ids: list) -> Optional[dict]:
+        # Atomically find and claim a pending URL
+        return self.model.collection.find_one_and_update(
+            {"_id": {"$nin": skip_crawl_ids}, "listOfCrawlableUrls.crawlStatus": "PENDING"},
+            {"$set": {
+                "listOfCrawlableUrls.$.crawlStatus": "IN_PROGRESS",
+                "listOfCrawlableUrls.$.claimedAt": datetime.utcnow(),
+            }},
+            projection={"urlOfWebsite": 1, "listOfCrawlableUrls.$": 1}
+        )
+
+    def _scrape_claimed(self, url: str, crawl_id) -> None:
+        started = time.monotonic()
+        try:
+            self.scrape_website_and_ingest_data(url, crawl_id)
+        finally:
+            with self._scrape_lock:
+                progress = self._scrape_progress.setdefault(
+                    str(crawl_id), {"scraped": 0, "seconds": 0.0, "recent": deque(maxlen=200)}
+                )
+                progress["scraped"] += 1
+                progress["seconds"] += time.monotonic() - started
+                progress["recent"].append(time.monotonic())
+            # A worker slot just freed up
+            WorkNotifier.notify("scraper")
+
     def fetch_and_scrape_pending_urls(self):
+        """
+        Claim as many pending URLs, across crawls, as there are free worker slots
+        and scrape them on the shared pool without waiting. Crawls whose host is
+        already at its per-domain cap are skipped for this round.
+        """
         try:
-            # Atomically find and claim a pending URL
-            pending_url_doc = self.model.collection.find_one_and_update(
-                {"listOfCrawlableUrls.crawlStatus": "PENDING"},
-                {"$set": {"listOfCrawlableUrls.$.crawlStatus": "IN_PROGRESS"}},
-                projection={"urlOfWebsite": 1, "listOfCrawlableUrls.$": 1}
-            )
-            crawl_id=pending_url_doc["_id"]
-            if not pending_url_doc or "listOfCrawlableUrls" not in pending_url_doc:
-                return  # No pending URLs left
+            self._release_stale_claims()
+            with self._scrape_lock:
+                for key, (_, future) in list(self._scrapes_in_flight.items()):
+                    if future.done():
+                        del self._scrapes_in_flight[key]
+                if WebsiteCrawlService._scrape_executor is None:
+                    WebsiteCrawlService._scrape_executor = ThreadPoolExecutor(
+                        max_workers=self.scraper_workers(), thread_name_prefix="scraper"
+                    )
+                free_slots = self.scraper_workers() - len(self._scrapes_in_flight)
+                domain_load: Dict[str, int] = {}
+                for domain, _ in self._scrapes_in_flight.values():
+                    domain_load[domain] = domain_load.get(domain, 0) + 1
+
+            claimed, skip_crawl_ids = [], []
+            while free_slots > 0:
+                pending_url_doc = self._claim_pending_url(skip_crawl_ids)
+                if not pending_url_doc or "listOfCrawlableUrls" not in pending_url_doc:
+                    break
+                crawl_id = pending_url_doc["_id"]
+                url = pending_url_doc["listOfCrawlableUrls"][0]["url"]
+                domain = urlparse(url).netloc.lower()
+                if domain_load.get(domain, 0) >= self.scraper_per_domain():
+                    # Host is at its cap: hand the URL back and leave this crawl for a later round
+                    self.model.collection.update_one(
+                        {"_id": crawl_id, "listOfCrawlableUrls.url": url},
+                        {"$set": {"listOfCrawlableUrls.$.crawlStatus": "PENDING"}}
+                    )
+                    skip_crawl_ids.append(crawl_id)
+                    continue
+                domain_load[domain] = domain_load.get(domain, 0) + 1
+                free_slots -= 1
+                with self._scrape_lock:
+                    self._scrapes_in_flight[(str(crawl_id), url)] = (
+                        domain, self._scrape_executor.submit(self._scrape_claimed, url, crawl_id)
+                    )
+                claimed.append(url)
 
-            url = pending_url_doc["listOfCrawlableUrls"][0]["url"]
-            self.scrape_website_and_ingest_data(url,crawl_id)
+            if not claimed and not skip_crawl_ids and free_slots > 0:
+                return {"success": False, "error": "No pending URLs left", "data": None}
+            return {"success": True, "error": None, "data": claimed}
         except Exception as e:
             return {"success": False, "error": str(e), "data": None}
         
     def schedule_scraper(self):
         try:
-            # Schedule the scraper to run every 5 minutes
-            scheduler.add_job(
-                self.fetch_and_scrape_pending_urls,
-                'interval',
-                seconds=10,
-                id='scraper_job',
-                max_instances=1,
-                coalesce=True,
-                misfire_grace_time=30,
-                replace_existing=True,
+            # Scrape as soon as crawls add URLs; polling every 10 seconds is only the fallback
+            WorkNotifier.register(
+                "scraper",
+                lambda: bool(self.fetch_and_scrape_pending_urls().get("data")),
+                collection_name=self.model.collection.name,
+                poll_seconds=10,
+                busy=self.scraper_busy,
             )
 
             return {"success": True, "data": "Scraper scheduled successfully"}
@@ -371,15 +664,39 @@ class WebsiteCrawlService:
             urls = doc.get("listOfCrawlableUrls", [])
             total = len(urls)
             pending = sum(1 for u in urls if u.get("crawlStatus") == "PENDING")
+            in_progress = sum(1 for u in urls if u.get("crawlStatus") == "IN_PROGRESS")
             completed = sum(1 for u in urls if u.get("crawlStatus") == "SUCCESS")
             error = sum(1 for u in urls if u.get("crawlStatus") == "FAILED")
+
+            # Throughput of this process over the last 10 minutes
+            now = time.monotonic()
+            with self._scrape_lock:
+                progress = self._scrape_progress.get(crawl_id)
+                scraped = progress["scraped"] if progress else 0
+                avg_seconds = progress["seconds"] / scraped if scraped else 0.0
+                recent = sum(1 for at in progress["recent"] if now - at <= 600) if progress else 0
+                running = sum(1 for key, (_, future) in self._scrapes_in_flight.items()
+                              if key[0] == crawl_id and not future.done())
+            pages_per_minute = recent / 10
+            remaining = pending + in_progress
             return {
                 "success": True,
                 "data": {
                     "total": total,
                     "pending": pending,
+                    "inProgress": in_progress,
                     "completed": completed,
                     "error": error,
+                    "percentDone": round(100 * (completed + error) / total, 1) if total else 0.0,
+                    "fetchesAvoided": doc.get("fetchesAvoided", 0),
+                    "workers": {
+                        "size": self.scraper_workers(),
+                        "perDomain": self.scraper_per_domain(),
+                        "runningForCrawl": running,
+                    },
+                    "avgScrapeSeconds": round(avg_seconds, 2),
+                    "pagesPerMinute": round(pages_per_minute, 1),
+                    "etaMinutes": round(remaining / pages_per_minute, 1) if pages_per_minute and remaining else None,
                 }
             }
         except Exception as e:
@@ -425,16 +742,17 @@ class WebsiteCrawlService:
     
     def schedule_crawler(self):
             try:
-                scheduler.add_job(
-                    lambda: asyncio.run(self.fetch_pending_crawlable_urls()),
-                    "interval",
-                    seconds=10,
-                    id="crawler_job",
-                    max_instances=1,
-                    coalesce=True,
-                    misfire_grace_time=30,
-                    replace_existing=True,
+                # Crawl as soon as a crawl is created or reset to PENDING; polling is only the fallback
+                WorkNotifier.register(
+                    "crawler",
+                    lambda: asyncio.run(self.fetch_pending_crawlable_urls()) is not None,
+                    collection_name=self.model.collection.name,
+                    pipeline=WorkNotifier.status_pipeline("crawlStatus", "PENDING"),
+                    poll_seconds=10,
                 )
+                # Incremental re-crawls of sites not crawled for CRAWL_RECRAWL_DAYS
+                if float(os.getenv("CRAWL_RECRAWL_DAYS", "7")) > 0:
+                    Scheduler.add_job(self.queue_due_recrawls, "interval", job_id="website_recrawl", hours=6)
                 return {"success": True, "data": "Crawler scheduled successfully"}
             except Exception as e:
                 return {"success": False, "data": [], "error": str(e)}
@@ -446,8 +764,20 @@ class WebsiteCrawlService:
             if pending_doc:
                 crawl_id = str(pending_doc["_id"])
                 await self.fetch_crawlable_urls(crawl_id)
-            else:
-                print("No pending crawlable URLs found")
+                return crawl_id
+            # Resume a crawl whose process died mid-way (checkpoint no longer being saved)
+            stale_seconds = float(os.getenv("CRAWL_CHECKPOINT_STALE_SECONDS", "900"))
+            crawl_id = self.checkpoint_model.claim_stale(stale_seconds)
+            if crawl_id:
+                if not ObjectId.is_valid(crawl_id) or not self.model.collection.find_one({"_id": ObjectId(crawl_id)}, {"_id": 1}):
+                    # The crawl was deleted; nothing left to resume
+                    self.checkpoint_model.complete(crawl_id)
+                    return None
+                print(f"Resuming interrupted crawl {crawl_id}")
+                await self.fetch_crawlable_urls(crawl_id)
+                return crawl_id
+            print("No pending crawlable URLs found")
             
         except Exception as e:
-            print(f"❌ Error fetching crawlable URLs: {e}")
\ No newline at end of file
+            print(f"❌ Error fetching crawlable URLs: {e}")
+        return None
\ No newline at end of file